@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Animações dos tiles, objetos e inimigos definidas em config/items.json
+# ("animation", "animation_frames" e "animation_speed").
+#
+# Os quadros ficam ao lado da imagem base, numerados a partir de zero
+# (tiles/water.png -> tiles/water_0.png, tiles/water_1.png, ...), e são
+# carregados uma única vez por tipo de tile. Todas as animações avançam a
+# partir de um único relógio compartilhado, contado em ticks da simulação:
+# o quadro atual de um tipo é o mesmo para todas as suas instâncias.
+#
+# animation_speed é o número de quadros da animação avançados por tick
+# (0.1 = um quadro a cada 10 ticks).
+
+import os
+
+import pygame
+
+from asset_cache import asset_cache
+
+# Tipos de animação (ver "animation_types" em items.json)
+AMBIENT = "ambient"                # contínua, sem interação
+ON_INTERACTION = "on_interaction"  # uma vez, quando o jogador interage
+ON_WALK = "on_walk"                # uma vez, quando o jogador caminha sobre o tile
+MOVEMENT = "movement"              # contínua enquanto a entidade se move
+IDLE = "idle"                      # contínua enquanto a entidade está parada
+
+ANIMATION_TYPES = (AMBIENT, ON_INTERACTION, ON_WALK, MOVEMENT, IDLE)
+
+# Tipos que tocam em laço para tiles e entidades paradas
+LOOPING_TYPES = (AMBIENT, IDLE)
+
+# Tipos que tocam uma única vez a partir de um gatilho
+ONE_SHOT_TYPES = (ON_INTERACTION, ON_WALK)
+
+class AnimationClock:
+    def __init__(self):
+        # Ticks da simulação desde o início do jogo
+        self.ticks = 0
+    
+    def tick(self):
+        """Avança o relógio em um tick"""
+        self.ticks += 1
+
+# Relógio compartilhado por todas as animações (avançado pelo Game a cada tick)
+animation_clock = AnimationClock()
+
+class Animation:
+    def __init__(self, tile_id, kind, frames, speed):
+        self.tile_id = tile_id
+        self.kind = kind
+        self.frames = frames
+        self.speed = speed
+        
+        # Quadros sem transparência podem ser desenhados direto sobre a camada estática
+        self.opaque = all(_is_opaque(frame) for frame in frames)
+        
+        # Duração, em ticks, de uma execução completa
+        self.duration = max(1, int(len(frames) / speed + 0.5)) if speed > 0 else 1
+    
+    def frame_index(self, ticks):
+        """Índice do quadro de uma animação em laço no tick informado"""
+        return int(ticks * self.speed) % len(self.frames)
+    
+    def frame_at(self, ticks):
+        """Quadro de uma animação em laço no tick informado"""
+        return self.frames[int(ticks * self.speed) % len(self.frames)]
+    
+    def frame_since(self, start_tick, ticks):
+        """Quadro de uma animação tocada uma única vez a partir de start_tick (None se já terminou)"""
+        index = int((ticks - start_tick) * self.speed)
+        if index < 0 or index >= len(self.frames):
+            return None
+        return self.frames[index]
+    
+    def is_finished(self, start_tick, ticks):
+        """Indica se uma animação iniciada em start_tick já terminou"""
+        return ticks - start_tick >= self.duration
+
+def _is_opaque(surface):
+    """Verifica se todos os pixels da imagem são opacos"""
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return True
+    width, height = surface.get_size()
+    return pygame.mask.from_surface(surface, 254).count() == width * height
+
+def frame_paths(image_path, count):
+    """Caminhos dos quadros de uma imagem base (objects/portal.png -> objects/portal_0.png, ...)"""
+    base, extension = os.path.splitext(image_path)
+    return [f"{base}_{index}{extension}" for index in range(count)]
+
+def _load_animation(tile_types, tile_id, tile_size):
+    """Carrega os quadros de um tipo de tile; None se não for animado ou faltar algum quadro"""
+    kind = tile_types.animation_kinds[tile_id]
+    count = tile_types.animation_frames[tile_id]
+    speed = tile_types.animation_speeds[tile_id]
+    image_path = tile_types.image_paths[tile_id]
+    
+    if kind not in ANIMATION_TYPES or count < 2 or speed <= 0 or not image_path:
+        return None
+    
+    frames = []
+    for path in frame_paths(image_path, count):
+        frame = asset_cache.get_image(path, (tile_size, tile_size))
+        if frame is None:
+            # Sem todos os quadros a imagem base continua sendo usada
+            return None
+        frames.append(frame)
+    
+    return Animation(str(tile_id), kind, frames, speed)
+
+def load_animations(tile_types, tile_size):
+    """Retorna {id do tile (texto): Animation} para todos os tipos animados da tabela de tipos
+    
+    As animações são compartilhadas entre os mapas com o mesmo tamanho de tile.
+    """
+    animations = {}
+    for tile_id in tile_types.ids():
+        # Tipos sem animação nem chegam a consultar o cache
+        if tile_types.animation_kinds[tile_id] not in ANIMATION_TYPES:
+            continue
+        
+        # Sem janela as imagens não ficam em cache; as animações também não
+        if pygame.display.get_surface() is None:
+            animation = _load_animation(tile_types, tile_id, tile_size)
+        else:
+            animation = asset_cache.get_or_load(
+                ("animation", str(tile_id), tile_size),
+                lambda: _load_animation(tile_types, tile_id, tile_size)
+            )
+        if animation is not None:
+            animations[animation.tile_id] = animation
+    return animations
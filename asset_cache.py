@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import pygame
+
+from texture_atlas import IMAGES_DIR, get_atlas
+
+# Orçamento padrão de memória para os assets em cache (em bytes)
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+class AssetCache:
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        # Limite de memória; ao ultrapassá-lo os assets usados há mais tempo são descartados.
+        # O limite vale para o que o cache mantém: um asset descartado continua em memória
+        # enquanto algum mapa ainda o referenciar (Map.images e Map.interaction_sounds),
+        # ou seja, até o mapa sair do cache do MapPrefetcher.
+        self.memory_budget = memory_budget
+        self.memory_used = 0
+        
+        # Chave -> (asset, tamanho estimado em bytes), em ordem de uso (LRU)
+        self.entries = OrderedDict()
+        
+        # Caminhos que falharam ao carregar (evita tentar e avisar de novo)
+        self.failed = set()
+        
+        # Chave -> Future dos assets sendo carregados agora (por outra thread, possivelmente)
+        self.loading = {}
+        
+        # Estatísticas de uso
+        self.hits = 0
+        self.misses = 0
+        
+        # Os mapas podem ser preparados em outras threads
+        self.lock = threading.RLock()
+    
+    def set_memory_budget(self, memory_budget):
+        """Altera o orçamento de memória, descartando assets se necessário"""
+        with self.lock:
+            self.memory_budget = memory_budget
+            self._evict()
+    
+    def _evict(self):
+        """Descarta os assets usados há mais tempo até caber no orçamento"""
+        while self.memory_used > self.memory_budget and len(self.entries) > 1:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.memory_used -= size
+    
+    def get_or_load(self, key, loader, size_of=None):
+        """Retorna o asset da chave, chamando loader() para criá-lo se não estiver em cache
+        
+        loader() roda fora da trava: threads carregando chaves diferentes não esperam
+        umas pelas outras, e quem pede uma chave já em carregamento espera só por ela.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            
+            future = self.loading.get(key)
+            if future is None:
+                self.misses += 1
+                future = self.loading[key] = Future()
+                owner = True
+            else:
+                owner = False
+        
+        # Outra thread já está carregando esta chave
+        if not owner:
+            return future.result()
+        
+        try:
+            asset = loader()
+            size = size_of(asset) if size_of and asset is not None else 0
+        except BaseException as e:
+            with self.lock:
+                del self.loading[key]
+            future.set_exception(e)
+            raise
+        
+        with self.lock:
+            del self.loading[key]
+            if asset is not None:
+                self.entries[key] = (asset, size)
+                self.memory_used += size
+                self._evict()
+        future.set_result(asset)
+        return asset
+    
+    def get_image(self, path, size=None):
+        """Carrega uma imagem (redimensionada para size) e a mantém em cache
+        
+        Retorna None se o arquivo não existir ou não puder ser carregado.
+        """
+        if path in self.failed:
+            return None
+        
+        # Sem janela não é possível converter para o formato da tela;
+        # a imagem é carregada, mas não fica em cache
+        if pygame.display.get_surface() is None:
+            return self._load_image(path, size, convert=False)
+        
+        return self.get_or_load(
+            ("image", path, size),
+            lambda: self._load_image(path, size, convert=True),
+            lambda image: image.get_width() * image.get_height() * image.get_bytesize()
+        )
+    
+    def _load_image(self, path, size, convert):
+        """Carrega uma imagem do atlas de texturas ou, se não estiver nele, do disco"""
+        # Sprites do atlas são subsuperfícies de uma única folha já convertida
+        if convert:
+            image = get_atlas().get(os.path.relpath(path, IMAGES_DIR).replace(os.sep, "/"))
+            if image is not None:
+                if size is not None and image.get_size() != tuple(size):
+                    image = pygame.transform.scale(image, size)
+                return image
+        
+        if not os.path.exists(path):
+            return None
+        try:
+            image = pygame.image.load(path)
+            if convert:
+                image = image.convert_alpha()
+            if size is not None and image.get_size() != tuple(size):
+                image = pygame.transform.scale(image, size)
+            return image
+        except Exception as e:
+            print(f"Erro ao carregar imagem {path}: {e}")
+            self.failed.add(path)
+            return None
+    
+    def get_sound(self, path):
+        """Carrega um efeito sonoro e o mantém em cache
+        
+        Retorna None se o arquivo não existir ou não puder ser carregado
+        (o aviso é mostrado apenas uma vez por arquivo).
+        """
+        if path in self.failed:
+            return None
+        return self.get_or_load(("sound", path), lambda: self._load_sound(path), self._sound_size)
+    
+    def _load_sound(self, path):
+        """Carrega um som do disco"""
+        if not os.path.exists(path):
+            print(f"Aviso: Arquivo de som não encontrado: {path}")
+            self.failed.add(path)
+            return None
+        try:
+            return pygame.mixer.Sound(path)
+        except Exception as e:
+            print(f"Aviso: Não foi possível carregar o som {path}: {e}")
+            self.failed.add(path)
+            return None
+    
+    def _sound_size(self, sound):
+        """Estima a memória ocupada por um som"""
+        mixer = pygame.mixer.get_init()
+        if not mixer:
+            return 0
+        frequency, sample_format, channels = mixer
+        return int(sound.get_length() * frequency * channels * (abs(sample_format) // 8))
+
+class LazyAssets(dict):
+    """Dicionário de assets carregados no primeiro acesso
+    
+    loader(chave) retorna o asset ou None se a chave não tiver asset. Consultas com
+    [], in e get carregam a chave na hora, se ainda não estiver carregada (se outra
+    thread já a estiver carregando, esperam pelo cache compartilhado).
+    """
+    def __init__(self, loader):
+        super().__init__()
+        self.loader = loader
+        
+        # Chaves já consultadas que não têm asset
+        self.missing = set()
+    
+    def __missing__(self, key):
+        if key not in self.missing:
+            asset = self.loader(key)
+            if asset is not None:
+                self[key] = asset
+                return asset
+            self.missing.add(key)
+        raise KeyError(key)
+    
+    def __contains__(self, key):
+        if dict.__contains__(self, key):
+            return True
+        if key in self.missing:
+            return False
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+# Cache compartilhado por todos os mapas do processo
+asset_cache = AssetCache()
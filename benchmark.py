@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Benchmarks dos caminhos críticos do jogo: carregamento dos mapas, desenho,
+# colisão, interações, inimigos e inicialização a frio. Os resultados são gravados em
+# JSON e podem ser comparados com uma execução anterior (linha de base); o
+# script termina com código 1 se algum resultado piorar além do limite.
+#
+# Uso:
+#   python benchmark.py [--quick] [--sizes 100,500,2000] [--output resultados.json]
+#                       [--baseline base.json] [--threshold 0.2] [--save-baseline base.json]
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Os benchmarks rodam sem janela (também em CI)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import map_compiler
+from camera import Camera
+from map import Map
+from player import Player
+
+# Tamanhos padrão dos mapas sintéticos (largura = altura, em tiles)
+DEFAULT_SIZES = [100, 500, 2000]
+
+# Tamanho máximo da janela (o mesmo usado pelo jogo)
+SCREEN_SIZE = (1280, 960)
+
+# Diferença absoluta mínima para considerar uma piora (evita ruído em medições muito pequenas)
+MIN_REGRESSION = {"ms": 0.05, "us": 0.5}
+
+def quiet():
+    """Suprime as mensagens impressas pelo jogo durante as medições"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+def measure(func, repeat):
+    """Executa func repeat vezes e retorna a duração de cada execução, em segundos"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+def percentile(values, fraction):
+    """Retorna o percentil (0 a 1) de uma lista de valores"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def make_synthetic_map(size, seed=0):
+    """Gera um mapa quadrado com paredes, portas, objetos e inimigos espalhados"""
+    rng = random.Random(seed)
+    data = []
+    for y in range(size):
+        row = []
+        for x in range(size):
+            if x in (0, size - 1) or y in (0, size - 1) or rng.random() < 0.08:
+                row.append(map_compiler.WALL)
+            else:
+                row.append(map_compiler.EMPTY)
+        data.append(row)
+    
+    # Células livres para portas, objetos e inimigos
+    free = [(x, y) for y in range(2, size - 2) for x in range(2, size - 2) if data[y][x] == map_compiler.EMPTY]
+    rng.shuffle(free)
+    
+    doors = free[:max(1, size * size // 2000)]
+    objects = free[len(doors):len(doors) + size * size // 100]
+    enemies = free[len(doors) + len(objects):len(doors) + len(objects) + size * size // 400]
+    
+    portals = []
+    for x, y in doors:
+        data[y][x] = map_compiler.DOOR
+        portals.append({"x": x, "y": y, "target_map": "map1", "target_x": 5, "target_y": 5})
+    
+    object_ids = [3, 4, 9, 11, 12, 30, 31]
+    enemy_ids = [20, 21, 22]
+    return {
+        "name": f"Sintético {size}x{size}",
+        "width": size,
+        "height": size,
+        "tile_size": 32,
+        "data": data,
+        "portals": portals,
+        "objects": [{"id": rng.choice(object_ids), "x": x, "y": y} for x, y in objects],
+        "enemies": [{"id": rng.choice(enemy_ids), "x": x, "y": y} for x, y in enemies]
+    }
+
+def find_free_position(game_map, rng):
+    """Retorna uma posição em pixels, longe das bordas, onde o jogador não colide com nada"""
+    for _ in range(10000):
+        x = rng.randrange(1, game_map.width - 2) * game_map.tile_size
+        y = rng.randrange(1, game_map.height - 2) * game_map.tile_size
+        if not game_map.query_collisions(pygame.Rect(x, y, 32, 32)):
+            return x, y
+    return game_map.tile_size, game_map.tile_size
+
+class Benchmark:
+    def __init__(self, quick=False, sizes=None):
+        self.quick = quick
+        self.sizes = sizes if sizes is not None else ([100, 500] if quick else DEFAULT_SIZES)
+        
+        # Nome do resultado -> {"value": valor (menor é melhor), "unit": unidade}
+        self.results = {}
+        
+        # Diretório temporário dos mapas sintéticos
+        self.synthetic_dir = None
+    
+    def record(self, name, value, unit):
+        """Registra um resultado e o mostra"""
+        self.results[name] = {"value": round(value, 4), "unit": unit}
+        print(f"  {name:<45} {value:>12.4f} {unit}")
+    
+    def scale(self, full, quick):
+        """Número de repetições conforme o modo"""
+        return quick if self.quick else full
+    
+    def run(self):
+        """Executa todos os benchmarks e retorna os resultados"""
+        pygame.init()
+        self.screen = pygame.display.set_mode(SCREEN_SIZE)
+        
+        self.synthetic_dir = tempfile.mkdtemp(prefix="benchmark_maps_")
+        try:
+            print("Carregamento dos mapas:")
+            maps = self.bench_map_loading()
+            
+            for map_id, game_map in maps:
+                print(f"Mapa {map_id}:")
+                self.bench_draw(map_id, game_map)
+                self.bench_collision(map_id, game_map)
+                self.bench_interactions(map_id, game_map)
+                self.bench_enemies(map_id, game_map)
+            
+            print("Inicialização:")
+            self.bench_cold_start()
+        finally:
+            shutil.rmtree(self.synthetic_dir, ignore_errors=True)
+            pygame.quit()
+        
+        return self.results
+    
+    def bench_map_loading(self):
+        """Mede Map() para cada mapa de maps/ e para os mapas sintéticos; retorna os mapas carregados"""
+        maps = []
+        repeat = self.scale(10, 3)
+        
+        map_ids = sorted(
+            os.path.splitext(name)[0]
+            for name in os.listdir("maps")
+            if name.endswith(".json")
+        )
+        for index, map_id in enumerate(map_ids):
+            # O primeiro mapa também carrega items.json, imagens e sons (cache frio)
+            if index == 0:
+                with quiet():
+                    cold = measure(lambda: Map(map_id), 1)[0]
+                self.record("load.first_map", cold * 1000, "ms")
+            with quiet():
+                times = measure(lambda: Map(map_id), repeat)
+                game_map = Map(map_id)
+            self.record(f"load.{map_id}", statistics.median(times) * 1000, "ms")
+            maps.append((map_id, game_map))
+        
+        for size in self.sizes:
+            map_id = f"synthetic_{size}x{size}"
+            with open(map_compiler.json_path_for(map_id, self.synthetic_dir), "w") as f:
+                json.dump(make_synthetic_map(size), f)
+            
+            # Mapas grandes são medidos menos vezes
+            size_repeat = max(1, repeat // 3) if size >= 1000 else repeat
+            
+            # Primeiro a partir do JSON, depois do formato compilado
+            with quiet():
+                times = measure(lambda: Map(map_id, self.synthetic_dir), size_repeat)
+            self.record(f"load.{map_id}.json", statistics.median(times) * 1000, "ms")
+            
+            with quiet():
+                map_compiler.compile_map(map_id, self.synthetic_dir)
+                times = measure(lambda: Map(map_id, self.synthetic_dir), size_repeat)
+                game_map = Map(map_id, self.synthetic_dir)
+            self.record(f"load.{map_id}.compiled", statistics.median(times) * 1000, "ms")
+            maps.append((map_id, game_map))
+        
+        return maps
+    
+    def bench_draw(self, map_id, game_map):
+        """Mede Map.draw por quadro com a câmera percorrendo o mapa na velocidade do jogador"""
+        map_width = game_map.width * game_map.tile_size
+        map_height = game_map.height * game_map.tile_size
+        camera = Camera(min(SCREEN_SIZE[0], map_width), min(SCREEN_SIZE[1], map_height))
+        camera.set_map_size(map_width, map_height)
+        
+        frames = self.scale(600, 120)
+        target = pygame.Rect(0, 0, 32, 32)
+        times = []
+        for frame in range(frames):
+            # Anda na diagonal, 5 pixels por quadro, voltando ao início ao chegar na borda
+            target.x = (frame * 5) % max(1, map_width - 32)
+            target.y = (frame * 4) % max(1, map_height - 32)
+            camera.follow(target)
+            
+            start = time.perf_counter()
+            game_map.draw(self.screen, camera)
+            times.append(time.perf_counter() - start)
+        
+        self.record(f"draw.{map_id}.median", statistics.median(times) * 1000, "ms")
+        self.record(f"draw.{map_id}.p95", percentile(times, 0.95) * 1000, "ms")
+    
+    def bench_collision(self, map_id, game_map):
+        """Mede Player.move_with_collision contra as colisões do mapa em uma caminhada aleatória"""
+        rng = random.Random(1)
+        with quiet():
+            player = Player(0, 0)
+        player.set_position(*find_free_position(game_map, rng))
+        
+        map_width = game_map.width * game_map.tile_size
+        map_height = game_map.height * game_map.tile_size
+        directions = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)]
+        
+        steps = self.scale(20000, 3000)
+        velocities = []
+        for step in range(steps):
+            if step % 30 == 0:
+                dx, dy = rng.choice(directions)
+                velocity = pygame.math.Vector2(dx, dy).normalize() * player.speed
+            velocities.append(velocity)
+        
+        with quiet():
+            start = time.perf_counter()
+            for velocity in velocities:
+                player.velocity = velocity
+                player.move_with_collision(game_map)
+                player.constrain_to_map(map_width, map_height)
+            elapsed = time.perf_counter() - start
+        
+        self.record(f"collision.{map_id}", elapsed / steps * 1e6, "us")
+    
+    def bench_interactions(self, map_id, game_map):
+        """Mede a latência de check_object_interaction e check_door_interaction"""
+        with quiet():
+            player = Player(0, 0)
+        repeat = self.scale(2000, 300)
+        
+        # Pior caso: nada por perto, todas as entradas são verificadas
+        player.set_position(*find_free_position(game_map, random.Random(2)))
+        with quiet():
+            times = measure(lambda: game_map.check_object_interaction(player), repeat)
+        self.record(f"interaction.object.{map_id}", statistics.median(times) * 1e6, "us")
+        
+        with quiet():
+            times = measure(lambda: game_map.check_door_interaction(player), repeat)
+        self.record(f"interaction.door.{map_id}", statistics.median(times) * 1e6, "us")
+    
+    def bench_enemies(self, map_id, game_map):
+        """Mede Map.update_enemies por tick e Map.enemies_seeing, com o jogador parado no meio do mapa"""
+        if not len(game_map.enemy_simulation):
+            return
+        with quiet():
+            player = Player(0, 0)
+        player.set_position(game_map.width * game_map.tile_size // 2, game_map.height * game_map.tile_size // 2)
+        
+        ticks = self.scale(600, 120)
+        times = measure(lambda: game_map.update_enemies(player), ticks)
+        game_map.pop_dirty_rects()
+        self.record(f"enemies.{map_id}", statistics.median(times) * 1000, "ms")
+        
+        # Consulta em lote de quais inimigos veem o jogador (linhas de visão já memorizadas)
+        times = measure(lambda: game_map.enemies_seeing(player), self.scale(2000, 300))
+        self.record(f"detection.{map_id}", statistics.median(times) * 1e6, "us")
+    
+    def bench_cold_start(self):
+        """Mede o tempo de inicialização do jogo pelo main.py (sem janela, um único tick)"""
+        env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+        command = [sys.executable, "main.py", "--headless", "--ticks", "1"]
+        times = []
+        for _ in range(self.scale(5, 2)):
+            start = time.perf_counter()
+            process = subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            times.append(time.perf_counter() - start)
+            
+            # Uma falha terminaria mais cedo e pareceria uma inicialização mais rápida
+            if process.returncode != 0:
+                details = process.stderr.decode("utf-8", "replace").strip().splitlines()[-5:]
+                raise RuntimeError(f"main.py terminou com código {process.returncode}" +
+                                   "".join(f"\n  {line}" for line in details))
+        self.record("startup.main", min(times) * 1000, "ms")
+
+def compare(results, baseline, threshold):
+    """Compara os resultados com a linha de base; retorna os nomes dos que pioraram"""
+    regressions = []
+    print(f"\nComparação com a linha de base (limite: +{threshold:.0%}):")
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None or base.get("unit") != result["unit"]:
+            continue
+        
+        value = result["value"]
+        base_value = base["value"]
+        change = (value - base_value) / base_value if base_value > 0 else 0.0
+        worse = (change > threshold and
+                 value - base_value > MIN_REGRESSION.get(result["unit"], 0))
+        
+        status = "PIOROU" if worse else "ok"
+        print(f"  {name:<45} {base_value:>12.4f} -> {value:>12.4f} {result['unit']:<3} {change:+7.1%}  {status}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do jogo")
+    parser.add_argument("--quick", action="store_true", help="menos repetições e mapas sintéticos menores")
+    parser.add_argument("--sizes", help="tamanhos dos mapas sintéticos separados por vírgula (ex.: 100,500,2000)")
+    parser.add_argument("--output", help="arquivo JSON para gravar os resultados")
+    parser.add_argument("--baseline", help="arquivo JSON de uma execução anterior para comparação")
+    parser.add_argument("--threshold", type=float, default=0.2, help="piora relativa tolerada (padrão: 0.2 = 20%%)")
+    parser.add_argument("--save-baseline", help="grava os resultados como nova linha de base neste arquivo")
+    args = parser.parse_args()
+    
+    sizes = [int(size) for size in args.sizes.split(",") if size] if args.sizes else None
+    try:
+        results = Benchmark(args.quick, sizes).run()
+    except RuntimeError as e:
+        print(f"Erro: Benchmark interrompido: {e}")
+        return 2
+    
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "quick": args.quick
+        },
+        "results": results
+    }
+    
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            print(f"Resultados gravados em {path}")
+    
+    if args.baseline:
+        try:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f).get("results", {})
+        except (OSError, ValueError) as e:
+            print(f"Erro: Não foi possível ler a linha de base {args.baseline}: {e}")
+            return 2
+        
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} resultado(s) piorou(aram): {', '.join(regressions)}")
+            return 1
+        print("\nNenhuma piora encontrada.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -57,6 +57,17 @@ if %ERRORLEVEL% NEQ 0 (
     )
 )
 
+REM Verificar numpy
+pip show numpy >nul 2>&1
+if %ERRORLEVEL% NEQ 0 (
+    echo %AMARELO%[AVISO]%RESET% numpy não encontrado. Instalando...
+    pip install numpy
+    if %ERRORLEVEL% NEQ 0 (
+        echo %VERMELHO%[ERRO]%RESET% Falha ao instalar numpy.
+        exit /b 1
+    )
+)
+
 echo %VERDE%[SUCESSO]%RESET% Todas as dependências estão instaladas.
 
 REM Limpar diretórios de build anteriores
@@ -87,6 +98,28 @@ if %ERRORLEVEL% NEQ 0 (
 
 echo %VERDE%[SUCESSO]%RESET% Arquivos do jogo verificados.
 
+REM Compilar os mapas para o formato binário
+echo %AZUL%[BUILD]%RESET% Compilando mapas...
+
+python map_compiler.py
+if %ERRORLEVEL% NEQ 0 (
+    echo %VERMELHO%[ERRO]%RESET% Falha ao compilar os mapas.
+    exit /b 1
+)
+
+echo %VERDE%[SUCESSO]%RESET% Mapas compilados.
+
+REM Gerar o atlas de texturas
+echo %AZUL%[BUILD]%RESET% Gerando atlas de texturas...
+
+python texture_atlas.py
+if %ERRORLEVEL% NEQ 0 (
+    echo %VERMELHO%[ERRO]%RESET% Falha ao gerar o atlas de texturas.
+    exit /b 1
+)
+
+echo %VERDE%[SUCESSO]%RESET% Atlas de texturas gerado.
+
 REM Compilar o jogo
 echo %AZUL%[BUILD]%RESET% Compilando o jogo...
 
@@ -73,6 +73,16 @@ verificar_dependencias() {
         fi
     fi
     
+    # Verificar numpy
+    if ! pip3 list | grep -q numpy; then
+        mensagem_aviso "numpy não encontrado. Instalando..."
+        pip3 install numpy
+        if [ $? -ne 0 ]; then
+            mensagem_erro "Falha ao instalar numpy."
+            exit 1
+        fi
+    fi
+    
     # Verificar create-dmg (opcional)
     if ! command -v create-dmg &> /dev/null; then
         mensagem_aviso "create-dmg não encontrado. Instalando com Homebrew..."
@@ -129,6 +139,36 @@ verificar_arquivos_jogo() {
     mensagem_sucesso "Arquivos do jogo verificados."
 }
 
+# Função para compilar os mapas para o formato binário
+compilar_mapas() {
+    mensagem "Compilando mapas..."
+    
+    # Gera maps/*.tdm a partir dos arquivos JSON
+    python3 map_compiler.py
+    
+    if [ $? -ne 0 ]; then
+        mensagem_erro "Falha ao compilar os mapas."
+        exit 1
+    fi
+    
+    mensagem_sucesso "Mapas compilados."
+}
+
+# Função para gerar o atlas de texturas
+gerar_atlas() {
+    mensagem "Gerando atlas de texturas..."
+    
+    # Empacota todas as imagens em assets/images/atlas
+    python3 texture_atlas.py
+    
+    if [ $? -ne 0 ]; then
+        mensagem_erro "Falha ao gerar o atlas de texturas."
+        exit 1
+    fi
+    
+    mensagem_sucesso "Atlas de texturas gerado."
+}
+
 # Função para compilar o jogo
 compilar_jogo() {
     mensagem "Compilando o jogo para macOS..."
@@ -229,6 +269,8 @@ main() {
     verificar_dependencias
     limpar_diretorios
     verificar_arquivos_jogo
+    compilar_mapas
+    gerar_atlas
     compilar_jogo
     criar_pacote
     
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pygame
+
+class Camera:
+    def __init__(self, width, height):
+        # Área visível do mundo, em pixels
+        self.rect = pygame.Rect(0, 0, width, height)
+        
+        # Tamanho do mapa atual em pixels (limita o movimento da câmera)
+        self.map_width = width
+        self.map_height = height
+    
+    def resize(self, width, height):
+        """Ajusta o tamanho da área visível (quando a janela muda de tamanho)"""
+        self.rect.width = width
+        self.rect.height = height
+        self.clamp()
+    
+    def set_map_size(self, map_width, map_height):
+        """Define o tamanho do mapa em pixels que a câmera deve respeitar"""
+        self.map_width = map_width
+        self.map_height = map_height
+        self.clamp()
+    
+    def clamp(self):
+        """Mantém a câmera dentro dos limites do mapa"""
+        # Se o mapa for menor que a tela, a câmera fica fixa na origem
+        max_x = max(0, self.map_width - self.rect.width)
+        max_y = max(0, self.map_height - self.rect.height)
+        self.rect.x = max(0, min(self.rect.x, max_x))
+        self.rect.y = max(0, min(self.rect.y, max_y))
+    
+    def follow(self, target_rect):
+        """Centraliza a câmera no alvo (normalmente o jogador)"""
+        self.rect.center = target_rect.center
+        self.clamp()
+    
+    @property
+    def offset(self):
+        """Deslocamento a ser subtraído das coordenadas do mundo"""
+        return self.rect.x, self.rect.y
+    
+    def apply(self, rect):
+        """Converte um retângulo em coordenadas do mundo para coordenadas da tela"""
+        return rect.move(-self.rect.x, -self.rect.y)
+    
+    def is_visible(self, rect):
+        """Verifica se um retângulo do mundo aparece na área visível"""
+        return self.rect.colliderect(rect)
@@ -3,6 +3,8 @@
 
 import pygame
 
+from text_cache import text_cache
+
 class CharacterSelect:
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
@@ -17,9 +19,9 @@ class CharacterSelect:
         
         self.selected_index = 0
         
-        # Fonte para textos
-        self.title_font = pygame.font.SysFont(None, 48)
-        self.font = pygame.font.SysFont(None, 36)
+        # Tamanhos das fontes (fontes e textos renderizados ficam no cache compartilhado)
+        self.title_font_size = 48
+        self.font_size = 36
         
         # Botões
         self.button_width = 200
@@ -57,7 +59,7 @@ class CharacterSelect:
         screen.fill((50, 50, 50))
         
         # Título
-        title_text = self.title_font.render("Selecione seu Personagem", True, (255, 255, 255))
+        title_text = text_cache.render("Selecione seu Personagem", (255, 255, 255), self.title_font_size)
         title_rect = title_text.get_rect(center=(self.screen_width // 2, 100))
         screen.blit(title_text, title_rect)
         
@@ -79,7 +81,7 @@ class CharacterSelect:
             pygame.draw.rect(screen, color, button_rect, border_radius=10)
             
             # Texto do botão
-            button_text = self.font.render(character["name"], True, self.button_text_color)
+            button_text = text_cache.render(character["name"], self.button_text_color, self.font_size)
             text_rect = button_text.get_rect(center=button_rect.center)
             screen.blit(button_text, text_rect)
             
@@ -94,6 +96,6 @@ class CharacterSelect:
             pygame.draw.rect(screen, character["color"], avatar_rect)
         
         # Instruções
-        instructions_text = self.font.render("Use as setas para selecionar e ENTER para confirmar", True, (200, 200, 200))
+        instructions_text = text_cache.render("Use as setas para selecionar e ENTER para confirmar", (200, 200, 200), self.font_size)
         instructions_rect = instructions_text.get_rect(center=(self.screen_width // 2, self.screen_height - 100))
         screen.blit(instructions_text, instructions_rect) 
\ No newline at end of file
@@ -1,11 +1,106 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+# Verificação (e correção) dos arquivos do jogo antes de iniciar.
+#
+# A primeira verificação percorre tudo e grava um manifesto com o tamanho, a
+# data de modificação e o hash do conteúdo de cada arquivo verificado. Nas
+# inicializações seguintes basta um stat por arquivo: se nada mudou a
+# verificação termina ali, sem inicializar o pygame nem reler items.json; se
+# algo mudou, apenas os arquivos alterados são verificados de novo.
+# "python check_game_files.py --full" (ou "main.py --full") ignora o manifesto.
+
 import os
 import json
 import shutil
+import hashlib
+import argparse
 import pygame
 
+# Manifesto da última verificação
+MANIFEST_PATH = os.path.join("config", ".file_manifest.json")
+MANIFEST_VERSION = 1
+
+# Diretórios principais
+DIRECTORIES = [
+    "maps",
+    "config",
+    "assets",
+    "assets/images",
+    "assets/images/tiles",
+    "assets/images/objects",
+    "assets/images/items",
+    "assets/images/enemies",
+    "assets/images/npcs",
+    "assets/sounds",
+    "assets/sounds/music",
+    "assets/sounds/effects",
+]
+
+ITEMS_PATH = "config/items.json"
+DEFAULT_MAP_PATH = "maps/map1.json"
+
+# Arquivos de áudio (caminho, extensão)
+AUDIO_FILES = [
+    ("assets/sounds/music/forest.mp3", ".mp3"),
+    ("assets/sounds/music/cave.mp3", ".mp3"),
+    ("assets/sounds/music/desert.mp3", ".mp3"),
+    ("assets/sounds/music/lake.mp3", ".mp3"),
+    ("assets/sounds/effects/door.wav", ".wav"),
+    ("assets/sounds/effects/door_locked.wav", ".wav"),
+    ("assets/sounds/effects/chest.wav", ".wav"),
+    ("assets/sounds/effects/coin.wav", ".wav"),
+    ("assets/sounds/effects/potion.wav", ".wav"),
+    ("assets/sounds/effects/key.wav", ".wav"),
+    ("assets/sounds/effects/bush.wav", ".wav"),
+    ("assets/sounds/effects/grass.wav", ".wav"),
+    ("assets/sounds/effects/sign.wav", ".wav"),
+]
+
+# Imagens básicas (caminho, cor)
+BASE_IMAGES = [
+    ("assets/images/tiles/empty.png", (50, 150, 50)),
+    ("assets/images/tiles/wall.png", (100, 100, 100)),
+]
+
+DEFAULT_ITEMS = {
+    "tile_types": {
+        "0": {
+            "name": "Vazio",
+            "type": "terreno",
+            "collision": False,
+            "image": "tiles/empty.png",
+            "details": {
+                "walkable": True
+            }
+        },
+        "1": {
+            "name": "Parede",
+            "type": "terreno",
+            "collision": True,
+            "image": "tiles/wall.png",
+            "details": {
+                "walkable": False,
+                "destructible": False
+            }
+        }
+    }
+}
+
+DEFAULT_MAP = {
+    "name": "Mapa Padrão",
+    "width": 25,
+    "height": 19,
+    "tile_size": 32,
+    "background_color": [50, 150, 50],
+    "wall_color": [100, 100, 100],
+    "data": [[1 if x == 0 or x == 24 or y == 0 or y == 18 else 0 for x in range(25)] for y in range(19)],
+    "portals": [],
+    "objects": [],
+    "enemies": [],
+    "edge_transitions": {"left": None, "right": None, "top": None, "bottom": None}
+}
+
 def check_directory(path):
     """Verifica se um diretório existe e o cria se necessário"""
     if not os.path.exists(path):
@@ -89,108 +184,174 @@ def check_image_file(path, size=(32, 32), color=(200, 200, 200), item_type=None)
     
     return True
 
-def check_game_files():
-    """Verifica e corrige os arquivos do jogo"""
-    print("Verificando arquivos do jogo...")
-    
-    # Inicializa o pygame para poder criar imagens
-    pygame.init()
-    
-    # Verifica diretórios principais
-    check_directory("maps")
-    check_directory("config")
-    check_directory("assets")
-    check_directory("assets/images")
-    check_directory("assets/images/tiles")
-    check_directory("assets/images/objects")
-    check_directory("assets/images/items")
-    check_directory("assets/images/enemies")
-    check_directory("assets/images/npcs")
-    check_directory("assets/sounds")
-    check_directory("assets/sounds/music")
-    check_directory("assets/sounds/effects")
-    
-    # Verifica arquivos de configuração
-    default_items = {
-        "tile_types": {
-            "0": {
-                "name": "Vazio",
-                "type": "terreno",
-                "collision": False,
-                "image": "tiles/empty.png",
-                "details": {
-                    "walkable": True
-                }
-            },
-            "1": {
-                "name": "Parede",
-                "type": "terreno",
-                "collision": True,
-                "image": "tiles/wall.png",
-                "details": {
-                    "walkable": False,
-                    "destructible": False
-                }
-            }
-        }
-    }
-    
-    # Carrega a configuração de itens para verificar as imagens
-    items_config = default_items
-    if check_json_file("config/items.json", default_items):
+def load_items_config():
+    """Verifica items.json e retorna a configuração de itens (a padrão se o arquivo for inválido)"""
+    items_config = DEFAULT_ITEMS
+    if check_json_file(ITEMS_PATH, DEFAULT_ITEMS):
         try:
-            with open("config/items.json", "r", encoding="utf-8") as f:
+            with open(ITEMS_PATH, "r", encoding="utf-8") as f:
                 items_config = json.load(f)
         except:
             pass
-    
-    # Verifica mapas
-    default_map = {
-        "name": "Mapa Padrão",
-        "width": 25,
-        "height": 19,
-        "tile_size": 32,
-        "background_color": [50, 150, 50],
-        "wall_color": [100, 100, 100],
-        "data": [[1 if x == 0 or x == 24 or y == 0 or y == 18 else 0 for x in range(25)] for y in range(19)],
-        "portals": [],
-        "objects": [],
-        "enemies": [],
-        "edge_transitions": {"left": None, "right": None, "top": None, "bottom": None}
-    }
-    check_json_file("maps/map1.json", default_map)
-    
-    # Verifica arquivos de áudio
-    check_audio_file("assets/sounds/music/forest.mp3")
-    check_audio_file("assets/sounds/music/cave.mp3")
-    check_audio_file("assets/sounds/music/desert.mp3")
-    check_audio_file("assets/sounds/music/lake.mp3")
-    
-    check_audio_file("assets/sounds/effects/door.wav", '.wav')
-    check_audio_file("assets/sounds/effects/door_locked.wav", '.wav')
-    check_audio_file("assets/sounds/effects/chest.wav", '.wav')
-    check_audio_file("assets/sounds/effects/coin.wav", '.wav')
-    check_audio_file("assets/sounds/effects/potion.wav", '.wav')
-    check_audio_file("assets/sounds/effects/key.wav", '.wav')
-    check_audio_file("assets/sounds/effects/bush.wav", '.wav')
-    check_audio_file("assets/sounds/effects/grass.wav", '.wav')
-    check_audio_file("assets/sounds/effects/sign.wav", '.wav')
-    
-    # Verifica imagens básicas
-    check_image_file("assets/images/tiles/empty.png", color=(50, 150, 50), item_type="terreno")
-    check_image_file("assets/images/tiles/wall.png", color=(100, 100, 100), item_type="terreno")
-    
-    # Verifica imagens de todos os itens na configuração
+    return items_config
+
+def item_images(items_config):
+    """Lista [caminho, tipo] das imagens de todos os itens na configuração"""
+    images = []
     for tile_id, tile_info in items_config.get("tile_types", {}).items():
         image_path = tile_info.get("image", "")
         if image_path:
-            full_path = os.path.join("assets/images", image_path)
-            item_type = tile_info.get("type", "")
-            check_image_file(full_path, item_type=item_type)
+            images.append([os.path.join("assets/images", image_path), tile_info.get("type", "")])
+    return images
+
+def file_checks(images):
+    """Retorna {caminho: função de verificação} dos arquivos verificados além de items.json"""
+    checks = {DEFAULT_MAP_PATH: lambda: check_json_file(DEFAULT_MAP_PATH, DEFAULT_MAP)}
+    
+    for path, file_type in AUDIO_FILES:
+        checks[path] = lambda path=path, file_type=file_type: check_audio_file(path, file_type)
+    
+    for path, color in BASE_IMAGES:
+        checks[path] = lambda path=path, color=color: check_image_file(path, color=color, item_type="terreno")
+    
+    # Imagens dos itens (as básicas já verificadas não são verificadas de novo)
+    for path, item_type in images:
+        if path not in checks:
+            checks[path] = lambda path=path, item_type=item_type: check_image_file(path, item_type=item_type)
+    
+    return checks
+
+def file_hash(path):
+    """Hash do conteúdo de um arquivo"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def file_record(path, previous=None):
+    """Registro do manifesto de um arquivo (o hash é reaproveitado se tamanho e data não mudaram)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return {"missing": True}
+    
+    if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+        content_hash = previous["hash"]
+    else:
+        content_hash = file_hash(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": content_hash}
+
+def compare_record(path, record):
+    """Compara um arquivo com o seu registro ("same", "touched" se só a data mudou, ou "changed")"""
+    if record is None:
+        return "changed"
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return "same" if record.get("missing", False) else "changed"
+    
+    if record.get("missing", False) or stat.st_size != record.get("size"):
+        return "changed"
+    if stat.st_mtime_ns == record.get("mtime_ns"):
+        return "same"
+    
+    # Data alterada (cópia, checkout...): só é uma alteração se o conteúdo mudou
+    return "touched" if file_hash(path) == record.get("hash") else "changed"
+
+def load_manifest():
+    """Lê o manifesto da última verificação (None se não existir ou for de outra versão)"""
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
     
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+    if not isinstance(manifest.get("files"), dict) or not isinstance(manifest.get("images"), list):
+        return None
+    return manifest
+
+def save_manifest(images, paths, previous):
+    """Grava o manifesto com o estado atual dos arquivos verificados"""
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "images": images,
+        "files": {path: file_record(path, previous.get(path)) for path in paths},
+    }
+    
+    tmp_path = MANIFEST_PATH + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, MANIFEST_PATH)
+    except OSError as e:
+        # Sem o manifesto a próxima inicialização apenas faz a verificação completa
+        print(f"Aviso: não foi possível gravar o manifesto {MANIFEST_PATH}: {e}")
+
+def check_game_files(full=False):
+    """Verifica e corrige os arquivos do jogo
+    
+    Com o manifesto da última verificação, apenas os arquivos alterados desde então
+    são verificados; full=True ignora o manifesto e verifica tudo (reparo).
+    """
+    print("Verificando arquivos do jogo...")
+    
+    manifest = None if full else load_manifest()
+    if manifest is None:
+        # Verificação completa
+        for path in DIRECTORIES:
+            check_directory(path)
+        
+        # Carrega a configuração de itens para verificar as imagens
+        images = item_images(load_items_config())
+        checks = file_checks(images)
+        for check in checks.values():
+            check()
+        
+        save_manifest(images, [ITEMS_PATH] + list(checks), {})
+        print("Verificação concluída!")
+        return
+    
+    previous = manifest["files"]
+    images = manifest["images"]
+    checks = file_checks(images)
+    
+    # Um stat por diretório e por arquivo do manifesto
+    missing_directories = [path for path in DIRECTORIES if not os.path.isdir(path)]
+    states = {path: compare_record(path, previous.get(path)) for path in [ITEMS_PATH] + list(checks)}
+    changed = [path for path, state in states.items() if state == "changed"]
+    
+    if not missing_directories and not changed:
+        if "touched" in states.values():
+            save_manifest(images, list(states), previous)
+        print("Verificação concluída (nenhum arquivo alterado)")
+        return
+    
+    print(f"Verificando {len(changed)} arquivo(s) alterado(s) desde a última verificação")
+    for path in missing_directories:
+        check_directory(path)
+    
+    if states[ITEMS_PATH] == "changed":
+        # A lista de imagens depende de items.json; as imagens novas também são verificadas
+        images = item_images(load_items_config())
+        checks = file_checks(images)
+        changed += [path for path in checks if path not in states]
+    
+    for path in changed:
+        if path in checks:
+            checks[path]()
+    
+    save_manifest(images, [ITEMS_PATH] + list(checks), previous)
     print("Verificação concluída!")
 
 if __name__ == "__main__":
-    check_game_files()
+    parser = argparse.ArgumentParser(description="Verifica e corrige os arquivos do jogo")
+    parser.add_argument("--full", action="store_true",
+                        help="verifica todos os arquivos, ignorando o manifesto da última verificação")
+    args = parser.parse_args()
+    
+    check_game_files(full=args.full)
     print("Pressione Enter para sair...")
     input() 
\ No newline at end of file
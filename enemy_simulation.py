@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Simulação dos inimigos de um mapa.
+#
+# O estado de todos os inimigos fica em arrays NumPy paralelos (uma entrada
+# por inimigo: posição, velocidade, comportamento, ...), e cada tick atualiza
+# cada comportamento de "enemy_behaviors" (static, random, patrol, chase) em
+# uma única operação vetorizada, sem laços em Python por inimigo.
+#
+# Unidades: em config/items.json os raios (patrol_radius, detection_radius)
+# estão em pixels; nos "details" de um inimigo no mapa, que sobrescrevem os
+# do tipo, estão em tiles, como as demais posições do mapa. speed é sempre
+# em pixels por tick.
+#
+# Um inimigo detecta o jogador quando ele está dentro do raio de detecção e
+# há linha de visão entre os dois (ver visibility.py). Depois de detectá-lo,
+# o inimigo o persegue enquanto ele continuar no raio, mesmo sem vê-lo,
+# seguindo o campo de fluxo compartilhado do mapa (ver pathfinding.py).
+
+import numpy as np
+import pygame
+
+# Comportamentos (ver "enemy_behaviors" em items.json)
+STATIC = 0   # não se move
+RANDOM = 1   # anda em direções aleatórias
+PATROL = 2   # vai e volta na horizontal dentro do raio de patrulha
+CHASE = 3    # persegue o jogador quando ele está dentro do raio de detecção
+
+BEHAVIORS = {"static": STATIC, "random": RANDOM, "patrol": PATROL, "chase": CHASE}
+
+# Direções possíveis do movimento aleatório (a primeira é ficar parado)
+RANDOM_DIRECTIONS = np.array([(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)], dtype=np.float32)
+
+# Tiles a mais, além do maior raio de detecção, cobertos pelo campo de fluxo
+# (o caminho até o jogador pode dar voltas fora do raio)
+FIELD_MARGIN = 8
+
+# Folga, em pixels, nas bordas do inimigo ao testar colisões (absorve erros de
+# arredondamento das posições fracionárias ao encostar em uma parede)
+COLLISION_TOLERANCE = 0.5
+
+# Intervalo, em ticks, entre trocas de direção do movimento aleatório
+RANDOM_MIN_TICKS = 30
+RANDOM_MAX_TICKS = 120
+
+class EnemySimulation:
+    def __init__(self, game_map, seed=None):
+        self.map = game_map
+        self.tile_size = game_map.tile_size
+        self.rng = np.random.default_rng(seed)
+        
+        enemies = game_map.enemies
+        count = len(enemies)
+        
+        # Tipo (id do tile) de cada inimigo
+        self.type_id = np.zeros(count, dtype=np.int32)
+        
+        # Posição atual e inicial (canto superior esquerdo, em pixels) e velocidade (pixels por tick)
+        self.x = np.zeros(count, dtype=np.float32)
+        self.y = np.zeros(count, dtype=np.float32)
+        self.home_x = np.zeros(count, dtype=np.float32)
+        self.home_y = np.zeros(count, dtype=np.float32)
+        self.vx = np.zeros(count, dtype=np.float32)
+        self.vy = np.zeros(count, dtype=np.float32)
+        
+        # Posição no tick anterior (o desenho interpola entre ela e a atual, como o do jogador)
+        self.previous_x = np.zeros(count, dtype=np.float32)
+        self.previous_y = np.zeros(count, dtype=np.float32)
+        
+        # Parâmetros de cada inimigo
+        self.speed = np.zeros(count, dtype=np.float32)
+        self.patrol_radius = np.zeros(count, dtype=np.float32)
+        self.detection_radius = np.zeros(count, dtype=np.float32)
+        self.behavior = np.zeros(count, dtype=np.int8)
+        self.collides = np.zeros(count, dtype=bool)
+        
+        # Estado dos comportamentos: ticks até trocar de direção (random),
+        # sentido da patrulha (patrol) e se o jogador foi detectado (chase)
+        self.timer = np.zeros(count, dtype=np.int32)
+        self.direction = np.ones(count, dtype=np.float32)
+        self.chasing = np.zeros(count, dtype=bool)
+        
+        # Inimigos que não conseguiram se mover no último tick
+        self.blocked = np.zeros(count, dtype=bool)
+        
+        for index, enemy in enumerate(enemies):
+            type_details = enemy.tile_type.get("details", {})
+            details = enemy.details
+            
+            self.type_id[index] = enemy.id
+            self.x[index] = self.home_x[index] = self.previous_x[index] = enemy.rect.x
+            self.y[index] = self.home_y[index] = self.previous_y[index] = enemy.rect.y
+            self.speed[index] = details.get("speed", type_details.get("speed", 0))
+            self.patrol_radius[index] = self._radius(details, type_details, "patrol_radius")
+            self.detection_radius[index] = self._radius(details, type_details, "detection_radius")
+            self.behavior[index] = BEHAVIORS.get(type_details.get("behavior", "static"), STATIC)
+            self.collides[index] = enemy.collision
+        
+        # Máscaras de cada comportamento (fixas durante a simulação)
+        self.behavior_masks = {
+            behavior: self.behavior == behavior
+            for behavior in (RANDOM, PATROL, CHASE)
+            if (self.behavior == behavior).any()
+        }
+        
+        # Raio, em tiles, do campo de fluxo usado pelos que perseguem o jogador
+        chase_radius = self.detection_radius[self.behavior == CHASE]
+        self.field_radius = int(chase_radius.max() // self.tile_size) + FIELD_MARGIN if len(chase_radius) else 0
+        
+        # Os inimigos de comportamento aleatório não trocam de direção todos no mesmo tick
+        self.timer[:] = self.rng.integers(0, RANDOM_MAX_TICKS, count)
+    
+    def _radius(self, details, type_details, key):
+        """Raio em pixels: o do inimigo no mapa (em tiles) ou, na falta dele, o do tipo (em pixels)"""
+        if key in details:
+            return details[key] * self.tile_size
+        return type_details.get(key, 0)
+    
+    def __len__(self):
+        return len(self.x)
+    
+    @property
+    def moving(self):
+        """Máscara dos inimigos que se moveram no último tick"""
+        return (self.vx != 0) | (self.vy != 0)
+    
+    def _blocked(self, x, y, player_rect):
+        """Máscara das posições (canto superior esquerdo, em pixels) onde o inimigo colide
+        
+        Verifica os quatro cantos contra as células bloqueadas do mapa (tiles sólidos e
+        objetos com colisão), as bordas e o jogador.
+        """
+        size = self.tile_size
+        width, height = self.map.width, self.map.height
+        solid = np.frombuffer(self.map.blocking, dtype=np.uint8)
+        
+        # Fora do mapa
+        blocked = (x < 0) | (y < 0) | (x > (width - 1) * size) | (y > (height - 1) * size)
+        
+        # Células dos cantos (as posições fora do mapa, já bloqueadas, são trazidas para dentro)
+        x = np.where(blocked, 0, x)
+        y = np.where(blocked, 0, y)
+        left = ((x + COLLISION_TOLERANCE) // size).astype(np.intp)
+        right = ((x + size - COLLISION_TOLERANCE) // size).astype(np.intp)
+        top = ((y + COLLISION_TOLERANCE) // size).astype(np.intp) * width
+        bottom = ((y + size - COLLISION_TOLERANCE) // size).astype(np.intp) * width
+        blocked |= (solid[top + left] | solid[top + right] | solid[bottom + left] | solid[bottom + right]) != 0
+        
+        # Os inimigos não entram no jogador
+        if player_rect is not None:
+            blocked |= ((x < player_rect.right) & (x + size > player_rect.left) &
+                        (y < player_rect.bottom) & (y + size > player_rect.top))
+        return blocked
+    
+    def _update_random(self, mask, blocked_last):
+        """Anda em uma direção aleatória, trocando ao fim do intervalo ou ao bater em algo"""
+        self.timer[mask] -= 1
+        change = mask & ((self.timer <= 0) | blocked_last)
+        count = int(change.sum())
+        if count:
+            directions = RANDOM_DIRECTIONS[self.rng.integers(0, len(RANDOM_DIRECTIONS), count)]
+            self.vx[change] = directions[:, 0] * self.speed[change]
+            self.vy[change] = directions[:, 1] * self.speed[change]
+            self.timer[change] = self.rng.integers(RANDOM_MIN_TICKS, RANDOM_MAX_TICKS, count)
+    
+    def _update_patrol(self, mask, blocked_last):
+        """Vai e volta na horizontal em torno da posição inicial"""
+        offset = self.x - self.home_x
+        reverse = mask & (blocked_last |
+                          ((offset >= self.patrol_radius) & (self.direction > 0)) |
+                          ((offset <= -self.patrol_radius) & (self.direction < 0)))
+        self.direction[reverse] = -self.direction[reverse]
+        self.vx[mask] = self.direction[mask] * self.speed[mask]
+        self.vy[mask] = 0
+    
+    def seeing(self, player_rect, mask=None):
+        """Máscara dos inimigos (entre os da máscara) que veem o jogador
+        
+        Um inimigo vê o jogador se ele estiver no raio de detecção e houver linha de visão.
+        """
+        in_radius = self._in_detection_radius(player_rect)
+        if mask is not None:
+            in_radius &= mask
+        
+        candidates = np.flatnonzero(in_radius)
+        if len(candidates):
+            size = self.tile_size
+            half = size / 2
+            player_tile = (player_rect.centerx // size, player_rect.centery // size)
+            tile_x = ((self.x[candidates] + half) // size).astype(np.intp)
+            tile_y = ((self.y[candidates] + half) // size).astype(np.intp)
+            in_radius[candidates] = self.map.visibility.visible_from(tile_x, tile_y, player_tile)
+        return in_radius
+    
+    def _in_detection_radius(self, player_rect):
+        """Máscara dos inimigos com o jogador dentro do raio de detecção"""
+        half = self.tile_size / 2
+        dx = player_rect.centerx - (self.x + half)
+        dy = player_rect.centery - (self.y + half)
+        return dx * dx + dy * dy <= self.detection_radius * self.detection_radius
+    
+    def _update_chase(self, mask, player_rect):
+        """Segue o jogador depois de vê-lo, enquanto ele estiver no raio de detecção; senão, volta para a posição inicial"""
+        half = self.tile_size / 2
+        if player_rect is not None:
+            # Continua perseguindo quem já perseguia; os demais precisam ver o jogador
+            in_radius = mask & self._in_detection_radius(player_rect)
+            self.chasing = (in_radius & self.chasing) | self.seeing(player_rect, in_radius & ~self.chasing)
+        else:
+            self.chasing[:] = False
+        
+        # Alvo: o jogador, para quem o detectou, ou a posição inicial
+        returning = mask & ~self.chasing
+        if player_rect is not None:
+            target_x = np.where(self.chasing, player_rect.centerx - half, self.home_x)
+            target_y = np.where(self.chasing, player_rect.centery - half, self.home_y)
+            
+            # Longe do jogador, o alvo é o próximo tile do caminho no campo de fluxo
+            chasers = np.flatnonzero(self.chasing)
+            if len(chasers):
+                size = self.tile_size
+                player_tile = (player_rect.centerx // size, player_rect.centery // size)
+                tile_x = ((self.x[chasers] + half) // size).astype(np.intp)
+                tile_y = ((self.y[chasers] + half) // size).astype(np.intp)
+                field = self.map.pathfinder.flow_field(player_tile, self.field_radius, (tile_x, tile_y))
+                next_x, next_y, valid = field.next_tiles(tile_x, tile_y)
+                target_x[chasers[valid]] = next_x[valid] * size
+                target_y[chasers[valid]] = next_y[valid] * size
+        else:
+            target_x, target_y = self.home_x, self.home_y
+        
+        dx = target_x - self.x
+        dy = target_y - self.y
+        distance = np.sqrt(dx * dx + dy * dy)
+        
+        # Não ultrapassa o alvo no último passo
+        step = np.minimum(self.speed, distance)
+        moving = (self.chasing | returning) & (distance > 0.5)
+        scale = np.divide(step, distance, out=np.zeros_like(distance), where=moving)
+        self.vx[mask] = (dx * scale)[mask]
+        self.vy[mask] = (dy * scale)[mask]
+    
+    def update(self, player_rect=None):
+        """Avança todos os inimigos em um tick
+        
+        player_rect é o retângulo do jogador (None sem jogador). Retorna a máscara
+        dos inimigos que se moveram, para que suas regiões da tela sejam redesenhadas.
+        """
+        self.previous_x[:] = self.x
+        self.previous_y[:] = self.y
+        
+        masks = self.behavior_masks
+        if RANDOM in masks:
+            self._update_random(masks[RANDOM], self.blocked)
+        if PATROL in masks:
+            self._update_patrol(masks[PATROL], self.blocked)
+        if CHASE in masks:
+            self._update_chase(masks[CHASE], player_rect)
+        
+        # Move eixo por eixo, como o jogador, para deslizar ao longo das paredes;
+        # só os inimigos com velocidade no eixo são verificados
+        self.blocked = np.zeros(len(self), dtype=bool)
+        for position, velocity, other in ((self.x, self.vx, self.y), (self.y, self.vy, self.x)):
+            indices = np.flatnonzero(velocity)
+            if not len(indices):
+                continue
+            new_position = position[indices] + velocity[indices]
+            if position is self.x:
+                blocked = self._blocked(new_position, other[indices], player_rect)
+            else:
+                blocked = self._blocked(other[indices], new_position, player_rect)
+            free = indices[~blocked]
+            position[free] = new_position[~blocked]
+            stopped = indices[blocked]
+            velocity[stopped] = 0
+            self.blocked[stopped] = True
+        return self.moving
+    
+    def rects(self, mask=None):
+        """Retângulos (em pixels do mundo) dos inimigos selecionados pela máscara"""
+        indices = np.flatnonzero(mask) if mask is not None else range(len(self))
+        size = self.tile_size
+        return [pygame.Rect(int(self.x[i]), int(self.y[i]), size, size) for i in indices]
+    
+    def interpolated_positions(self, alpha):
+        """Posições (x, y) entre as do tick anterior (alpha=0) e as atuais (alpha=1)
+        
+        Truncadas para pixels inteiros, como em rects(), para ficarem sempre dentro das
+        regiões marcadas para redesenho.
+        """
+        x = (self.previous_x + (self.x - self.previous_x) * alpha).astype(np.int32)
+        y = (self.previous_y + (self.y - self.previous_y) * alpha).astype(np.int32)
+        return x, y
+    
+    def visible(self, view, x=None, y=None):
+        """Índices dos inimigos que aparecem no retângulo view (em pixels do mundo)
+        
+        x e y são as posições a considerar (por padrão, as atuais).
+        """
+        if x is None:
+            x, y = self.x, self.y
+        size = self.tile_size
+        return np.flatnonzero((x < view.right) & (x + size > view.left) &
+                              (y < view.bottom) & (y + size > view.top))
+    
+    def query_rects(self, rect):
+        """Retângulos dos inimigos com colisão que tocam o retângulo informado"""
+        if not len(self):
+            return []
+        size = self.tile_size
+        mask = (self.collides &
+                (self.x < rect.right) & (self.x + size > rect.left) &
+                (self.y < rect.bottom) & (self.y + size > rect.top))
+        if not mask.any():
+            return []
+        return self.rects(mask)
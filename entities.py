@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Entidades posicionadas nos mapas (objetos, inimigos, portais e portas).
+#
+# As entradas do JSON dos mapas são convertidas uma única vez, no carregamento,
+# em registros com __slots__: o tipo já resolvido na tabela de tipos, o retângulo em
+# pixels e o ID como texto (internado) para as tabelas de imagens e sons. Os
+# laços executados a cada quadro leem atributos, sem consultar dicionários nem
+# converter IDs.
+
+import sys
+
+import pygame
+
+from tile_types import COLLISION, INTERACTIVE
+
+class Entity:
+    __slots__ = ("id", "key", "x", "y", "rect", "details", "tile_type", "name", "kind",
+                 "collision", "interactive")
+    
+    def __init__(self, entry, tile_types, tile_size):
+        # ID numérico do tipo e o mesmo ID como texto, chave das imagens, sons e animações
+        self.id = entry.get("id", 0)
+        self.key = sys.intern(str(self.id))
+        
+        # Posição em tiles e retângulo em pixels
+        self.x = entry.get("x", 0)
+        self.y = entry.get("y", 0)
+        self.rect = pygame.Rect(self.x * tile_size, self.y * tile_size, tile_size, tile_size)
+        
+        # Detalhes desta entidade no mapa (sobrescrevem os do tipo)
+        self.details = entry.get("details", {})
+        
+        # Configuração do tipo em items.json (compartilhada entre as entidades do mesmo tipo)
+        self.tile_type = tile_types.entry(self.id)
+        self.name = tile_types.name(self.id)
+        self.kind = tile_types.category(self.id)
+        
+        # Flags já calculadas pela tabela de tipos
+        flags = tile_types.flags[self.id] if self.id in tile_types else 0
+        self.collision = bool(flags & COLLISION)
+        self.interactive = bool(flags & INTERACTIVE)
+    
+    def __repr__(self):
+        return f"Entity(id={self.id}, x={self.x}, y={self.y})"
+
+class Portal:
+    __slots__ = ("x", "y", "target_map", "target_x", "target_y")
+    
+    def __init__(self, entry):
+        self.x = entry.get("x", 0)
+        self.y = entry.get("y", 0)
+        self.target_map = entry.get("target_map", "map1")
+        self.target_x = entry.get("target_x", 1)
+        self.target_y = entry.get("target_y", 1)
+    
+    def __repr__(self):
+        return f"Portal(x={self.x}, y={self.y}, target_map={self.target_map!r})"
+
+class Door:
+    __slots__ = ("x", "y", "rect")
+    
+    def __init__(self, x, y, tile_size):
+        # Posição em tiles e retângulo em pixels
+        self.x = x
+        self.y = y
+        self.rect = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
+    
+    def __repr__(self):
+        return f"Door(x={self.x}, y={self.y})"
+
+def build_entities(entries, tile_types, tile_size):
+    """Converte as entradas de objetos ou inimigos do JSON do mapa em entidades"""
+    return [Entity(entry, tile_types, tile_size) for entry in entries]
+
+def build_portals(entries):
+    """Converte as entradas de portais do JSON do mapa"""
+    return [Portal(entry) for entry in entries]
+
+def build_doors(cells, tile_size):
+    """Cria as portas a partir das células (x, y) da grade que têm o tile de porta"""
+    return [Door(x, y, tile_size) for x, y in cells]
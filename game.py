@@ -4,38 +4,78 @@
 import pygame
 import sys
 import os
+import time
 from player import Player
-from map import Map
+from animation import animation_clock
+from camera import Camera
+from world_index import get_world_index
+from asset_cache import asset_cache
+from text_cache import text_cache
+from map_prefetcher import MapPrefetcher
+from input_source import KeyboardInput
+from profiler import FrameProfiler, startup_timer
+from startup_loader import StartupLoader
 from game_state import GameState
 from title_screen import TitleScreen
 from character_select import CharacterSelect
 from pause_screen import PauseScreen
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, input_source=None, seed=None):
+        # Sem janela: a simulação roda sem renderizar, com vídeo e áudio falsos do SDL
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        
+        # Semente do movimento aleatório dos inimigos (--seed torna as simulações reproduzíveis)
+        self.seed = seed
+        
+        # Origem dos eventos e das teclas pressionadas (teclado ou entrada programática)
+        self.input_source = input_source if input_source is not None else KeyboardInput()
+        
         # Inicializa o pygame
-        pygame.init()
-        pygame.mixer.init()  # Inicializa o mixer para áudio
+        with startup_timer.stage("pygame.init"):
+            pygame.init()
+            pygame.mixer.init()  # Inicializa o mixer para áudio
         
         # Constantes
         self.BASE_WIDTH = 800
         self.BASE_HEIGHT = 600
-        self.FPS = 60
+        self.FPS = 144  # Limite de quadros renderizados por segundo (0 = sem limite)
+        self.TICK_RATE = 60  # Atualizações da simulação por segundo (velocidades e timers contam ticks)
+        self.MAX_TICKS_PER_FRAME = 5  # Limite de atualizações para recuperar o atraso em um quadro
         self.TITLE = "Jogo Top-Down"
+        self.ASSET_CACHE_BUDGET = 64 * 1024 * 1024  # Memória máxima para imagens e sons em cache (os ainda usados pelos mapas em cache ficam além dela)
+        self.USE_DIRTY_RECTS = True  # Atualiza apenas as regiões da tela que mudaram (False = tela inteira a cada quadro)
+        
+        # Imagens e sons são compartilhados entre todos os mapas
+        asset_cache.set_memory_budget(self.ASSET_CACHE_BUDGET)
         
-        # Carrega o mapa inicial para obter suas dimensões
+        # Índice de todos os mapas e suas ligações (construído uma única vez)
+        with startup_timer.stage("world_index"):
+            self.world_index = get_world_index()
+        
+        # O mapa inicial é carregado em segundo plano (ver init_game); as dimensões vêm do índice
         self.current_map_id = "map1"
-        self.map = Map(self.current_map_id)
+        self.map = None
+        self.startup_loader = None
+        map_width, map_height, tile_size = self.world_index.sizes.get(self.current_map_id, (25, 19, 32))
         
         # Ajusta o tamanho da tela com base no tamanho do mapa
-        self.WIDTH = min(1280, self.map.width * self.map.tile_size)
-        self.HEIGHT = min(960, self.map.height * self.map.tile_size)
+        self.WIDTH = min(1280, map_width * tile_size)
+        self.HEIGHT = min(960, map_height * tile_size)
         
         # Configuração da tela
-        self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
-        pygame.display.set_caption(self.TITLE)
+        with startup_timer.stage("window"):
+            self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
+            pygame.display.set_caption(self.TITLE)
         
-        # Relógio para controlar FPS
+        # Câmera que segue o jogador em mapas maiores que a janela
+        self.camera = Camera(self.WIDTH, self.HEIGHT)
+        self.camera.set_map_size(map_width * tile_size, map_height * tile_size)
+        
+        # Relógio para limitar os quadros por segundo
         self.clock = pygame.time.Clock()
         
         # Estado do jogo
@@ -55,16 +95,24 @@ class Game:
         self.error_timer = 0
         self.error_item_id = None  # ID do item que gerou a mensagem
         self.error_is_dialog = False  # Indica se é um diálogo (não um erro)
+        self.error_surface = None  # Mensagem já montada, pronta para ser desenhada
+        self.error_position = (0, 0)
         
         # Controle de colisão
         self.last_collision_time = 0
-        self.collision_message_cooldown = 60  # 1 segundo a 60 FPS
+        self.collision_message_cooldown = 60  # 1 segundo a 60 ticks por segundo
         self.last_collision_state = False  # Estado da última colisão
         self.collision_log_counter = 0
-        self.collision_log_frequency = 120  # Só mostra log a cada 120 frames (aproximadamente 2 segundos)
+        self.collision_log_frequency = 120  # Só mostra log a cada 120 ticks (aproximadamente 2 segundos)
         
         # Opções de depuração
         self.show_hitbox = False
+        self.show_profiler = False  # Painel de desempenho (tecla P)
+        
+        # Tempos de cada fase dos quadros recentes; profile_path grava a sessão ao sair
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = None
+        self.profile_path = None
         
         # Transição entre mapas
         self.transition_cooldown = 0
@@ -72,6 +120,19 @@ class Game:
         # Trilha sonora atual
         self.current_soundtrack = None
         self.soundtrack_warnings_shown = []  # Lista para controlar quais avisos já foram exibidos
+        self.soundtrack_exists = {}  # Caminho -> se o arquivo existe
+        
+        # Carregamento antecipado dos mapas vizinhos em segundo plano
+        self.map_prefetcher = MapPrefetcher(seed=self.seed)
+        
+        # Renderização por regiões alteradas (ver USE_DIRTY_RECTS)
+        self.full_redraw = True  # Redesenha a tela inteira no próximo quadro
+        self.dirty_rects = []  # Regiões da tela a redesenhar no próximo quadro
+        self.last_frame_key = None  # Estado que, ao mudar, exige redesenhar tudo
+        self.last_tracked = []  # Elementos móveis desenhados no último quadro
+        
+        # Fração do tick seguinte já decorrida, usada para interpolar as posições na renderização
+        self.render_alpha = 1.0
         
         # Flag para controlar o loop principal
         self.running = True
@@ -80,31 +141,62 @@ class Game:
         self.init_game()
     
     def init_game(self):
-        """Inicializa o jogo"""
+        """Inicializa o jogo: o mapa inicial é carregado em segundo plano enquanto os menus aparecem"""
+        self.current_map_id = "map1"
+        self.startup_loader = StartupLoader(self.current_map_id, self.seed)
+        self.startup_loader.start()
+        self.title_screen.set_loading(self.startup_loader.progress())
+    
+    def poll_startup(self):
+        """Atualiza o progresso do carregamento inicial e, se ele terminou, passa a usar o mapa"""
+        if self.startup_loader.done():
+            self.finish_startup()
+        elif self.title_screen.set_loading(self.startup_loader.progress()):
+            self.full_redraw = True
+    
+    def finish_startup(self):
+        """Passa a usar o mapa inicial, esperando o carregamento em segundo plano se necessário"""
         try:
-            # Carrega o mapa inicial
-            self.current_map_id = "map1"
-            self.map = Map(self.current_map_id)
+            self.map = self.startup_loader.wait()
+            if self.title_screen.set_loading(None):
+                self.full_redraw = True
+            
+            # Ajusta a câmera para o tamanho do mapa
+            self.camera.set_map_size(self.map.width * self.map.tile_size, self.map.height * self.map.tile_size)
             
             # Verifica se o mapa foi carregado corretamente
             if self.map.id == "error":
                 print("Aviso: Mapa inicial não pôde ser carregado corretamente.")
                 self.show_error("Erro ao carregar o mapa inicial. Verifique os arquivos do jogo.")
+            else:
+                # Prepara os mapas vizinhos em segundo plano
+                self.map_prefetcher.add(self.map)
+                self.map_prefetcher.prefetch_neighbours(self.map, self.world_index.neighbours(self.map.id))
             
             # Inicia a trilha sonora do mapa
             self.play_map_soundtrack()
         except Exception as e:
             print(f"Erro ao inicializar o jogo: {e}")
             self.show_error(f"Erro ao inicializar o jogo: {e}")
+        
+        startup_timer.mark("mapa inicial pronto")
+        print(startup_timer.report())
     
     def start_game(self, character_data=None):
         """Inicia um novo jogo"""
+        # Se o mapa inicial ainda estiver sendo carregado, espera por ele
+        if self.map is None:
+            self.finish_startup()
+        
         try:
             # Cria o jogador
             self.all_sprites.empty()
-            self.player = Player(self.WIDTH // 2, self.HEIGHT // 2, character_data)
+            self.player = Player(self.WIDTH // 2, self.HEIGHT // 2, character_data, self.input_source)
             self.all_sprites.add(self.player)
             
+            # Centraliza a câmera no jogador
+            self.camera.follow(self.player.rect)
+            
             # Muda o estado do jogo para "jogando"
             self.game_state.change_state(GameState.PLAYING)
             
@@ -121,21 +213,23 @@ class Game:
         # Se não há trilha sonora definida, não faz nada
         if not soundtrack_path:
             return
-            
-        # Verifica se o arquivo existe
+        
+        # Verifica se o arquivo existe (consultando o disco apenas uma vez por trilha)
         full_path = os.path.join("assets", "sounds", soundtrack_path)
-        if not os.path.exists(full_path):
+        if full_path not in self.soundtrack_exists:
+            self.soundtrack_exists[full_path] = os.path.exists(full_path)
+        if not self.soundtrack_exists[full_path]:
             # Evita mostrar o mesmo aviso várias vezes
             if full_path not in self.soundtrack_warnings_shown:
                 print(f"Aviso: Arquivo de áudio não encontrado: {full_path}")
                 self.soundtrack_warnings_shown.append(full_path)
             # Não tenta criar o arquivo nem tocar a trilha
             return
-            
+        
         # Se a trilha sonora for a mesma que já está tocando, não faz nada
         if self.current_soundtrack == soundtrack_path:
             return
-            
+        
         # Para a trilha sonora atual se houver
         try:
             if pygame.mixer.music.get_busy() and self.current_soundtrack != soundtrack_path:
@@ -145,7 +239,7 @@ class Game:
             if "stop_soundtrack" not in self.soundtrack_warnings_shown:
                 print(f"Aviso: Erro ao parar trilha sonora: {e}")
                 self.soundtrack_warnings_shown.append("stop_soundtrack")
-            
+        
         # Carrega e toca a nova trilha sonora
         try:
             pygame.mixer.music.load(full_path)
@@ -162,11 +256,15 @@ class Game:
     
     def process_events(self):
         """Processa os eventos (teclado, mouse, etc)"""
-        for event in pygame.event.get():
+        for event in self.input_source.get_events():
             if event.type == pygame.QUIT:
                 self.running = False
                 return
             
+            # Menus só mudam com eventos; a janela também pode precisar ser redesenhada
+            if not self.game_state.is_playing() or event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                self.full_redraw = True
+            
             # Processa eventos com base no estado atual do jogo
             if self.game_state.is_title_screen():
                 action = self.title_screen.handle_event(event)
@@ -189,6 +287,20 @@ class Game:
                 # ESC pausa o jogo
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     self.game_state.change_state(GameState.PAUSED)
+                
+                # Tecla H para mostrar/esconder hitbox (modo de depuração)
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                    self.show_hitbox = not self.show_hitbox
+                    print(f"Hitbox {'visível' if self.show_hitbox else 'oculta'}")
+                
+                # Tecla P para mostrar/esconder o painel de desempenho
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+                    self.show_profiler = not self.show_profiler
+                
+                # F12 grava os tempos dos quadros em um arquivo
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F12:
+                    self.profiler.dump(time.strftime("perfil_%Y%m%d_%H%M%S.json"))
+                
                 else:
                     # Passa o evento para o jogador
                     self.player.handle_event(event)
@@ -202,23 +314,13 @@ class Game:
                 elif action == "quit":
                     self.running = False
                     return
-            
-            # Eventos de teclado
-            elif event.type == pygame.KEYDOWN:
-                # Tecla ESC para pausar/despausar
-                if event.key == pygame.K_ESCAPE:
-                    if self.game_state.is_playing():
-                        self.game_state.change_state(GameState.PAUSED)
-                    elif self.game_state.is_paused():
-                        self.game_state.change_state(GameState.PLAYING)
-                
-                # Tecla H para mostrar/esconder hitbox (modo de depuração)
-                elif event.key == pygame.K_h:
-                    self.show_hitbox = not self.show_hitbox
-                    print(f"Hitbox {'visível' if self.show_hitbox else 'oculta'}")
     
     def update(self):
-        """Atualiza todos os objetos do jogo"""
+        """Atualiza todos os objetos do jogo (um tick da simulação)"""
+        # Guarda a posição do início do tick para a interpolação
+        if self.player:
+            self.player.previous_position = self.player.rect.topleft
+        
         # Atualiza o cooldown de transição
         if self.transition_cooldown > 0:
             self.transition_cooldown -= 1
@@ -228,6 +330,7 @@ class Game:
             self.error_timer -= 1
             if self.error_timer <= 0:
                 self.error_message = None
+                self.error_surface = None
         
         # Atualiza apenas se estiver jogando
         if self.game_state.is_playing():
@@ -236,7 +339,8 @@ class Game:
             
             # Move o jogador considerando colisões
             if self.player:
-                collision = self.player.move_with_collision(self.map.collision_rects)
+                with self.profiler.section("update.collision"):
+                    collision = self.player.move_with_collision(self.map)
                 
                 # Registra a colisão no log apenas quando o estado muda e com frequência limitada
                 if collision != self.last_collision_state:
@@ -254,6 +358,17 @@ class Game:
             map_height = self.map.height * self.map.tile_size
             self.player.constrain_to_map(map_width, map_height)
             
+            # Atualiza a câmera para seguir o jogador
+            self.camera.follow(self.player.rect)
+            
+            # Avança o relógio compartilhado das animações e o estado das animações do mapa
+            animation_clock.tick()
+            self.map.update_animations(self.player)
+            
+            # Move os inimigos
+            with self.profiler.section("update.enemies"):
+                self.map.update_enemies(self.player)
+            
             # Verifica interação com portas
             if self.player.interacting and self.transition_cooldown == 0:
                 portal = self.map.check_door_interaction(self.player)
@@ -278,16 +393,19 @@ class Game:
         """Muda para um novo mapa"""
         try:
             # Verifica se o arquivo do mapa existe
-            if not os.path.exists(os.path.join("maps", f"{map_id}.json")):
+            if not self.world_index.has_map(map_id):
                 self.show_error(f"Mapa não encontrado: {map_id}")
                 return
             
             # Guarda a trilha sonora atual
             previous_soundtrack = self.current_soundtrack
             
-            # Carrega o novo mapa
+            # Usa o mapa já preparado em segundo plano (ou carrega agora, se necessário)
             self.current_map_id = map_id
-            self.map = Map(map_id)
+            self.map = self.map_prefetcher.get(map_id)
+            
+            # Mapas em cache mantêm só os dados preparados; a visita começa do estado inicial
+            self.map.reset()
             
             # Ajusta o tamanho da tela para o novo mapa
             self.adjust_screen_size()
@@ -306,11 +424,22 @@ class Game:
             # Atualiza a hitbox do jogador
             self.player.update_hitbox()
             
+            # Não interpola entre a posição no mapa anterior e a no novo mapa
+            self.player.previous_position = self.player.rect.topleft
+            
+            # Reposiciona a câmera no novo mapa
+            self.camera.set_map_size(self.map.width * self.map.tile_size, self.map.height * self.map.tile_size)
+            self.camera.follow(self.player.rect)
+            
             # Atualiza a trilha sonora
             self.play_map_soundtrack()
             
             # Define um cooldown para evitar transições múltiplas
             self.transition_cooldown = 10
+            
+            # Só depois da troca começa a preparar os vizinhos do novo mapa,
+            # para que as threads de carregamento não atrasem a transição
+            self.map_prefetcher.prefetch_neighbours(self.map, self.world_index.neighbours(self.map.id))
         except Exception as e:
             self.show_error(f"Erro ao mudar de mapa: {e}")
     
@@ -335,12 +464,16 @@ class Game:
             
             # Redimensiona a tela
             self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
+            self.camera.resize(self.WIDTH, self.HEIGHT)
             
             # Atualiza as telas do jogo
             self.title_screen = TitleScreen(self.WIDTH, self.HEIGHT)
             self.character_select = CharacterSelect(self.WIDTH, self.HEIGHT)
             self.pause_screen = PauseScreen(self.WIDTH, self.HEIGHT)
             
+            # A mensagem atual depende do tamanho da tela
+            self.layout_error_message()
+            
             print(f"Tela redimensionada para {self.WIDTH}x{self.HEIGHT}")
         else:
             print(f"Tamanho da tela mantido em {self.WIDTH}x{self.HEIGHT}")
@@ -355,10 +488,193 @@ class Game:
         self.error_message = message
         self.error_item_id = item_id
         self.error_is_dialog = is_dialog
-        self.error_timer = 180  # 3 segundos a 60 FPS
+        self.error_timer = 180  # 3 segundos a 60 ticks por segundo
+        
+        # Monta a mensagem uma única vez; a renderização só faz um blit
+        self.layout_error_message()
+    
+    def layout_error_message(self):
+        """Monta a superfície da mensagem de erro ou do balão de diálogo atual"""
+        self.error_surface = None
+        if not self.error_message:
+            return
+        
+        if self.error_is_dialog:
+            # Balão de diálogo na parte inferior direita
+            dialog_width = min(400, self.WIDTH - 100)
+            dialog_height = 80
+            self.error_position = (self.WIDTH - dialog_width - 20, self.HEIGHT - dialog_height - 20)
+            
+            surface = pygame.Surface((dialog_width, dialog_height))
+            
+            # Desenha a borda do balão
+            surface.fill((100, 100, 200))
+            pygame.draw.rect(surface, (50, 50, 150), (0, 0, dialog_width, dialog_height), 2)
+            
+            # Fundo semitransparente do balão, por cima da borda
+            dialog_bg = pygame.Surface((dialog_width, dialog_height))
+            dialog_bg.fill((240, 240, 255))
+            dialog_bg.set_alpha(230)
+            surface.blit(dialog_bg, (0, 0))
+            
+            # Desenha a imagem do item, se disponível
+            if self.error_item_id and self.error_item_id in self.map.images:
+                # Miniatura da imagem (32x32)
+                item_image = self.map.images[self.error_item_id]
+                surface.blit(item_image, (10, (dialog_height - 32) // 2))
+                
+                # Ajusta o texto para começar após a imagem
+                text_x = 52
+                text_width = dialog_width - 62
+            else:
+                # Sem imagem, texto ocupa todo o espaço
+                text_x = 10
+                text_width = dialog_width - 20
+            
+            # Quebra o texto em linhas que caibam no balão
+            words = self.error_message.split(' ')
+            lines = []
+            current_line = []
+            
+            for word in words:
+                test_line = ' '.join(current_line + [word])
+                
+                # Mede a linha sem renderizá-la
+                if text_cache.size(test_line)[0] <= text_width:
+                    current_line.append(word)
+                else:
+                    lines.append(' '.join(current_line))
+                    current_line = [word]
+            
+            if current_line:
+                lines.append(' '.join(current_line))
+            
+            # Limita a 2 linhas
+            lines = lines[:2]
+            
+            # Desenha as linhas de texto
+            for i, line in enumerate(lines):
+                text = text_cache.render(line, (0, 0, 0))
+                surface.blit(text, (text_x, 15 + i * 25))
+        else:
+            # Mensagem de erro (estilo antigo): faixa vermelha semitransparente
+            self.error_position = (0, self.HEIGHT // 2 - 30)
+            surface = pygame.Surface((self.WIDTH, 60), pygame.SRCALPHA)
+            surface.fill((200, 0, 0, 200))
+            
+            # Desenha a mensagem de erro centralizada na faixa
+            error_text = text_cache.render(f"ERRO: {self.error_message}", (255, 255, 255))
+            error_rect = error_text.get_rect(center=(self.WIDTH // 2, 30))
+            surface.blit(error_text, error_rect)
+        
+        self.error_surface = surface
     
-    def render(self):
-        """Renderiza os objetos na tela"""
+    def mark_dirty(self, rect):
+        """Marca uma região da tela para ser redesenhada no próximo quadro"""
+        self.dirty_rects.append(pygame.Rect(rect))
+    
+    def collect_dirty_rects(self):
+        """Retorna as regiões da tela que mudaram desde o último quadro (None = tela inteira)"""
+        dirty = self.dirty_rects
+        self.dirty_rects = []
+        
+        # Mudanças de estado, mapa, câmera ou janela afetam a tela inteira
+        frame_key = (self.game_state.current_state, self.map, self.camera.offset, self.screen.get_size(),
+                     self.show_hitbox, self.show_profiler)
+        if frame_key != self.last_frame_key:
+            self.last_frame_key = frame_key
+            self.full_redraw = True
+        
+        # Regiões alteradas do próprio mapa (tiles modificados)
+        if self.map is not None:
+            for rect in self.map.pop_dirty_rects():
+                dirty.append(self.camera.apply(rect))
+        
+        # Elementos que se movem ou aparecem/desaparecem: sprites e mensagens
+        tracked = []
+        if self.game_state.is_playing() or self.game_state.is_paused():
+            for sprite in self.all_sprites:
+                rect = self.camera.apply(self.sprite_render_rect(sprite))
+                tracked.append((rect, sprite.image))
+            if self.error_message and self.error_surface:
+                tracked.append((self.error_surface.get_rect(topleft=self.error_position), self.error_surface))
+        
+        if tracked != self.last_tracked:
+            # Apaga as posições antigas e desenha as novas
+            dirty.extend(rect for rect, _ in self.last_tracked)
+            dirty.extend(rect for rect, _ in tracked)
+            self.last_tracked = tracked
+        
+        if self.full_redraw:
+            self.full_redraw = False
+            return None
+        
+        # Junta regiões sobrepostas (ex.: posição antiga e nova do jogador)
+        screen_rect = self.screen.get_rect()
+        merged = []
+        for rect in dirty:
+            rect = rect.clip(screen_rect)
+            if rect.width == 0 or rect.height == 0:
+                continue
+            for i, other in enumerate(merged):
+                if other.colliderect(rect):
+                    merged[i] = other.union(rect)
+                    break
+            else:
+                merged.append(rect)
+        return merged
+    
+    def sprite_render_rect(self, sprite):
+        """Retorna onde o sprite deve ser desenhado, interpolado entre o tick anterior e o atual"""
+        if hasattr(sprite, "interpolated_rect"):
+            return sprite.interpolated_rect(self.render_alpha)
+        return sprite.rect
+    
+    def profiler_overlay_position(self):
+        """Posição do painel de desempenho (canto superior direito)"""
+        return (self.WIDTH - self.profiler.OVERLAY_WIDTH - 10, 10)
+    
+    def render(self, alpha=1.0):
+        """Renderiza os objetos na tela
+        
+        alpha é a fração do próximo tick já decorrida (0 = posição do tick anterior, 1 = atual).
+        """
+        # Sem janela não há o que desenhar
+        if self.headless:
+            return
+        
+        self.render_alpha = alpha
+        
+        # A câmera acompanha a posição interpolada do jogador
+        if self.player and (self.game_state.is_playing() or self.game_state.is_paused()):
+            self.camera.follow(self.sprite_render_rect(self.player))
+        
+        # O painel de desempenho muda a cada quadro
+        if self.show_profiler and (self.game_state.is_playing() or self.game_state.is_paused()):
+            self.profiler_overlay = self.profiler.build_overlay()
+            self.mark_dirty(self.profiler_overlay.get_rect(topleft=self.profiler_overlay_position()))
+        
+        if not self.USE_DIRTY_RECTS:
+            self.draw_frame()
+            pygame.display.flip()
+            return
+        
+        dirty = self.collect_dirty_rects()
+        if dirty is None:
+            # Redesenha e apresenta a tela inteira
+            self.draw_frame()
+            pygame.display.flip()
+        elif dirty:
+            # Redesenha o quadro apenas dentro das regiões alteradas
+            for rect in dirty:
+                self.screen.set_clip(rect)
+                self.draw_frame()
+            self.screen.set_clip(None)
+            pygame.display.update(dirty)
+        # Sem mudanças, nada é desenhado nem enviado para a tela
+    
+    def draw_frame(self):
+        """Desenha o quadro atual na tela (sem apresentá-lo)"""
         # Renderiza com base no estado atual do jogo
         if self.game_state.is_title_screen():
             self.title_screen.draw(self.screen)
@@ -370,148 +686,181 @@ class Game:
             # Preenche o fundo com cor preta
             self.screen.fill((0, 0, 0))
             
-            # Desenha o mapa
-            self.map.draw(self.screen)
+            # Desenha apenas a parte do mapa visível pela câmera
+            with self.profiler.section("render.map"):
+                self.map.draw(self.screen, self.camera, self.render_alpha)
             
-            # Desenha todos os sprites
-            self.all_sprites.draw(self.screen)
-            
-            # Desenha a hitbox do jogador se a opção estiver ativada
-            if self.show_hitbox and self.player:
-                self.player.draw_hitbox(self.screen)
-            
-            # Desenha informações do mapa atual
-            font = pygame.font.SysFont(None, 24)
-            map_text = font.render(f"Mapa: {self.map.name}", True, (255, 255, 255))
-            self.screen.blit(map_text, (10, 10))
-            
-            # Desenha informações do personagem
-            if self.player:
-                player_text = font.render(f"Personagem: {self.player.name}", True, (255, 255, 255))
-                self.screen.blit(player_text, (10, 40))
-            
-            # Desenha instruções
-            instructions = font.render("Use WASD ou setas para mover, E para interagir com portas, ESC para pausar", True, (255, 255, 255))
-            self.screen.blit(instructions, (10, self.HEIGHT - 30))
-            
-            # Desenha mensagem de erro ou diálogo, se houver
-            if self.error_message:
-                if self.error_is_dialog:
-                    # Balão de diálogo na parte inferior direita
-                    dialog_width = min(400, self.WIDTH - 100)
-                    dialog_height = 80
-                    dialog_x = self.WIDTH - dialog_width - 20
-                    dialog_y = self.HEIGHT - dialog_height - 20
-                    
-                    # Cria um fundo para o balão de diálogo
-                    dialog_bg = pygame.Surface((dialog_width, dialog_height))
-                    dialog_bg.fill((240, 240, 255))
-                    dialog_bg.set_alpha(230)
-                    
-                    # Desenha a borda do balão
-                    pygame.draw.rect(self.screen, (100, 100, 200), 
-                                    (dialog_x, dialog_y, dialog_width, dialog_height), 0)
-                    pygame.draw.rect(self.screen, (50, 50, 150), 
-                                    (dialog_x, dialog_y, dialog_width, dialog_height), 2)
-                    
-                    # Desenha o conteúdo do balão
-                    self.screen.blit(dialog_bg, (dialog_x, dialog_y))
-                    
-                    # Desenha a imagem do item, se disponível
-                    if self.error_item_id and self.error_item_id in self.map.images:
-                        # Cria uma miniatura da imagem (32x32)
-                        item_image = self.map.images[self.error_item_id]
-                        item_rect = pygame.Rect(dialog_x + 10, dialog_y + (dialog_height - 32) // 2, 32, 32)
-                        self.screen.blit(item_image, item_rect)
-                        
-                        # Ajusta o texto para começar após a imagem
-                        text_x = dialog_x + 52
-                        text_width = dialog_width - 62
-                    else:
-                        # Sem imagem, texto ocupa todo o espaço
-                        text_x = dialog_x + 10
-                        text_width = dialog_width - 20
-                    
-                    # Renderiza o texto com quebra de linha
-                    words = self.error_message.split(' ')
-                    lines = []
-                    current_line = []
-                    
-                    for word in words:
-                        test_line = ' '.join(current_line + [word])
-                        test_text = font.render(test_line, True, (0, 0, 0))
-                        
-                        if test_text.get_width() <= text_width:
-                            current_line.append(word)
-                        else:
-                            lines.append(' '.join(current_line))
-                            current_line = [word]
-                    
-                    if current_line:
-                        lines.append(' '.join(current_line))
-                    
-                    # Limita a 2 linhas
-                    lines = lines[:2]
-                    
-                    # Desenha as linhas de texto
-                    for i, line in enumerate(lines):
-                        text = font.render(line, True, (0, 0, 0))
-                        self.screen.blit(text, (text_x, dialog_y + 15 + i * 25))
-                else:
-                    # Mensagem de erro (estilo antigo)
-                    error_bg = pygame.Surface((self.WIDTH, 60))
-                    error_bg.fill((200, 0, 0))
-                    error_bg.set_alpha(200)
-                    self.screen.blit(error_bg, (0, self.HEIGHT // 2 - 30))
-                    
-                    # Desenha a mensagem de erro
-                    error_text = font.render(f"ERRO: {self.error_message}", True, (255, 255, 255))
-                    error_rect = error_text.get_rect(center=(self.WIDTH // 2, self.HEIGHT // 2))
-                    self.screen.blit(error_text, error_rect)
+            with self.profiler.section("render.sprites"):
+                # Desenha todos os sprites na posição relativa à câmera
+                for sprite in self.all_sprites:
+                    self.screen.blit(sprite.image, self.camera.apply(self.sprite_render_rect(sprite)))
+                
+                # Desenha a hitbox do jogador se a opção estiver ativada
+                if self.show_hitbox and self.player:
+                    self.player.draw_hitbox(self.screen, self.camera, self.render_alpha)
+            
+            with self.profiler.section("render.hud"):
+                # Desenha informações do mapa atual (textos renderizados ficam em cache)
+                map_text = text_cache.render(f"Mapa: {self.map.name}", (255, 255, 255))
+                self.screen.blit(map_text, (10, 10))
+                
+                # Desenha informações do personagem
+                if self.player:
+                    player_text = text_cache.render(f"Personagem: {self.player.name}", (255, 255, 255))
+                    self.screen.blit(player_text, (10, 40))
+                
+                # Desenha instruções
+                instructions = text_cache.render("Use WASD ou setas para mover, E para interagir com portas, ESC para pausar", (255, 255, 255))
+                self.screen.blit(instructions, (10, self.HEIGHT - 30))
+                
+                # Desenha mensagem de erro ou diálogo, se houver (já montada em show_error)
+                if self.error_message and self.error_surface:
+                    self.screen.blit(self.error_surface, self.error_position)
             
             # Se estiver pausado, desenha a tela de pausa por cima
             if self.game_state.is_paused():
                 self.pause_screen.draw(self.screen)
+            
+            # Painel de desempenho por cima de tudo
+            if self.show_profiler and self.profiler_overlay:
+                self.screen.blit(self.profiler_overlay, self.profiler_overlay_position())
+    
+    def run(self, max_ticks=None):
+        """Loop principal do jogo (max_ticks limita a duração da simulação sem janela)"""
+        if self.headless:
+            self.run_headless(max_ticks)
+        else:
+            self.run_realtime()
+        
+        # Grava os tempos da sessão, se solicitado
+        if self.profile_path:
+            self.profiler.dump(self.profile_path)
         
-        # Atualiza a tela
-        pygame.display.flip()
+        self.map_prefetcher.shutdown()
+        pygame.quit()
+        sys.exit()
     
-    def run(self):
-        """Loop principal do jogo"""
+    def run_realtime(self):
+        """Loop do jogo com janela
+        
+        A simulação avança em ticks de duração fixa (TICK_RATE por segundo), independentemente
+        da taxa de quadros; a renderização interpola as posições entre os dois últimos ticks.
+        """
+        tick_duration = 1.0 / self.TICK_RATE
+        accumulator = 0.0
+        previous_time = time.perf_counter()
+        first_frame = True
+        
         while self.running:
-            self.process_events()
-            self.update()
-            self.render()
+            now = time.perf_counter()
+            
+            # Limita o tempo acumulado para não entrar em uma espiral de atraso
+            accumulator += min(now - previous_time, self.MAX_TICKS_PER_FRAME * tick_duration)
+            previous_time = now
+            
+            self.profiler.begin_frame()
+            
+            # Eventos são processados uma vez por quadro
+            with self.profiler.section("events"):
+                self.process_events()
+            
+            ticks = 0
+            with self.profiler.section("update"):
+                while accumulator >= tick_duration and ticks < self.MAX_TICKS_PER_FRAME and self.running:
+                    self.update()
+                    accumulator -= tick_duration
+                    ticks += 1
+            
+            # Se não foi possível recuperar o atraso, descarta o restante (o jogo fica mais lento)
+            if ticks == self.MAX_TICKS_PER_FRAME:
+                accumulator = min(accumulator, tick_duration)
+            
+            with self.profiler.section("render"):
+                self.render(accumulator / tick_duration)
+            
+            # Acompanha o carregamento do mapa inicial enquanto os menus são mostrados
+            if self.map is None:
+                if first_frame:
+                    startup_timer.mark("primeiro quadro")
+                    first_frame = False
+                self.poll_startup()
+            
+            # A espera do limite de FPS não entra no tempo do quadro
+            self.profiler.end_frame()
             self.clock.tick(self.FPS)
+    
+    def run_headless(self, max_ticks=None):
+        """Executa a simulação o mais rápido possível, sem renderizar nem esperar
         
-        pygame.quit()
-        sys.exit()
-
+        Termina após max_ticks ticks, quando a entrada programática acaba ou ao receber QUIT.
+        Retorna um dicionário com estatísticas da execução.
+        """
+        # Sem tela de título: começa direto com o personagem padrão
+        if self.player is None:
+            self.start_game()
+        
+        ticks = 0
+        map_changes = 0
+        visited_maps = {self.map.id}
+        start_time = time.perf_counter()
+        
+        while self.running and (max_ticks is None or ticks < max_ticks):
+            self.profiler.begin_frame()
+            with self.profiler.section("events"):
+                self.process_events()
+            
+            previous_map = self.map
+            with self.profiler.section("update"):
+                self.update()
+            self.profiler.end_frame()
+            ticks += 1
+            
+            if self.map is not previous_map:
+                map_changes += 1
+                visited_maps.add(self.map.id)
+            
+            if getattr(self.input_source, "finished", False):
+                break
+        
+        elapsed = time.perf_counter() - start_time
+        stats = {
+            "ticks": ticks,
+            "seconds": elapsed,
+            "ticks_per_second": ticks / elapsed if elapsed > 0 else 0.0,
+            "simulated_hours": ticks / self.TICK_RATE / 3600,
+            "map_changes": map_changes,
+            "visited_maps": sorted(visited_maps)
+        }
+        print(f"Simulação: {ticks} ticks em {elapsed:.2f}s ({stats['ticks_per_second']:.0f} ticks/s, "
+              f"{stats['simulated_hours']:.2f} horas de jogo), {map_changes} trocas de mapa, "
+              f"{len(visited_maps)} mapas visitados")
+        return stats
+    
     def process_object_interaction(self, obj):
         """Processa a interação com um objeto"""
-        obj_id = str(obj.get("id", 0))
-        details = obj.get("details", {})
+        obj_id = obj.key
+        details = obj.details
         
         print(f"Processando interação com objeto ID {obj_id}")
         
         # Verifica o tipo de objeto e processa de acordo
-        if obj_id in self.map.item_config.get("tile_types", {}):
-            item_config = self.map.item_config["tile_types"][obj_id]
-            item_type = item_config.get("type", "")
-            item_name = item_config.get("name", "Objeto desconhecido")
+        if obj.tile_type:
+            item_config = obj.tile_type
+            item_type = obj.kind
+            item_name = obj.name or "Objeto desconhecido"
             
             print(f"Tipo de objeto: {item_type}, Nome: {item_name}")
             
             # Processa baús
-            if item_type == "objeto" and "chest" in item_config.get("name", "").lower():
+            if item_type == "objeto" and "chest" in obj.name.lower():
                 # Mostra mensagem sobre os itens encontrados
                 drops = details.get("drops", [])
                 if drops:
                     drop_names = []
                     for drop in drops:
                         drop_id = drop.replace("item_", "")
-                        if drop_id in self.map.item_config.get("tile_types", {}):
-                            drop_names.append(self.map.item_config["tile_types"][drop_id].get("name", "Item desconhecido"))
+                        if drop_id.isdigit() and int(drop_id) in self.map.tile_types:
+                            drop_names.append(self.map.tile_types.name(int(drop_id), "Item desconhecido"))
                     
                     if drop_names:
                         self.show_error(f"Você encontrou: {', '.join(drop_names)}", obj_id, True)
@@ -535,7 +884,7 @@ class Game:
                     self.show_error(f"{item_name} não tem nada a dizer.", obj_id, True)
             
             # Processa placas
-            elif "sign" in item_config.get("name", "").lower():
+            elif "sign" in obj.name.lower():
                 # Mostra mensagem da placa
                 message = details.get("message", "")
                 if message:
@@ -6,6 +6,7 @@ import os
 import json
 import random
 import math
+from texture_atlas import build_atlas
 
 # Inicializa o pygame
 pygame.init()
@@ -255,6 +256,9 @@ def generate_all_images():
     generate_enemies()
     generate_npcs()
     print("Todas as imagens foram geradas com sucesso!")
+    
+    # Reempacota o atlas de texturas com as novas imagens
+    build_atlas(BASE_DIR)
 
 if __name__ == "__main__":
     generate_all_images() 
\ No newline at end of file
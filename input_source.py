@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Fontes de entrada do jogo. O Game lê eventos e o Player lê as teclas
+# pressionadas sempre através de uma fonte de entrada, o que permite trocar
+# o teclado por entradas programáticas (testes e simulações sem janela).
+
+import random
+from collections import deque
+
+import pygame
+
+class KeyState:
+    """Estado das teclas no mesmo formato de pygame.key.get_pressed()"""
+    def __init__(self, pressed):
+        self.pressed = pressed
+    
+    def __getitem__(self, key):
+        return key in self.pressed
+
+class KeyboardInput:
+    """Entrada do teclado e da janela (padrão)"""
+    def get_events(self):
+        """Retorna os eventos pendentes da janela"""
+        return pygame.event.get()
+    
+    def get_pressed(self):
+        """Retorna o estado atual das teclas"""
+        return pygame.key.get_pressed()
+
+class ScriptedInput:
+    """Entrada roteirizada: teclas mantidas por um número de quadros, sem janela nem teclado"""
+    def __init__(self, steps=None):
+        # Roteiro opcional: lista de (quadros, teclas mantidas pressionadas)
+        self.steps = deque(steps or [])
+        self.frames_left = 0
+        
+        # Teclas mantidas pressionadas no momento
+        self.pressed = set()
+        
+        # Eventos agendados, uma lista por quadro a partir do próximo
+        self.queued = deque()
+        
+        # Número de quadros já lidos
+        self.frame = 0
+    
+    def press(self, key):
+        """Mantém uma tecla pressionada"""
+        self.pressed.add(key)
+    
+    def release(self, key):
+        """Solta uma tecla"""
+        self.pressed.discard(key)
+    
+    def hold(self, keys):
+        """Mantém pressionadas exatamente as teclas informadas"""
+        self.pressed = set(keys)
+    
+    def _queue(self, frame_offset, event):
+        """Agenda um evento para daqui a frame_offset quadros"""
+        while len(self.queued) <= frame_offset:
+            self.queued.append([])
+        self.queued[frame_offset].append(event)
+    
+    def tap(self, key):
+        """Pressiona uma tecla no próximo quadro e a solta no quadro seguinte"""
+        self._queue(0, pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+        self._queue(1, pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode="", scancode=0))
+    
+    def quit(self):
+        """Encerra o jogo no próximo quadro"""
+        self._queue(0, pygame.event.Event(pygame.QUIT))
+    
+    @property
+    def finished(self):
+        """Indica se o roteiro terminou"""
+        return not self.steps and self.frames_left <= 0
+    
+    def advance(self):
+        """Avança um quadro do roteiro"""
+        if self.frames_left <= 0 and self.steps:
+            self.frames_left, keys = self.steps.popleft()
+            self.hold(keys)
+        self.frames_left -= 1
+    
+    def get_events(self):
+        """Retorna os eventos do quadro (os eventos da janela, como fechar, também são lidos)"""
+        self.frame += 1
+        self.advance()
+        events = pygame.event.get()
+        if self.queued:
+            events.extend(self.queued.popleft())
+        return events
+    
+    def get_pressed(self):
+        """Retorna o estado atual das teclas"""
+        return KeyState(self.pressed)
+
+class RandomWalkInput(ScriptedInput):
+    # Direções possíveis (nenhuma tecla = parado)
+    DIRECTIONS = [
+        (), (pygame.K_LEFT,), (pygame.K_RIGHT,), (pygame.K_UP,), (pygame.K_DOWN,),
+        (pygame.K_LEFT, pygame.K_UP), (pygame.K_LEFT, pygame.K_DOWN),
+        (pygame.K_RIGHT, pygame.K_UP), (pygame.K_RIGHT, pygame.K_DOWN)
+    ]
+    
+    def __init__(self, seed=None, min_frames=10, max_frames=120, interact_chance=0.2):
+        super().__init__()
+        
+        # Gerador próprio para que a caminhada seja reproduzível pela semente
+        self.random = random.Random(seed)
+        self.min_frames = min_frames
+        self.max_frames = max_frames
+        
+        # Chance de tentar interagir (tecla E) a cada troca de direção
+        self.interact_chance = interact_chance
+    
+    @property
+    def finished(self):
+        """A caminhada aleatória não termina"""
+        return False
+    
+    def advance(self):
+        """Escolhe uma nova direção quando a anterior termina"""
+        if self.frames_left <= 0:
+            self.frames_left = self.random.randint(self.min_frames, self.max_frames)
+            self.hold(self.random.choice(self.DIRECTIONS))
+            if self.random.random() < self.interact_chance:
+                self.tap(pygame.K_e)
+        self.frames_left -= 1
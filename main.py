@@ -1,13 +1,38 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from game import Game
-from check_game_files import check_game_files
+import argparse
+
+# Relógio da inicialização (importado antes dos módulos do jogo para medir também as importações)
+from profiler import startup_timer
+
+with startup_timer.stage("imports"):
+    from game import Game
+    from check_game_files import check_game_files
+    from input_source import RandomWalkInput
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jogo Top-Down")
+    parser.add_argument("--headless", action="store_true",
+                        help="simula sem janela, o mais rápido possível, com um jogador andando aleatoriamente")
+    parser.add_argument("--ticks", type=int, default=None,
+                        help="número de ticks a simular no modo --headless (padrão: até ser interrompido)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="semente da caminhada aleatória e do movimento dos inimigos no modo --headless")
+    parser.add_argument("--profile", metavar="ARQUIVO",
+                        help="grava os tempos de cada fase dos quadros neste arquivo JSON ao sair")
+    parser.add_argument("--full", action="store_true",
+                        help="verifica todos os arquivos do jogo, ignorando o manifesto da última verificação (reparo)")
+    args = parser.parse_args()
+    
     # Verifica e corrige os arquivos do jogo antes de iniciar
-    check_game_files()
+    with startup_timer.stage("check_game_files"):
+        check_game_files(full=args.full)
     
     # Inicia o jogo
-    game = Game()
-    game.run() 
\ No newline at end of file
+    if args.headless:
+        game = Game(headless=True, input_source=RandomWalkInput(args.seed), seed=args.seed)
+    else:
+        game = Game()
+    game.profile_path = args.profile
+    game.run(args.ticks)
\ No newline at end of file
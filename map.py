@@ -2,106 +2,175 @@
 # -*- coding: utf-8 -*-
 
 import pygame
+import numpy as np
 import json
 import os
+import zlib
+from array import array
+from collections import OrderedDict
+from spatial_grid import SpatialGrid
+import map_compiler
+from asset_cache import LazyAssets, asset_cache
+from text_cache import text_cache
+from entities import Door, build_doors, build_entities, build_portals
+from enemy_simulation import EnemySimulation
+from pathfinding import Pathfinder
+from visibility import Visibility
+from animation import LOOPING_TYPES, ONE_SHOT_TYPES, ON_WALK, MOVEMENT, animation_clock, load_animations
+from world_index import get_world_index
+from tile_types import get_tile_types
 
 class Map:
-    def __init__(self, map_id="map1"):
+    # Tamanho (em tiles) de cada bloco pré-renderizado do mapa
+    CHUNK_TILES = 16
+    
+    # Número máximo de blocos mantidos em memória ao mesmo tempo
+    MAX_CACHED_CHUNKS = 64
+    
+    # Acima deste número de regiões alteradas, o mapa inteiro é marcado de uma vez
+    MAX_DIRTY_RECTS = 256
+    
+    def __init__(self, map_id="map1", maps_dir="maps", seed=None):
+        # Diretório dos arquivos de mapa
+        self.maps_dir = maps_dir
+        
+        # Semente do movimento aleatório dos inimigos (None = não reproduzível)
+        self.seed = seed
+        
         # Tipos de tiles
         self.EMPTY = 0
         self.WALL = 1
         self.DOOR = 2
         
-        # Dicionário para armazenar as imagens carregadas
-        self.images = {}
+        # Valor usado na grade para tiles inválidos (desenhados em roxo)
+        self.INVALID_TILE = map_compiler.INVALID_TILE
+        
+        # Imagens dos tiles (ID como texto -> imagem), carregadas no primeiro uso
+        self.images = LazyAssets(self._load_image)
         
-        # Dicionário para armazenar os sons de interação
-        self.interaction_sounds = {}
+        # Sons de interação (ID como texto -> som), carregados no primeiro uso
+        self.interaction_sounds = LazyAssets(self._load_sound)
         
         # Trilha sonora do mapa
         self.soundtrack = None
         self.soundtrack_path = None
         
-        # Inicializa a configuração de itens (deve ser feito antes de carregar o mapa)
-        self.item_config = {"tile_types": {}}
+        # Tabela de tipos de tile (deve ser obtida antes de carregar o mapa)
         self.load_item_config()
         
         # Carrega o mapa a partir do arquivo JSON
         self.load_map(map_id)
         
-        # Carrega as imagens dos tiles
-        self.load_images()
+        # Os inimigos passam a ser desenhados e movidos pela simulação, não pela grade de tiles
+        self._detach_enemy_tiles()
+        
+        # Índice da célula -> tile original, para as células alteradas por set_tile (ver reset)
+        self.tile_edits = {}
+        
+        # Caminhos sobre a grade de tiles (campo de fluxo dos inimigos e A* dos NPCs)
+        self.pathfinder = Pathfinder(self)
+        
+        # Linha de visão entre tiles (detecção do jogador pelos inimigos)
+        self.visibility = Visibility(self)
+        
+        # Estado dos inimigos em arrays, atualizado a cada tick
+        self.enemy_simulation = EnemySimulation(self, self.enemy_seed())
+        
+        # Regiões do mapa alteradas desde o último quadro (para a renderização por regiões)
+        self.dirty_rects = []
         
-        # Carrega os sons de interação
-        self.load_sounds()
+        # Regiões percorridas pelos inimigos no último tick; como eles são desenhados em
+        # posições interpoladas, mudam a cada quadro até o próximo tick
+        self.enemy_motion_rects = []
+        
+        # Carrega as animações (antes da camada estática, que não inclui os objetos animados)
+        self.load_animations()
+        
+        # Pré-renderiza o terreno e os objetos estáticos em blocos (chunks)
+        self.chunks = OrderedDict()
+        self.build_static_layer()
+    
+    def enemy_seed(self):
+        """Semente da simulação dos inimigos: a do jogo combinada com o ID do mapa"""
+        if self.seed is None:
+            return None
+        return [self.seed, zlib.crc32(self.id.encode("utf-8"))]
     
     def load_item_config(self):
-        """Carrega a configuração de itens do arquivo JSON"""
-        try:
-            config_path = os.path.join("config", "items.json")
-            if not os.path.exists(config_path):
-                print(f"Aviso: Arquivo de configuração de itens não encontrado: {config_path}")
-                self.item_config = {"tile_types": {}}
-                return
-                
-            with open(config_path, "r") as f:
-                self.item_config = json.load(f)
-        except Exception as e:
-            print(f"Erro ao carregar configuração de itens: {e}")
-            self.item_config = {"tile_types": {}}
-    
-    def load_images(self):
-        """Carrega as imagens para os tiles com base na configuração"""
-        base_dir = "assets/images"
-        
-        # Cria os diretórios necessários se não existirem
-        os.makedirs(os.path.join(base_dir, "tiles"), exist_ok=True)
-        os.makedirs(os.path.join(base_dir, "objects"), exist_ok=True)
-        os.makedirs(os.path.join(base_dir, "items"), exist_ok=True)
-        os.makedirs(os.path.join(base_dir, "enemies"), exist_ok=True)
-        os.makedirs(os.path.join(base_dir, "npcs"), exist_ok=True)
-        
-        # Carrega imagens para cada tipo de tile na configuração
-        for tile_id, tile_info in self.item_config.get("tile_types", {}).items():
-            image_path = tile_info.get("image", "")
-            if image_path:
-                full_path = os.path.join(base_dir, image_path)
-                try:
-                    if os.path.exists(full_path):
-                        # Carrega a imagem e redimensiona para o tamanho do tile
-                        image = pygame.image.load(full_path).convert_alpha()
-                        image = pygame.transform.scale(image, (self.tile_size, self.tile_size))
-                        self.images[tile_id] = image
-                    else:
-                        # Cria uma imagem colorida para substituir a ausente
-                        self._create_colored_image(tile_id, tile_info)
-                except Exception as e:
-                    print(f"Erro ao carregar imagem {full_path}: {e}")
-                    # Cria uma imagem colorida para substituir a ausente
-                    self._create_colored_image(tile_id, tile_info)
+        """Obtém a tabela de tipos de tile (items.json é lido uma única vez por processo)"""
+        self.tile_types = get_tile_types()
         
-        # Cria imagens padrão para tiles sem imagem
-        if "0" not in self.images:  # Tile vazio
-            img = pygame.Surface((self.tile_size, self.tile_size))
-            img.fill(self.colors.get(self.EMPTY, (50, 150, 50)))
-            self.images["0"] = img
-            
-        if "1" not in self.images:  # Parede
-            img = pygame.Surface((self.tile_size, self.tile_size))
-            img.fill(self.colors.get(self.WALL, (100, 100, 100)))
-            self.images["1"] = img
+        # Configuração original, para os campos que a tabela não compila
+        self.item_config = self.tile_types.config
+    
+    def _load_image(self, key):
+        """Carrega a imagem de um tipo de tile (chamado no primeiro uso da chave)"""
+        if not isinstance(key, str) or not key.isdigit():
+            return None
+        tile_id = int(key)
+        
+        full_path = self.tile_types.image_paths[tile_id] if tile_id in self.tile_types else None
+        if full_path:
+            # Carrega a imagem já redimensionada para o tamanho do tile (compartilhada via cache)
+            image = asset_cache.get_image(full_path, (self.tile_size, self.tile_size))
+            if image is not None:
+                return image
             
-        if "2" not in self.images:  # Porta
+            # Cria uma imagem colorida para substituir a ausente
+            return self._create_colored_image(tile_id)
+        
+        # Cria imagens padrão para os tiles básicos sem imagem (vazio, parede e porta)
+        defaults = {self.EMPTY: (50, 150, 50), self.WALL: (100, 100, 100), self.DOOR: (150, 75, 0)}
+        if tile_id in defaults:
             img = pygame.Surface((self.tile_size, self.tile_size))
-            img.fill(self.colors.get(self.DOOR, (150, 75, 0)))
-            self.images["2"] = img
+            img.fill(self.colors.get(tile_id, defaults[tile_id]))
+            return img
+        return None
+    
+    def _load_sound(self, key):
+        """Carrega o som de interação de um tipo de tile (chamado no primeiro uso da chave)"""
+        if not isinstance(key, str) or not key.isdigit() or int(key) not in self.tile_types:
+            return None
+        
+        # Sons compartilhados via cache; os avisos de arquivos ausentes ou inválidos
+        # são mostrados uma única vez
+        full_path = self.tile_types.sound_paths[int(key)]
+        return asset_cache.get_sound(full_path) if full_path else None
     
-    def _create_colored_image(self, tile_id, tile_info):
-        """Cria uma imagem colorida para substituir uma imagem ausente"""
+    def used_tile_ids(self):
+        """IDs dos tipos usados neste mapa (tiles, objetos e inimigos)"""
+        ids = set(np.unique(np.frombuffer(self.tiles, dtype=np.uint16)).tolist())
+        ids.update(entity.id for entity in self.objects)
+        ids.update(entity.id for entity in self.enemies)
+        return sorted(ids)
+    
+    def preload_assets(self, progress=None):
+        """Carrega as imagens e os sons dos tipos usados neste mapa antes do primeiro uso
+        
+        Chamado em segundo plano; progress(carregados, total), se informado, é chamado
+        após cada tipo.
+        """
+        tile_ids = self.used_tile_ids()
+        for index, tile_id in enumerate(tile_ids):
+            # A consulta carrega o asset, se ainda não estiver carregado
+            self.images.get(str(tile_id))
+            self.interaction_sounds.get(str(tile_id))
+            if progress is not None:
+                progress(index + 1, len(tile_ids))
+    
+    def _create_colored_image(self, tile_id):
+        """Cria (ou obtém do cache) uma imagem colorida para substituir uma imagem ausente"""
+        return asset_cache.get_or_load(
+            ("colored", str(tile_id), self.tile_size),
+            lambda: self._make_colored_image(tile_id)
+        )
+    
+    def _make_colored_image(self, tile_id):
+        """Desenha a imagem colorida que substitui uma imagem ausente"""
         img = pygame.Surface((self.tile_size, self.tile_size))
         
         # Define a cor com base no tipo de item
-        item_type = tile_info.get("type", "")
+        item_type = self.tile_types.category(tile_id)
         if item_type == "terreno":
             color = (50, 150, 50)  # Verde para terreno
         elif item_type == "objeto":
@@ -121,7 +190,7 @@ class Map:
         
         # Adiciona um texto com o ID para identificação
         try:
-            font = pygame.font.SysFont("Arial", 12)
+            font = text_cache.get_font("Arial", 12)
             text = font.render(str(tile_id), True, (0, 0, 0))
             text_rect = text.get_rect(center=(self.tile_size//2, self.tile_size//2))
             img.blit(text, text_rect)
@@ -129,70 +198,57 @@ class Map:
             # Se não conseguir renderizar texto, desenha um padrão
             pygame.draw.rect(img, (0, 0, 0), (4, 4, self.tile_size-8, self.tile_size-8), 2)
         
-        self.images[tile_id] = img
-        print(f"Substituída imagem ausente do item {tile_id} ({tile_info.get('name', '')}) por cor {color}")
+        print(f"Substituída imagem ausente do item {tile_id} ({self.tile_types.name(tile_id)}) por cor {color}")
+        return img
     
-    def load_sounds(self):
-        """Carrega os sons de interação para os objetos"""
-        base_dir = "assets/sounds"
+    def load_animations(self):
+        """Carrega as animações dos tipos de tile (os quadros são compartilhados entre os mapas)"""
+        self.animations = load_animations(self.tile_types, self.tile_size)
         
-        # Cria o diretório de sons se não existir
-        os.makedirs(os.path.join(base_dir, "effects"), exist_ok=True)
+        # Tipos de tile do terreno com animação em laço (água, portais...)
+        self.looping_tiles = {
+            int(tile_id): animation for tile_id, animation in self.animations.items()
+            if animation.kind in LOOPING_TYPES and tile_id.isdigit()
+        }
         
-        # Lista para controlar quais avisos já foram exibidos
-        sound_warnings_shown = []
+        # Tipos de tile animados quando o jogador caminha sobre eles (grama alta)
+        self.walk_tiles = {
+            int(tile_id) for tile_id, animation in self.animations.items()
+            if animation.kind == ON_WALK and tile_id.isdigit()
+        }
         
-        # Carrega sons para cada tipo de tile na configuração
-        for tile_id, tile_info in self.item_config.get("tile_types", {}).items():
-            details = tile_info.get("details", {})
-            
-            # Verifica se o item tem som de interação
-            if "interaction_sound" in details:
-                sound_path = details["interaction_sound"]
-                full_path = os.path.join(base_dir, sound_path)
-                
-                try:
-                    if os.path.exists(full_path):
-                        try:
-                            sound = pygame.mixer.Sound(full_path)
-                            self.interaction_sounds[tile_id] = sound
-                        except Exception as e:
-                            # Evita mostrar o mesmo aviso várias vezes
-                            if full_path not in sound_warnings_shown:
-                                print(f"Aviso: Não foi possível carregar o som {full_path}: {e}")
-                                sound_warnings_shown.append(full_path)
-                            # Não armazena o som para este item
-                    else:
-                        # Evita mostrar o mesmo aviso várias vezes
-                        if full_path not in sound_warnings_shown:
-                            print(f"Aviso: Arquivo de som não encontrado: {full_path}")
-                            sound_warnings_shown.append(full_path)
-                        # Não tenta criar o arquivo nem armazenar o som
-                except Exception as e:
-                    # Evita mostrar o mesmo aviso várias vezes
-                    if full_path not in sound_warnings_shown:
-                        print(f"Aviso: Erro ao processar som {full_path}: {e}")
-                        sound_warnings_shown.append(full_path)
-                    # Ignora o erro e continua a execução
+        # Animações tocadas uma única vez (portas, baús, grama alta): (x, y) -> (id do tile, tick inicial)
+        self.active_animations = {}
+        
+        # Último quadro de cada animação em laço, para saber quando a tela muda
+        self.loop_frames = {}
     
     def load_map(self, map_id):
-        """Carrega um mapa a partir de um arquivo JSON"""
+        """Carrega um mapa a partir do arquivo compilado (.tdm) ou, se não houver, do JSON"""
         try:
-            # Verifica se o arquivo existe
-            map_path = os.path.join("maps", f"{map_id}.json")
-            if not os.path.exists(map_path):
-                print(f"Erro: Arquivo de mapa não encontrado: {map_path}")
-                self._create_error_map()
-                return
+            # Usa o mapa compilado (carregado via mmap) quando disponível e atualizado
+            compiled = map_compiler.load_compiled_map(map_id, self.maps_dir)
+            if compiled is not None:
+                map_data, tiles, self._tiles_mmap = compiled
+            else:
+                tiles = None
+                self._tiles_mmap = None
                 
-            with open(map_path, "r") as f:
-                try:
-                    map_data = json.load(f)
-                except json.JSONDecodeError as e:
-                    print(f"Erro: Arquivo de mapa inválido: {map_path} - {e}")
+                # Verifica se o arquivo existe
+                map_path = map_compiler.json_path_for(map_id, self.maps_dir)
+                if not os.path.exists(map_path):
+                    print(f"Erro: Arquivo de mapa não encontrado: {map_path}")
                     self._create_error_map()
                     return
                 
+                with open(map_path, "r") as f:
+                    try:
+                        map_data = json.load(f)
+                    except json.JSONDecodeError as e:
+                        print(f"Erro: Arquivo de mapa inválido: {map_path} - {e}")
+                        self._create_error_map()
+                        return
+            
             # Informações básicas do mapa
             self.id = map_id
             self.name = map_data.get("name", "Mapa Sem Nome")
@@ -210,41 +266,20 @@ class Map:
                 self.DOOR: (150, 75, 0)  # Marrom para portas
             }
             
-            # Dados do mapa
-            self.data = map_data.get("data", [])
-            
-            # Verifica se os dados do mapa têm as dimensões corretas
-            if len(self.data) != self.height:
-                print(f"Aviso: Altura do mapa {map_id} incorreta. Esperado {self.height}, encontrado {len(self.data)}")
-                
-                # Ajusta a altura para corresponder aos dados
-                if len(self.data) < self.height:
-                    # Adiciona linhas vazias se necessário
-                    empty_row = [self.WALL if x == 0 or x == self.width - 1 else self.EMPTY for x in range(self.width)]
-                    while len(self.data) < self.height:
-                        self.data.append(empty_row.copy())
-                else:
-                    # Corta linhas extras
-                    self.data = self.data[:self.height]
-            
-            # Verifica se todas as linhas têm a largura correta
-            for y, row in enumerate(self.data):
-                if len(row) != self.width:
-                    print(f"Aviso: Largura da linha {y} do mapa {map_id} incorreta. Esperado {self.width}, encontrado {len(row)}")
-                    # Ajusta a linha para ter a largura correta
-                    if len(row) < self.width:
-                        self.data[y] = row + [self.EMPTY] * (self.width - len(row))
-                    else:
-                        self.data[y] = row[:self.width]
+            # Dados do mapa (grade compacta de uint16)
+            if tiles is not None:
+                # O arquivo compilado já traz a grade validada e a lista de portas
+                self.tiles = tiles
+                self.door_cells = [tuple(cell) for cell in map_data.get("doors", [])]
+            else:
+                self.load_tiles(map_data.get("data", []))
             
             # Portais
-            self.portals = map_data.get("portals", [])
+            self.portals = build_portals(map_data.get("portals", []))
             
-            # Objetos
-            self.objects = map_data.get("objects", [])
-            
-            # Inimigos
-            self.enemies = map_data.get("enemies", [])
+            # Objetos e inimigos (registros com o tipo já resolvido)
+            self.objects = build_entities(map_data.get("objects", []), self.tile_types, self.tile_size)
+            self.enemies = build_entities(map_data.get("enemies", []), self.tile_types, self.tile_size)
             
             # Transições de borda
             self.edge_transitions = map_data.get("edge_transitions", {
@@ -259,81 +294,116 @@ class Map:
                 if direction not in self.edge_transitions:
                     self.edge_transitions[direction] = None
             
-            # Retângulos de colisão para as paredes e objetos
-            self.wall_rects = []
-            self.door_rects = []
-            self.collision_rects = []  # Nova lista para todos os objetos com colisão
-            
-            # Adiciona colisões para tiles no mapa
-            for y in range(self.height):
-                for x in range(self.width):
-                    try:
-                        tile_type = self.data[y][x]
-                        tile_str = str(tile_type)
-                        
-                        # Cria o retângulo para o tile
-                        rect = pygame.Rect(
-                            x * self.tile_size, 
-                            y * self.tile_size, 
-                            self.tile_size, 
-                            self.tile_size
-                        )
-                        
-                        # Verifica se é uma parede
-                        if tile_type == self.WALL:
-                            self.wall_rects.append(rect)
-                            self.collision_rects.append(rect)
-                        
-                        # Verifica se é uma porta
-                        elif tile_type == self.DOOR:
-                            self.door_rects.append({
-                                "rect": rect,
-                                "x": x,
-                                "y": y
-                            })
-                        
-                        # Verifica se o tile tem colisão baseado na configuração
-                        elif tile_str in self.item_config.get("tile_types", {}):
-                            item_config = self.item_config["tile_types"][tile_str]
-                            if item_config.get("collision", False):
-                                self.collision_rects.append(rect)
-                    except IndexError:
-                        print(f"Erro: Índice inválido no mapa {map_id}: ({x}, {y})")
-            
-            # Adiciona colisões para objetos específicos
-            for obj in self.objects:
-                obj_id = str(obj.get("id", 0))
-                if obj_id in self.item_config.get("tile_types", {}):
-                    item_config = self.item_config["tile_types"][obj_id]
-                    if item_config.get("collision", False):
-                        x, y = obj.get("x", 0), obj.get("y", 0)
-                        rect = pygame.Rect(
-                            x * self.tile_size, 
-                            y * self.tile_size, 
-                            self.tile_size, 
-                            self.tile_size
-                        )
-                        self.collision_rects.append(rect)
-            
-            # Adiciona colisões para inimigos
-            for enemy in self.enemies:
-                enemy_id = str(enemy.get("id", 0))
-                if enemy_id in self.item_config.get("tile_types", {}):
-                    item_config = self.item_config["tile_types"][enemy_id]
-                    if item_config.get("collision", False):
-                        x, y = enemy.get("x", 0), enemy.get("y", 0)
-                        rect = pygame.Rect(
-                            x * self.tile_size, 
-                            y * self.tile_size, 
-                            self.tile_size, 
-                            self.tile_size
-                        )
-                        self.collision_rects.append(rect)
-                
+            # Dados de colisão para as paredes e objetos
+            self.build_collision_data()
+        
         except Exception as e:
             print(f"Erro ao carregar o mapa {map_id}: {e}")
             self._create_error_map()
     
+    def load_tiles(self, rows):
+        """Converte a matriz de tiles do JSON para a grade compacta self.tiles"""
+        # Grade em ordem de linhas: o tile (x, y) fica em self.tiles[y * self.width + x]
+        self.tiles = map_compiler.build_tile_grid(rows, self.width, self.height, self.id)
+        self.door_cells = map_compiler.find_door_cells(self.tiles, self.width)
+    
+    def _detach_enemy_tiles(self):
+        """Remove da grade os tiles que repetem o próprio inimigo na sua posição inicial
+        
+        Alguns mapas também marcam o inimigo na matriz de tiles; sem isso ele ficaria
+        desenhado na camada estática e bloquearia a célula depois de se mover.
+        """
+        for enemy in self.enemies:
+            if self.get_tile(enemy.x, enemy.y) == enemy.id:
+                index = enemy.y * self.width + enemy.x
+                self.tiles[index] = self.EMPTY
+                self.solid[index] = self.solid_lookup[self.EMPTY]
+                self.blocking[index] = self.solid[index] or index in self.object_blocking
+    
+    def _build_solid_lookup(self):
+        """Cria uma tabela tile -> sólido (1) ou não (0) a partir da tabela de tipos"""
+        lookup = self.tile_types.solid_lookup()
+        
+        # Paredes sempre colidem e portas nunca colidem
+        lookup[self.WALL] = 1
+        lookup[self.DOOR] = 0
+        return lookup
+    
+    def get_tile(self, x, y):
+        """Retorna o tipo do tile na posição (x, y), ou None fora do mapa"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.tiles[y * self.width + x]
+        return None
+    
+    def is_solid(self, x, y):
+        """Verifica se o tile na posição (x, y) bloqueia a passagem"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.solid[y * self.width + x] == 1
+        return False
+    
+    def _tile_rect(self, x, y):
+        """Cria o retângulo em pixels de um tile"""
+        return pygame.Rect(
+            x * self.tile_size, 
+            y * self.tile_size, 
+            self.tile_size, 
+            self.tile_size
+        )
+    
+    def build_collision_data(self):
+        """Cria o mapa de solidez dos tiles, a lista de portas e o índice de colisão dos objetos"""
+        # Mapa de solidez paralelo à grade de tiles (1 byte por tile)
+        self.solid_lookup = self._build_solid_lookup()
+        self.solid = bytearray(map(self.solid_lookup.__getitem__, self.tiles))
+        
+        # Portas
+        self.doors = build_doors(self.door_cells, self.tile_size)
+        
+        # Portal de cada célula (o primeiro declarado, se houver mais de um)
+        self.portal_cells = {}
+        for portal in self.portals:
+            self.portal_cells.setdefault((portal.x, portal.y), portal)
+        
+        # Índice espacial (uma célula por tile) para objetos com colisão
+        # (os inimigos se movem e são consultados na simulação dos inimigos)
+        self.collision_grid = SpatialGrid(self.tile_size)
+        
+        # Adiciona colisões para objetos específicos
+        for obj in self.objects:
+            if obj.collision:
+                self.collision_grid.insert(obj.rect)
+        
+        # Células ocupadas por objetos com colisão (baús, NPCs, placas, portas trancadas) e
+        # a grade de solidez combinada com elas, usada pelos inimigos e pelos caminhos
+        self.object_blocking = {
+            obj.y * self.width + obj.x
+            for obj in self.objects
+            if obj.collision and 0 <= obj.x < self.width and 0 <= obj.y < self.height
+        }
+        self.blocking = bytearray(self.solid)
+        for index in self.object_blocking:
+            self.blocking[index] = 1
+    
+    def query_collisions(self, rect):
+        """Retorna os retângulos de colisão que tocam o retângulo informado"""
+        found = []
+        
+        # Tiles sólidos nas células cobertas pelo retângulo
+        first_x = max(0, rect.left // self.tile_size)
+        first_y = max(0, rect.top // self.tile_size)
+        last_x = min(self.width - 1, (rect.right - 1) // self.tile_size)
+        last_y = min(self.height - 1, (rect.bottom - 1) // self.tile_size)
+        for y in range(first_y, last_y + 1):
+            row = y * self.width
+            for x in range(first_x, last_x + 1):
+                if self.solid[row + x]:
+                    found.append(self._tile_rect(x, y))
+        
+        # Objetos e inimigos com colisão
+        found.extend(self.collision_grid.query_rects(rect))
+        found.extend(self.enemy_simulation.query_rects(rect))
+        return found
+    
     def _create_error_map(self):
         """Cria um mapa de erro quando ocorre um problema ao carregar o mapa"""
         self.id = "error"
@@ -349,24 +419,24 @@ class Map:
         }
         
         # Cria um mapa com bordas e um padrão de "X" no meio para indicar erro
-        self.data = []
+        self.tiles = array("H")
         for y in range(self.height):
-            row = []
             for x in range(self.width):
                 # Bordas do mapa
                 if x == 0 or x == self.width - 1 or y == 0 or y == self.height - 1:
-                    row.append(self.WALL)
+                    self.tiles.append(self.WALL)
                 # Padrão de "X" no meio
                 elif x == y or x == (self.width - 1 - y):
-                    row.append(self.WALL)
+                    self.tiles.append(self.WALL)
                 # Resto é vazio
                 else:
-                    row.append(self.EMPTY)
-            self.data.append(row)
+                    self.tiles.append(self.EMPTY)
+        self.door_cells = []
+        self._tiles_mmap = None
         
         # Limpa outras estruturas
         self.portals = []
-        self.objects = [
+        self.objects = build_entities([
             {
                 "id": 12,  # Placa
                 "x": 12,
@@ -375,83 +445,454 @@ class Map:
                     "message": "Erro ao carregar o mapa. Verifique os arquivos do jogo."
                 }
             }
-        ]
+        ], self.tile_types, self.tile_size)
         self.enemies = []
         self.edge_transitions = {"left": None, "right": None, "top": None, "bottom": None}
         
-        # Recria os retângulos de colisão
-        self.wall_rects = []
-        self.door_rects = []
-        self.collision_rects = []
+        # Recria os dados de colisão
+        self.build_collision_data()
+    
+    def _draw_tile(self, surface, x, y, origin=(0, 0)):
+        """Desenha um único tile do terreno na superfície indicada"""
+        rect = pygame.Rect(
+            x * self.tile_size - origin[0], 
+            y * self.tile_size - origin[1], 
+            self.tile_size, 
+            self.tile_size
+        )
+        try:
+            tile_type = self.tiles[y * self.width + x]
+            tile_str = str(tile_type)
+            
+            # Desenha a imagem se disponível, caso contrário usa um retângulo colorido
+            if tile_str in self.images:
+                surface.blit(self.images[tile_str], rect)
+            else:
+                pygame.draw.rect(surface, self.colors.get(tile_type, (255, 0, 255)), rect)
+                pygame.draw.rect(surface, (0, 0, 0), rect, 1)  # Borda preta
+        except (IndexError, TypeError):
+            # Em caso de erro, desenha um tile roxo para indicar problema
+            pygame.draw.rect(surface, (255, 0, 255), rect)  # Roxo para indicar erro
+            pygame.draw.rect(surface, (0, 0, 0), rect, 1)  # Borda preta
+    
+    def _draw_object(self, surface, obj, origin=(0, 0)):
+        """Desenha um objeto específico na superfície indicada"""
+        if obj.key in self.images:
+            surface.blit(self._entity_image(obj.key), (obj.rect.x - origin[0], obj.rect.y - origin[1]))
+    
+    def _index_chunk_objects(self):
+        """Agrupa os objetos estáticos pelo bloco em que estão; os animados são desenhados a cada quadro"""
+        self.chunk_objects = {}
+        self.animated_objects = []
+        
+        # Objetos estáticos por célula, redesenhados sobre os tiles animados
+        self.object_cells = {}
         
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.data[y][x] == self.WALL:
-                    rect = pygame.Rect(
-                        x * self.tile_size, 
-                        y * self.tile_size, 
-                        self.tile_size, 
-                        self.tile_size
-                    )
-                    self.wall_rects.append(rect)
-                    self.collision_rects.append(rect)
-    
-    def draw(self, screen):
-        """Desenha o mapa na tela"""
-        for y in range(self.height):
-            for x in range(self.width):
-                try:
-                    tile_type = self.data[y][x]
-                    tile_str = str(tile_type)
-                    rect = pygame.Rect(
-                        x * self.tile_size, 
-                        y * self.tile_size, 
-                        self.tile_size, 
-                        self.tile_size
-                    )
-                    
-                    # Desenha a imagem se disponível, caso contrário usa um retângulo colorido
-                    if tile_str in self.images:
-                        screen.blit(self.images[tile_str], rect)
-                    else:
-                        pygame.draw.rect(screen, self.colors.get(tile_type, (255, 0, 255)), rect)
-                        pygame.draw.rect(screen, (0, 0, 0), rect, 1)  # Borda preta
-                except (IndexError, TypeError):
-                    # Em caso de erro, desenha um tile roxo para indicar problema
-                    rect = pygame.Rect(
-                        x * self.tile_size, 
-                        y * self.tile_size, 
-                        self.tile_size, 
-                        self.tile_size
-                    )
-                    pygame.draw.rect(screen, (255, 0, 255), rect)  # Roxo para indicar erro
-                    pygame.draw.rect(screen, (0, 0, 0), rect, 1)  # Borda preta
-        
-        # Desenha objetos específicos
         for obj in self.objects:
-            obj_id = str(obj.get("id", 0))
-            if obj_id in self.images:
-                x, y = obj.get("x", 0), obj.get("y", 0)
-                rect = pygame.Rect(
-                    x * self.tile_size, 
-                    y * self.tile_size, 
-                    self.tile_size, 
-                    self.tile_size
-                )
-                screen.blit(self.images[obj_id], rect)
-        
-        # Desenha inimigos
-        for enemy in self.enemies:
-            enemy_id = str(enemy.get("id", 0))
+            animation = self.animations.get(obj.key)
+            if animation is not None and animation.kind in LOOPING_TYPES:
+                self.animated_objects.append(obj)
+                continue
+            key = (obj.x // self.CHUNK_TILES, obj.y // self.CHUNK_TILES)
+            self.chunk_objects.setdefault(key, []).append(obj)
+            self.object_cells.setdefault((obj.x, obj.y), []).append(obj)
+    
+    def _build_chunk(self, cx, cy):
+        """Pré-renderiza um bloco do mapa (terreno e objetos estáticos)"""
+        chunk_px = self.CHUNK_TILES * self.tile_size
+        origin = (cx * chunk_px, cy * chunk_px)
+        
+        # Os blocos da borda podem ser menores que o tamanho padrão
+        first_x = cx * self.CHUNK_TILES
+        first_y = cy * self.CHUNK_TILES
+        last_x = min(first_x + self.CHUNK_TILES, self.width)
+        last_y = min(first_y + self.CHUNK_TILES, self.height)
+        
+        chunk = pygame.Surface(((last_x - first_x) * self.tile_size, (last_y - first_y) * self.tile_size))
+        
+        # Converte para o formato da tela, se já houver uma, para acelerar o blit
+        if pygame.display.get_surface() is not None:
+            chunk = chunk.convert()
+        
+        chunk.fill((0, 0, 0))
+        
+        # Desenha os tiles do terreno deste bloco
+        for y in range(first_y, last_y):
+            for x in range(first_x, last_x):
+                self._draw_tile(chunk, x, y, origin)
+        
+        # Desenha os objetos que estão neste bloco
+        for obj in self.chunk_objects.get((cx, cy), []):
+            self._draw_object(chunk, obj, origin)
+        
+        return chunk
+    
+    def get_chunk(self, cx, cy):
+        """Retorna um bloco pré-renderizado, criando-o se necessário"""
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self._build_chunk(cx, cy)
+            self.chunks[key] = chunk
+            
+            # Descarta os blocos usados há mais tempo se exceder o limite
+            while len(self.chunks) > self.MAX_CACHED_CHUNKS:
+                self.chunks.popitem(last=False)
+        else:
+            self.chunks.move_to_end(key)
+        return chunk
+    
+    def _index_animated_cells(self):
+        """Indexa as células do terreno com animação em laço, por bloco e por tipo de tile"""
+        # (bloco) -> {tipo de tile: [(x, y), ...]}
+        self.animated_cells = {}
+        
+        # tipo de tile -> {bloco: retângulo que envolve as células do tipo no bloco}
+        self.animated_bounds = {}
+        
+        if not self.looping_tiles:
+            return
+        
+        width = self.width
+        for index, tile in enumerate(self.tiles):
+            if tile in self.looping_tiles:
+                x, y = index % width, index // width
+                key = (x // self.CHUNK_TILES, y // self.CHUNK_TILES)
+                self.animated_cells.setdefault(key, {}).setdefault(tile, []).append((x, y))
+        
+        for key, cells_by_tile in self.animated_cells.items():
+            for tile in cells_by_tile:
+                self._update_animated_bounds(key, tile)
+    
+    def _update_animated_bounds(self, key, tile):
+        """Recalcula o retângulo das células animadas de um tipo de tile em um bloco"""
+        cells = self.animated_cells.get(key, {}).get(tile)
+        bounds = self.animated_bounds.setdefault(tile, {})
+        if not cells:
+            bounds.pop(key, None)
+            return
+        rect = self._tile_rect(*cells[0])
+        bounds[key] = rect.unionall([self._tile_rect(x, y) for x, y in cells[1:]])
+    
+    def build_static_layer(self):
+        """Pré-renderiza o terreno e os objetos estáticos em blocos de fundo"""
+        self.chunks.clear()
+        self._index_chunk_objects()
+        self._index_animated_cells()
+        
+        # Mapas pequenos são renderizados por inteiro no carregamento;
+        # nos grandes, os blocos são criados sob demanda conforme a câmera anda
+        chunks_x = (self.width + self.CHUNK_TILES - 1) // self.CHUNK_TILES
+        chunks_y = (self.height + self.CHUNK_TILES - 1) // self.CHUNK_TILES
+        if chunks_x * chunks_y <= self.MAX_CACHED_CHUNKS:
+            for cy in range(chunks_y):
+                for cx in range(chunks_x):
+                    self.get_chunk(cx, cy)
+    
+    def mark_dirty(self, rect):
+        """Marca uma região do mapa (em coordenadas do mundo) para ser redesenhada"""
+        if len(self.dirty_rects) >= self.MAX_DIRTY_RECTS:
+            # Muitas regiões (ou ninguém as consumindo, como sem janela): marca o mapa inteiro
+            self.dirty_rects = [pygame.Rect(0, 0, self.width * self.tile_size, self.height * self.tile_size)]
+        else:
+            self.dirty_rects.append(rect)
+    
+    def pop_dirty_rects(self):
+        """Retorna (e esquece) as regiões do mapa, em coordenadas do mundo, alteradas desde a última chamada
+        
+        Inclui sempre as regiões dos inimigos em movimento, desenhados em outra posição a cada quadro.
+        """
+        rects = self.dirty_rects
+        self.dirty_rects = []
+        return rects + self.enemy_motion_rects
+    
+    def set_tile(self, x, y, tile_type):
+        """Altera um tile do mapa, atualizando colisões e a camada estática"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            print(f"Aviso: Posição de tile fora do mapa {self.id}: ({x}, {y})")
+            return
+        
+        index = y * self.width + x
+        previous = self.tiles[index]
+        self.tiles[index] = tile_type
+        self.tile_edits.setdefault(index, previous)
+        
+        # Atualiza a solidez do tile, que pode ter passado a ser (ou deixado de ser) sólido
+        was_solid = self.solid[index]
+        was_blocking = self.blocking[index]
+        self.solid[index] = self.solid_lookup[tile_type]
+        self.blocking[index] = self.solid[index] or index in self.object_blocking
+        
+        # Os caminhos (que contornam também os objetos) e as linhas de visão calculados
+        # podem ter deixado de valer
+        if self.blocking[index] != was_blocking:
+            self.pathfinder.invalidate()
+        if self.solid[index] != was_solid:
+            self.visibility.invalidate()
+        
+        # Atualiza a lista de portas se uma porta foi criada ou removida
+        if previous == self.DOOR or tile_type == self.DOOR:
+            self.doors = [door for door in self.doors if (door.x, door.y) != (x, y)]
+            if tile_type == self.DOOR:
+                self.doors.append(Door(x, y, self.tile_size))
+        
+        # Atualiza o índice das células animadas
+        key = (x // self.CHUNK_TILES, y // self.CHUNK_TILES)
+        if previous in self.looping_tiles:
+            self.animated_cells[key][previous].remove((x, y))
+            self._update_animated_bounds(key, previous)
+        if tile_type in self.looping_tiles:
+            self.animated_cells.setdefault(key, {}).setdefault(tile_type, []).append((x, y))
+            self._update_animated_bounds(key, tile_type)
+        
+        # A célula precisa ser redesenhada na tela
+        self.mark_dirty(self._tile_rect(x, y))
+        
+        # Redesenha apenas a célula alterada no bloco correspondente, se já existir
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            chunk_px = self.CHUNK_TILES * self.tile_size
+            origin = (key[0] * chunk_px, key[1] * chunk_px)
+            cell = pygame.Rect(x * self.tile_size - origin[0], y * self.tile_size - origin[1], self.tile_size, self.tile_size)
+            chunk.fill((0, 0, 0), cell)
+            self._draw_tile(chunk, x, y, origin)
+            for obj in self.object_cells.get((x, y), ()):
+                self._draw_object(chunk, obj, origin)
+    
+    def draw(self, screen, camera=None, alpha=1.0):
+        """Desenha o mapa na tela
+        
+        alpha é a fração do próximo tick já decorrida; os inimigos são desenhados entre a
+        posição do tick anterior e a atual, como o jogador (ver Player.interpolated_rect).
+        """
+        # Sem câmera, desenha a partir da origem do mundo
+        if camera is not None:
+            view = camera.rect
+        else:
+            view = screen.get_rect()
+        
+        # Desenha apenas os blocos que aparecem na área visível
+        chunk_px = self.CHUNK_TILES * self.tile_size
+        chunks_x = (self.width + self.CHUNK_TILES - 1) // self.CHUNK_TILES
+        chunks_y = (self.height + self.CHUNK_TILES - 1) // self.CHUNK_TILES
+        first_cx = max(0, view.left // chunk_px)
+        first_cy = max(0, view.top // chunk_px)
+        last_cx = min(chunks_x - 1, (view.right - 1) // chunk_px)
+        last_cy = min(chunks_y - 1, (view.bottom - 1) // chunk_px)
+        
+        for cy in range(first_cy, last_cy + 1):
+            for cx in range(first_cx, last_cx + 1):
+                screen.blit(self.get_chunk(cx, cy), (cx * chunk_px - view.x, cy * chunk_px - view.y))
+        
+        # Desenha as animações por cima da camada estática
+        self.draw_animations(screen, view, (first_cx, first_cy, last_cx, last_cy))
+        
+        # Desenha os inimigos visíveis, nas posições interpoladas da simulação
+        enemies = self.enemy_simulation
+        moving = enemies.moving
+        enemies_x, enemies_y = enemies.interpolated_positions(alpha)
+        for index in enemies.visible(view, enemies_x, enemies_y):
+            enemy_id = str(enemies.type_id[index])
             if enemy_id in self.images:
-                x, y = enemy.get("x", 0), enemy.get("y", 0)
-                rect = pygame.Rect(
-                    x * self.tile_size, 
-                    y * self.tile_size, 
-                    self.tile_size, 
-                    self.tile_size
-                )
-                screen.blit(self.images[enemy_id], rect)
+                position = (int(enemies_x[index]) - view.x, int(enemies_y[index]) - view.y)
+                screen.blit(self._entity_image(enemy_id, moving[index]), position)
+    
+    def _entity_image(self, entity_id, moving=False):
+        """Imagem atual de um objeto ou inimigo (quadro da animação, se houver)"""
+        animation = self.animations.get(entity_id)
+        if animation is not None:
+            if animation.kind in LOOPING_TYPES and not moving:
+                return animation.frame_at(animation_clock.ticks)
+            if animation.kind == MOVEMENT and moving:
+                return animation.frame_at(animation_clock.ticks)
+        return self.images[entity_id]
+    
+    def _draw_cell_frame(self, screen, x, y, frame, opaque, view, tile_id=None):
+        """Desenha um quadro de animação em uma célula, refazendo os objetos estáticos por cima
+        
+        Se tile_id for o tipo de um objeto da célula (baú, porta trancada), o quadro é
+        desenhado no lugar desse objeto, sobre o terreno; senão, é um quadro do terreno.
+        """
+        position = (x * self.tile_size - view.x, y * self.tile_size - view.y)
+        objects = self.object_cells.get((x, y), ())
+        if tile_id is not None and any(obj.key == tile_id for obj in objects):
+            # Refaz o terreno e os demais objetos; a imagem do próprio objeto cobriria a animação
+            screen.fill((0, 0, 0), (position, (self.tile_size, self.tile_size)))
+            self._draw_tile(screen, x, y, view.topleft)
+            for obj in objects:
+                if obj.key == tile_id:
+                    screen.blit(frame, position)
+                else:
+                    self._draw_object(screen, obj, view.topleft)
+            return
+        
+        if not opaque:
+            # Como na camada estática, o tile é desenhado sobre fundo preto
+            screen.fill((0, 0, 0), (position, (self.tile_size, self.tile_size)))
+        screen.blit(frame, position)
+        for obj in objects:
+            self._draw_object(screen, obj, view.topleft)
+    
+    def draw_animations(self, screen, view, visible_chunks):
+        """Desenha os tiles, objetos e células com animação visíveis na área da câmera
+        
+        visible_chunks é o intervalo (primeiro x, primeiro y, último x, último y) dos blocos visíveis.
+        """
+        ticks = animation_clock.ticks
+        
+        # Área visível, em tiles
+        first_x = max(0, view.left // self.tile_size)
+        first_y = max(0, view.top // self.tile_size)
+        last_x = min(self.width - 1, (view.right - 1) // self.tile_size)
+        last_y = min(self.height - 1, (view.bottom - 1) // self.tile_size)
+        
+        # Tiles do terreno com animação em laço: só as células indexadas são redesenhadas,
+        # e todas as de um tipo usam o mesmo quadro
+        if self.animated_cells:
+            frames = {tile: animation.frame_at(ticks) for tile, animation in self.looping_tiles.items()}
+            first_cx, first_cy, last_cx, last_cy = visible_chunks
+            size = self.tile_size
+            for cy in range(first_cy, last_cy + 1):
+                for cx in range(first_cx, last_cx + 1):
+                    for tile, cells in self.animated_cells.get((cx, cy), {}).items():
+                        frame = frames[tile]
+                        if self.looping_tiles[tile].opaque:
+                            # Quadros opacos cobrem a célula inteira: um único blits por tipo
+                            screen.blits([(frame, (x * size - view.x, y * size - view.y)) for x, y in cells], doreturn=False)
+                            for x, y in cells:
+                                for obj in self.object_cells.get((x, y), ()):
+                                    self._draw_object(screen, obj, view.topleft)
+                        else:
+                            for x, y in cells:
+                                self._draw_cell_frame(screen, x, y, frame, False, view)
+        
+        # Animações disparadas (portas, baús, grama alta)
+        for (x, y), (tile_id, start_tick) in self.active_animations.items():
+            if first_x <= x <= last_x and first_y <= y <= last_y:
+                animation = self.animations[tile_id]
+                frame = animation.frame_since(start_tick, ticks)
+                if frame is not None:
+                    self._draw_cell_frame(screen, x, y, frame, animation.opaque, view, tile_id)
+        
+        # Objetos animados (não fazem parte da camada estática)
+        for obj in self.animated_objects:
+            if first_x <= obj.x <= last_x and first_y <= obj.y <= last_y:
+                self._draw_object(screen, obj, view.topleft)
+    
+    def trigger_animation(self, x, y, tile_id=None):
+        """Inicia a animação de interação ou de caminhada da célula (x, y)"""
+        if tile_id is None:
+            tile_id = self.get_tile(x, y)
+        animation = self.animations.get(str(tile_id))
+        if animation is not None and animation.kind in ONE_SHOT_TYPES:
+            self.active_animations[(x, y)] = (str(tile_id), animation_clock.ticks)
+            self.mark_dirty(self._tile_rect(x, y))
+    
+    def update_animations(self, player=None):
+        """Avança o estado das animações em um tick, marcando as regiões da tela que mudam"""
+        ticks = animation_clock.ticks
+        
+        # Grama alta (e similares) se mexe quando o jogador caminha sobre ela
+        if player is not None and self.walk_tiles and player.velocity.length_squared() > 0:
+            rect = player.rect
+            first_x = max(0, rect.left // self.tile_size)
+            first_y = max(0, rect.top // self.tile_size)
+            last_x = min(self.width - 1, (rect.right - 1) // self.tile_size)
+            last_y = min(self.height - 1, (rect.bottom - 1) // self.tile_size)
+            for y in range(first_y, last_y + 1):
+                for x in range(first_x, last_x + 1):
+                    if self.tiles[y * self.width + x] in self.walk_tiles and (x, y) not in self.active_animations:
+                        self.trigger_animation(x, y)
+        
+        # Animações disparadas mudam a cada tick até terminarem
+        for cell, (tile_id, start_tick) in list(self.active_animations.items()):
+            self.mark_dirty(self._tile_rect(*cell))
+            if self.animations[tile_id].is_finished(start_tick, ticks):
+                del self.active_animations[cell]
+        
+        # Animações em laço só mudam a tela quando trocam de quadro
+        for tile_id, animation in self.animations.items():
+            if animation.kind not in LOOPING_TYPES:
+                continue
+            index = animation.frame_index(ticks)
+            if self.loop_frames.get(tile_id) == index:
+                continue
+            self.loop_frames[tile_id] = index
+            
+            # Células do terreno deste tipo: uma região por bloco
+            if tile_id.isdigit():
+                for rect in self.animated_bounds.get(int(tile_id), {}).values():
+                    self.mark_dirty(rect)
+            for obj in self.animated_objects:
+                if obj.key == tile_id:
+                    self.mark_dirty(obj.rect)
+            if tile_id.isdigit():
+                enemies = self.enemy_simulation
+                for rect in enemies.rects((enemies.type_id == int(tile_id)) & ~enemies.moving):
+                    self.mark_dirty(rect)
+    
+    def update_enemies(self, player=None):
+        """Avança os inimigos em um tick, marcando as regiões da tela por onde passaram"""
+        enemies = self.enemy_simulation
+        if not len(enemies):
+            return
+        
+        # Estado (parado ou em movimento) antes do movimento
+        previous_moving = enemies.moving
+        moved = enemies.update(player.rect if player is not None else None)
+        
+        # Apaga as posições interpoladas desenhadas desde o tick anterior
+        for rect in self.enemy_motion_rects:
+            self.mark_dirty(rect)
+        self.enemy_motion_rects = []
+        
+        # Inimigos que pararam (ou voltaram a andar) no lugar também trocam de imagem
+        changed = previous_moving != enemies.moving
+        indices = np.flatnonzero(moved | changed)
+        if len(indices) * 2 > self.MAX_DIRTY_RECTS:
+            # Muitos inimigos em movimento: marca o mapa inteiro de uma vez
+            rect = pygame.Rect(0, 0, self.width * self.tile_size, self.height * self.tile_size)
+            self.mark_dirty(rect)
+            if moved.any():
+                self.enemy_motion_rects = [rect]
+            return
+        size = self.tile_size
+        for index in indices:
+            rect = pygame.Rect(int(enemies.x[index]), int(enemies.y[index]), size, size)
+            rect.union_ip((int(enemies.previous_x[index]), int(enemies.previous_y[index]), size, size))
+            if moved[index]:
+                # Redesenhada a cada quadro até o próximo tick (o inimigo anda entre as duas posições)
+                self.enemy_motion_rects.append(rect)
+            else:
+                self.mark_dirty(rect)
+    
+    def reset(self):
+        """Volta o estado da visita ao de um mapa recém-carregado (chamado a cada entrada no mapa)
+        
+        Os mapas ficam em cache no MapPrefetcher, mas cada visita começa como no carregamento:
+        os tiles alterados voltam ao original, os inimigos às posições iniciais, e as animações
+        disparadas e as regiões pendentes são descartadas. Só os dados preparados (grade,
+        camada estática, índices, assets) são reaproveitados.
+        """
+        edits = self.tile_edits
+        self.tile_edits = {}
+        for index, original in edits.items():
+            self.set_tile(index % self.width, index // self.width, original)
+        self.tile_edits = {}
+        
+        self.enemy_simulation = EnemySimulation(self, self.enemy_seed())
+        self.active_animations.clear()
+        self.loop_frames.clear()
+        self.dirty_rects = []
+        self.enemy_motion_rects = []
+    
+    def enemies_seeing(self, player):
+        """Índices (em self.enemies) dos inimigos que veem o jogador agora"""
+        return np.flatnonzero(self.enemy_simulation.seeing(player.rect))
+    
+    def find_path(self, start, goal):
+        """Caminho, em tiles, de start até goal contornando os tiles sólidos e os objetos com colisão (None se não houver)"""
+        return self.pathfinder.find_path(start, goal)
     
     def check_collision(self, player):
         """Verifica colisões entre o jogador e as paredes/objetos"""
@@ -459,20 +900,22 @@ class Map:
         prev_x = player.rect.x
         prev_y = player.rect.y
         
-        # Verifica colisão com cada objeto de colisão
-        for collision_rect in self.collision_rects:
-            if player.rect.colliderect(collision_rect):
-                # Restaura a posição anterior se houve colisão
-                player.rect.x = prev_x
-                player.rect.y = prev_y
-                return True
+        # Verifica colisão apenas com os objetos das células ocupadas pelo jogador
+        if self.query_collisions(player.rect):
+            # Restaura a posição anterior se houve colisão
+            player.rect.x = prev_x
+            player.rect.y = prev_y
+            return True
         
         return False
     
     def check_door_interaction(self, player):
         """Verifica se o jogador está interagindo com uma porta"""
-        for door in self.door_rects:
-            if player.rect.colliderect(door["rect"]):
+        for door in self.doors:
+            if player.rect.colliderect(door.rect):
+                # Anima a porta
+                self.trigger_animation(door.x, door.y)
+                
                 # Toca o som de interação da porta, se disponível
                 try:
                     if "2" in self.interaction_sounds:
@@ -482,26 +925,18 @@ class Map:
                     print(f"Aviso: Não foi possível tocar som de porta: {e}")
                 
                 # Procura o portal correspondente
-                for portal in self.portals:
-                    try:
-                        if portal["x"] == door["x"] and portal["y"] == door["y"]:
-                            # Verifica se o mapa de destino existe
-                            target_map = portal.get("target_map", "map1")
-                            if not os.path.exists(os.path.join("maps", f"{target_map}.json")):
-                                print(f"Aviso: Mapa de destino não encontrado: {target_map}")
-                                return None
-                            
-                            # Verifica se as coordenadas de destino são válidas
-                            target_x = portal.get("target_x", 1)
-                            target_y = portal.get("target_y", 1)
-                            
-                            return {
-                                "target_map": target_map,
-                                "target_x": target_x,
-                                "target_y": target_y
-                            }
-                    except Exception as e:
-                        print(f"Erro ao processar portal: {e}")
+                portal = self.portal_cells.get((door.x, door.y))
+                if portal is not None:
+                    # Verifica se o mapa de destino existe
+                    if not get_world_index().has_map(portal.target_map):
+                        print(f"Aviso: Mapa de destino não encontrado: {portal.target_map}")
+                        return None
+                    
+                    return {
+                        "target_map": portal.target_map,
+                        "target_x": portal.target_x,
+                        "target_y": portal.target_y
+                    }
         
         return None
     
@@ -511,46 +946,23 @@ class Map:
         interaction_rect = player.rect.inflate(10, 10)  # Aumenta a área de interação
         
         for obj in self.objects:
-            obj_id = str(obj.get("id", 0))
-            x, y = obj.get("x", 0), obj.get("y", 0)
-            
-            # Cria um retângulo para o objeto
-            obj_rect = pygame.Rect(
-                x * self.tile_size, 
-                y * self.tile_size, 
-                self.tile_size, 
-                self.tile_size
-            )
-            
-            # Verifica se o jogador está próximo o suficiente para interagir com o objeto
-            if interaction_rect.colliderect(obj_rect):
-                # Verifica se o objeto é interativo
-                is_interactive = False
+            # Verifica se o jogador está próximo o suficiente para interagir com um objeto interativo
+            if obj.interactive and interaction_rect.colliderect(obj.rect):
+                print(f"Interagindo com objeto ID {obj.key}")
                 
-                # Verifica se é um NPC ou outro objeto interativo
-                if obj_id in self.item_config.get("tile_types", {}):
-                    item_config = self.item_config["tile_types"][obj_id]
-                    item_type = item_config.get("type", "")
-                    details = item_config.get("details", {})
-                    
-                    # NPCs e objetos com a propriedade interactive são interativos
-                    if item_type == "npc" or details.get("interactive", False):
-                        is_interactive = True
+                # Anima o objeto (baús, portas trancadas...)
+                self.trigger_animation(obj.x, obj.y, obj.key)
                 
-                # Se for interativo, processa a interação
-                if is_interactive:
-                    print(f"Interagindo com objeto ID {obj_id}")
-                    
-                    # Toca o som de interação do objeto, se disponível
-                    try:
-                        if obj_id in self.interaction_sounds:
-                            self.interaction_sounds[obj_id].play()
-                    except Exception as e:
-                        # Ignora erros ao tocar o som
-                        print(f"Aviso: Não foi possível tocar som do objeto {obj_id}: {e}")
-                    
-                    # Retorna o objeto para processamento adicional
-                    return obj
+                # Toca o som de interação do objeto, se disponível
+                try:
+                    if obj.key in self.interaction_sounds:
+                        self.interaction_sounds[obj.key].play()
+                except Exception as e:
+                    # Ignora erros ao tocar o som
+                    print(f"Aviso: Não foi possível tocar som do objeto {obj.key}: {e}")
+                
+                # Retorna o objeto para processamento adicional
+                return obj
         
         return None
     
@@ -563,7 +975,7 @@ class Map:
                 target_map = transition.get("target_map", "map1")
                 
                 # Verifica se o mapa de destino existe
-                if not os.path.exists(os.path.join("maps", f"{target_map}.json")):
+                if not get_world_index().has_map(target_map):
                     print(f"Aviso: Mapa de destino não encontrado: {target_map}")
                     return None
                 
@@ -580,7 +992,7 @@ class Map:
                 target_map = transition.get("target_map", "map1")
                 
                 # Verifica se o mapa de destino existe
-                if not os.path.exists(os.path.join("maps", f"{target_map}.json")):
+                if not get_world_index().has_map(target_map):
                     print(f"Aviso: Mapa de destino não encontrado: {target_map}")
                     return None
                 
@@ -597,7 +1009,7 @@ class Map:
                 target_map = transition.get("target_map", "map1")
                 
                 # Verifica se o mapa de destino existe
-                if not os.path.exists(os.path.join("maps", f"{target_map}.json")):
+                if not get_world_index().has_map(target_map):
                     print(f"Aviso: Mapa de destino não encontrado: {target_map}")
                     return None
                 
@@ -614,7 +1026,7 @@ class Map:
                 target_map = transition.get("target_map", "map1")
                 
                 # Verifica se o mapa de destino existe
-                if not os.path.exists(os.path.join("maps", f"{target_map}.json")):
+                if not get_world_index().has_map(target_map):
                     print(f"Aviso: Mapa de destino não encontrado: {target_map}")
                     return None
                 
@@ -626,9 +1038,20 @@ class Map:
                 }
         except (KeyError, TypeError, AttributeError) as e:
             print(f"Erro ao verificar transição de borda: {e}")
-            
+        
         return None 
-
+    
+    def get_neighbour_ids(self):
+        """Retorna os IDs dos mapas alcançáveis a partir deste (portais e transições de borda)"""
+        neighbours = []
+        for portal in self.portals:
+            if portal.target_map and portal.target_map not in neighbours:
+                neighbours.append(portal.target_map)
+        for transition in self.edge_transitions.values():
+            if transition and transition.get("target_map") and transition["target_map"] not in neighbours:
+                neighbours.append(transition["target_map"])
+        return neighbours
+    
     def get_soundtrack_path(self):
         """Retorna o caminho da trilha sonora do mapa"""
         return self.soundtrack_path 
\ No newline at end of file
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Formato binário compilado dos mapas (.tdm) e conversor a partir do JSON.
+#
+# Layout do arquivo (little-endian):
+#   cabeçalho - ver HEADER_FORMAT
+#   tiles     - largura * altura valores uint16, em ordem de linhas
+#   metadados - JSON UTF-8 com nome, cores, trilha sonora e as tabelas de
+#               portais, objetos, inimigos, transições de borda e portas
+#
+# A grade de tiles é lida via mmap e exposta como memoryview, sem cópia.
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+# Identificação do formato
+MAGIC = b"TDMAP\0"
+VERSION = 1
+
+# magic, versão, largura, altura, tamanho do tile, reservado,
+# offset/tamanho dos tiles, offset/tamanho dos metadados
+HEADER_FORMAT = "<6sHIIHHIIII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Extensão dos mapas compilados (ficam ao lado dos .json em maps/)
+COMPILED_EXTENSION = ".tdm"
+
+# Tipos de tile usados para completar mapas com dimensões incorretas
+EMPTY = 0
+WALL = 1
+DOOR = 2
+
+# Valor usado na grade para tiles inválidos
+INVALID_TILE = 0xFFFF
+
+def json_path_for(map_id, maps_dir="maps"):
+    """Retorna o caminho do arquivo JSON de um mapa"""
+    return os.path.join(maps_dir, f"{map_id}.json")
+
+def compiled_path_for(map_id, maps_dir="maps"):
+    """Retorna o caminho do arquivo compilado de um mapa"""
+    return os.path.join(maps_dir, f"{map_id}{COMPILED_EXTENSION}")
+
+def build_tile_grid(rows, width, height, map_id=""):
+    """Converte a matriz de tiles do JSON para uma grade array('H') com as dimensões corretas"""
+    # Verifica se os dados do mapa têm as dimensões corretas
+    if len(rows) != height:
+        print(f"Aviso: Altura do mapa {map_id} incorreta. Esperado {height}, encontrado {len(rows)}")
+    
+    # Grade em ordem de linhas: o tile (x, y) fica em tiles[y * width + x]
+    tiles = array("H")
+    for y in range(height):
+        if y < len(rows):
+            row = rows[y]
+            
+            # Verifica se todas as linhas têm a largura correta
+            if len(row) != width:
+                print(f"Aviso: Largura da linha {y} do mapa {map_id} incorreta. Esperado {width}, encontrado {len(row)}")
+                # Ajusta a linha para ter a largura correta
+                if len(row) < width:
+                    row = row + [EMPTY] * (width - len(row))
+                else:
+                    row = row[:width]
+        else:
+            # Adiciona linhas vazias (com paredes nas laterais) se necessário
+            row = [WALL if x == 0 or x == width - 1 else EMPTY for x in range(width)]
+        
+        # Valores que não cabem em uint16 (ou não são inteiros) são marcados como inválidos;
+        # a linha é limpa antes para que uma falha no meio não deixe parte dela na grade
+        tiles.extend([value if isinstance(value, int) and 0 <= value < INVALID_TILE else INVALID_TILE for value in row])
+    
+    return tiles
+
+def find_door_cells(tiles, width):
+    """Retorna as posições (x, y) de todas as portas da grade"""
+    return [(index % width, index // width) for index, tile_type in enumerate(tiles) if tile_type == DOOR]
+
+def compile_map(map_id, maps_dir="maps"):
+    """Compila maps/<id>.json para maps/<id>.tdm. Retorna o caminho gerado ou None."""
+    json_path = json_path_for(map_id, maps_dir)
+    try:
+        with open(json_path, "r") as f:
+            map_data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Erro: Não foi possível ler o mapa {json_path}: {e}")
+        return None
+    
+    width = map_data.get("width", 25)
+    height = map_data.get("height", 19)
+    tile_size = map_data.get("tile_size", 32)
+    
+    tiles = build_tile_grid(map_data.get("data", []), width, height, map_id)
+    
+    # Metadados e tabelas pré-extraídas
+    stat = os.stat(json_path)
+    meta = {key: value for key, value in map_data.items() if key != "data"}
+    meta["doors"] = find_door_cells(tiles, width)
+    meta["source_mtime_ns"] = stat.st_mtime_ns
+    meta["source_size"] = stat.st_size
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    
+    # Os tiles são sempre gravados em little-endian
+    if sys.byteorder != "little":
+        tiles.byteswap()
+    tile_bytes = tiles.tobytes()
+    
+    # Os tiles começam em um offset alinhado a 8 bytes
+    tiles_offset = (HEADER_SIZE + 7) // 8 * 8
+    meta_offset = tiles_offset + len(tile_bytes)
+    header = struct.pack(
+        HEADER_FORMAT, MAGIC, VERSION, width, height, tile_size, 0,
+        tiles_offset, len(tile_bytes), meta_offset, len(meta_bytes)
+    )
+    
+    out_path = compiled_path_for(map_id, maps_dir)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(b"\0" * (tiles_offset - HEADER_SIZE))
+        f.write(tile_bytes)
+        f.write(meta_bytes)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+def load_compiled_map(map_id, maps_dir="maps"):
+    """Carrega um mapa compilado via mmap.
+    
+    Retorna (metadados, tiles, mmap) ou None se não houver arquivo compilado
+    válido e atualizado (nesse caso o chamador deve usar o JSON).
+    """
+    path = compiled_path_for(map_id, maps_dir)
+    try:
+        with open(path, "rb") as f:
+            # ACCESS_COPY permite alterar tiles em memória sem modificar o arquivo
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+    
+    try:
+        if len(mm) < HEADER_SIZE:
+            raise ValueError("arquivo truncado")
+        
+        (magic, version, width, height, tile_size, _flags,
+         tiles_offset, tiles_length, meta_offset, meta_length) = struct.unpack_from(HEADER_FORMAT, mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("formato ou versão desconhecidos")
+        if tiles_length != width * height * 2 or meta_offset + meta_length > len(mm):
+            raise ValueError("tamanhos inconsistentes")
+        
+        meta = json.loads(mm[meta_offset:meta_offset + meta_length].decode("utf-8"))
+        
+        # Ignora o arquivo compilado se o JSON foi alterado depois da compilação
+        try:
+            stat = os.stat(json_path_for(map_id, maps_dir))
+            if stat.st_mtime_ns != meta.get("source_mtime_ns") or stat.st_size != meta.get("source_size"):
+                print(f"Aviso: Mapa compilado {path} desatualizado, usando o JSON")
+                mm.close()
+                return None
+        except OSError:
+            # Sem JSON de origem, o compilado é a única fonte
+            pass
+        
+        meta["width"] = width
+        meta["height"] = height
+        meta["tile_size"] = tile_size
+        
+        # Visão uint16 direta sobre o mmap (sem cópia)
+        if sys.byteorder == "little":
+            tiles = memoryview(mm)[tiles_offset:tiles_offset + tiles_length].cast("H")
+        else:
+            tiles = array("H")
+            tiles.frombytes(mm[tiles_offset:tiles_offset + tiles_length])
+            tiles.byteswap()
+        
+        return meta, tiles, mm
+    except (ValueError, struct.error, UnicodeDecodeError) as e:
+        print(f"Aviso: Mapa compilado inválido {path}: {e}")
+        mm.close()
+        return None
+
+def load_map_metadata(map_id, maps_dir="maps"):
+    """Lê apenas os metadados de um mapa (sem a grade de tiles); retorna None se não existir"""
+    compiled = load_compiled_map(map_id, maps_dir)
+    if compiled is not None:
+        meta, tiles, mm = compiled
+        if isinstance(tiles, memoryview):
+            tiles.release()
+        mm.close()
+        return meta
+    
+    try:
+        with open(json_path_for(map_id, maps_dir), "r") as f:
+            map_data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Aviso: Não foi possível ler o mapa {map_id}: {e}")
+        return None
+    map_data.pop("data", None)
+    return map_data
+
+def compile_all(map_ids=None, maps_dir="maps"):
+    """Compila os mapas indicados (ou todos os mapas JSON do diretório)"""
+    if not map_ids:
+        map_ids = sorted(
+            os.path.splitext(name)[0]
+            for name in os.listdir(maps_dir)
+            if name.endswith(".json")
+        )
+    
+    compiled = 0
+    for map_id in map_ids:
+        out_path = compile_map(map_id, maps_dir)
+        if out_path:
+            print(f"Mapa compilado: {out_path}")
+            compiled += 1
+    
+    print(f"{compiled} de {len(map_ids)} mapas compilados.")
+    return compiled == len(map_ids)
+
+def clean_all(maps_dir="maps"):
+    """Remove todos os mapas compilados do diretório"""
+    for name in os.listdir(maps_dir):
+        if name.endswith(COMPILED_EXTENSION):
+            os.remove(os.path.join(maps_dir, name))
+            print(f"Removido: {os.path.join(maps_dir, name)}")
+
+if __name__ == "__main__":
+    # Uso: python map_compiler.py [--clean] [map_id ...]
+    args = sys.argv[1:]
+    if "--clean" in args:
+        clean_all()
+    else:
+        sys.exit(0 if compile_all(args) else 1)
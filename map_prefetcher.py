@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from map import Map
+
+# Os mapas em cache são reaproveitados entre as visitas pelos dados já preparados
+# (grade, camada estática, índices e assets); o estado de cada visita (tiles
+# alterados, inimigos, animações) é refeito por Map.reset() ao entrar no mapa.
+
+class MapPrefetcher:
+    def __init__(self, max_workers=2, max_cached=8, seed=None):
+        # Threads que carregam os mapas em segundo plano
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="map-loader")
+        
+        # ID do mapa -> Future com o Map pronto (ou em preparação), em ordem de uso (LRU)
+        self.maps = OrderedDict()
+        self.max_cached = max_cached
+        
+        # Semente repassada aos mapas (movimento dos inimigos reproduzível)
+        self.seed = seed
+        
+        self.lock = threading.Lock()
+    
+    def _load(self, map_id):
+        """Carrega um mapa e os assets que ele usa (executado em uma thread de trabalho)"""
+        game_map = Map(map_id, seed=self.seed)
+        game_map.preload_assets()
+        return game_map
+    
+    def _trim(self, keep=()):
+        """Descarta os mapas usados há mais tempo, mantendo os que estão em preparação"""
+        for map_id in list(self.maps):
+            if len(self.maps) <= self.max_cached:
+                break
+            if map_id in keep or not self.maps[map_id].done():
+                continue
+            del self.maps[map_id]
+    
+    def prefetch(self, map_id):
+        """Agenda a preparação de um mapa em segundo plano, se ainda não estiver em cache"""
+        with self.lock:
+            if map_id in self.maps:
+                return
+            self.maps[map_id] = self.executor.submit(self._load, map_id)
+            self._trim(keep=(map_id,))
+    
+    def prefetch_neighbours(self, game_map, neighbour_ids=None):
+        """Prepara em segundo plano todos os mapas vizinhos do mapa informado"""
+        if neighbour_ids is None:
+            neighbour_ids = game_map.get_neighbour_ids()
+        with self.lock:
+            # O mapa atual e seus vizinhos são os mais recentes do cache
+            for map_id in [game_map.id] + list(neighbour_ids):
+                if map_id in self.maps:
+                    self.maps.move_to_end(map_id)
+        for map_id in neighbour_ids:
+            self.prefetch(map_id)
+    
+    def add(self, game_map):
+        """Guarda um mapa já carregado no cache"""
+        future = Future()
+        future.set_result(game_map)
+        with self.lock:
+            self.maps[game_map.id] = future
+            self.maps.move_to_end(game_map.id)
+            self._trim(keep=(game_map.id,))
+    
+    def get(self, map_id):
+        """Retorna o mapa pronto; se ainda estiver sendo preparado, espera, e se não estiver em cache, carrega agora"""
+        with self.lock:
+            future = self.maps.get(map_id)
+            if future is not None:
+                self.maps.move_to_end(map_id)
+        
+        if future is None:
+            game_map = Map(map_id, seed=self.seed)
+            self.add(game_map)
+            return game_map
+        
+        try:
+            return future.result()
+        except Exception as e:
+            # Se a preparação em segundo plano falhou, tenta de novo na thread principal
+            print(f"Aviso: Falha ao preparar o mapa {map_id} em segundo plano: {e}")
+            game_map = Map(map_id, seed=self.seed)
+            self.add(game_map)
+            return game_map
+    
+    def is_ready(self, map_id):
+        """Verifica se o mapa já está pronto para uso imediato"""
+        with self.lock:
+            future = self.maps.get(map_id)
+        return future is not None and future.done()
+    
+    def shutdown(self):
+        """Encerra as threads de carregamento"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Busca de caminhos sobre a grade de tiles de um mapa.
+#
+# Os inimigos que perseguem o jogador compartilham um único campo de fluxo:
+# uma busca em largura (Dijkstra com custo uniforme) a partir do tile do
+# jogador, limitada a uma janela em volta dele. O campo só é recalculado
+# quando o jogador muda de tile, quando algum tile do mapa muda ou quando um
+# inimigo chega a um tile que a busca não alcançou; cada inimigo apenas lê,
+# no campo, o próximo tile do seu caminho.
+#
+# A busca para assim que alcança os tiles de todos os inimigos que vão seguir
+# o campo: como eles costumam estar perto do jogador, cada recálculo visita
+# só os tiles mais próximos dele, e não a janela inteira.
+#
+# Os caminhos contornam os tiles sólidos e os objetos com colisão (a grade
+# "blocking" do mapa), como o movimento dos inimigos.
+#
+# Para movimentos roteirizados (NPCs), find_path faz um A* entre dois tiles,
+# guardando os caminhos já calculados.
+
+import heapq
+from collections import OrderedDict, deque
+
+import numpy as np
+
+# Distância dos tiles que não alcançam o alvo
+UNREACHABLE = np.iinfo(np.int32).max
+
+# Vizinhos de um tile (movimento em quatro direções, como o dos inimigos)
+NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+class FlowField:
+    def __init__(self, target, left, top, distance, complete=True):
+        # Tile alvo e canto superior esquerdo da janela coberta pelo campo
+        self.target = target
+        self.left = left
+        self.top = top
+        
+        # Distância (em passos) de cada tile da janela até o alvo
+        self.distance = distance
+        self.height, self.width = distance.shape
+        
+        # Se a busca percorreu toda a janela (senão, parou ao alcançar os tiles pedidos)
+        self.complete = complete
+        
+        # Cópia com uma borda inalcançável, para consultar os vizinhos sem testar limites
+        self.padded = np.pad(distance, 1, constant_values=UNREACHABLE)
+    
+    def covers(self, target, left, top, right, bottom, sources=None):
+        """Verifica se o campo tem o mesmo alvo, cobre a janela informada e serve aos tiles sources
+        
+        Um campo incompleto só serve se a busca já alcançou cada tile de sources (arrays
+        tile_x, tile_y) que está na janela; sem sources, só um campo completo serve.
+        """
+        if not (self.target == target and self.left <= left and self.top <= top and
+                self.left + self.width - 1 >= right and self.top + self.height - 1 >= bottom):
+            return False
+        if self.complete:
+            return True
+        if sources is None:
+            return False
+        local_x = np.asarray(sources[0], dtype=np.intp) - self.left
+        local_y = np.asarray(sources[1], dtype=np.intp) - self.top
+        inside = (local_x >= 0) & (local_x < self.width) & (local_y >= 0) & (local_y < self.height)
+        return bool((self.distance[local_y[inside], local_x[inside]] != UNREACHABLE).all())
+    
+    def next_tiles(self, tile_x, tile_y):
+        """Próximo tile do caminho até o alvo para cada tile dos arrays tile_x, tile_y
+        
+        Retorna (próximo x, próximo y, máscara dos tiles que têm um próximo passo).
+        Tiles fora da janela, inalcançáveis ou já no alvo não têm próximo passo.
+        """
+        # Posições na janela com borda
+        local_x = np.asarray(tile_x, dtype=np.intp) - self.left + 1
+        local_y = np.asarray(tile_y, dtype=np.intp) - self.top + 1
+        inside = (local_x >= 1) & (local_x <= self.width) & (local_y >= 1) & (local_y <= self.height)
+        local_x = np.where(inside, local_x, 1)
+        local_y = np.where(inside, local_y, 1)
+        
+        own = self.padded[local_y, local_x]
+        neighbours = np.stack([self.padded[local_y + dy, local_x + dx] for dx, dy in NEIGHBOURS])
+        best = neighbours.argmin(axis=0)
+        valid = inside & (own != UNREACHABLE) & (neighbours.min(axis=0) < own)
+        
+        offsets = np.array(NEIGHBOURS, dtype=np.intp)
+        next_x = np.asarray(tile_x, dtype=np.intp) + offsets[best, 0]
+        next_y = np.asarray(tile_y, dtype=np.intp) + offsets[best, 1]
+        return next_x, next_y, valid
+
+class Pathfinder:
+    # Número máximo de caminhos A* mantidos em cache
+    MAX_CACHED_PATHS = 256
+    
+    # Número máximo de tiles visitados por uma busca A* (evita travar em mapas enormes)
+    MAX_SEARCH_NODES = 50000
+    
+    def __init__(self, game_map):
+        self.map = game_map
+        
+        # Último campo de fluxo calculado (reaproveitado enquanto o alvo não muda de tile
+        # e a busca já alcançou os tiles de quem o segue)
+        self.field = None
+        
+        # (início, destino) -> lista de tiles do caminho (ou None), em ordem de uso (LRU)
+        self.paths = OrderedDict()
+        
+        # Estatísticas de uso
+        self.field_builds = 0
+    
+    def invalidate(self):
+        """Descarta o campo de fluxo e os caminhos calculados (chamado quando um tile muda)"""
+        self.field = None
+        self.paths.clear()
+    
+    def is_passable(self, x, y):
+        """Verifica se o tile (x, y) está dentro do mapa e não é sólido nem ocupado por um objeto com colisão"""
+        game_map = self.map
+        return 0 <= x < game_map.width and 0 <= y < game_map.height and not game_map.blocking[y * game_map.width + x]
+    
+    def flow_field(self, target, radius, sources=None):
+        """Campo de fluxo até o tile target, cobrindo pelo menos radius tiles em volta dele
+        
+        sources são os tiles (arrays tile_x, tile_y) de quem vai seguir o campo; com eles, a
+        busca para assim que todos são alcançados. Sem sources, a janela inteira é percorrida.
+        """
+        target_x, target_y = target
+        left = max(0, target_x - radius)
+        top = max(0, target_y - radius)
+        right = min(self.map.width - 1, target_x + radius)
+        bottom = min(self.map.height - 1, target_y + radius)
+        
+        if self.field is None or not self.field.covers(target, left, top, right, bottom, sources):
+            self.field = self._build_field(target, left, top, right, bottom, sources)
+        return self.field
+    
+    def _build_field(self, target, left, top, right, bottom, sources=None):
+        """Busca em largura a partir do alvo, restrita à janela informada (e aos tiles sources, se houver)"""
+        self.field_builds += 1
+        width = right - left + 1
+        height = bottom - top + 1
+        distance = np.full((height, width), UNREACHABLE, dtype=np.int32)
+        complete = True
+        
+        target_x, target_y = target
+        if left <= target_x <= right and top <= target_y <= bottom and self.is_passable(target_x, target_y):
+            blocking = self.map.blocking
+            map_width = self.map.width
+            steps = [UNREACHABLE] * (width * height)
+            start = (target_y - top) * width + (target_x - left)
+            steps[start] = 0
+            
+            # Tiles (índices na janela) que a busca ainda precisa alcançar
+            pending = None
+            if sources is not None:
+                pending = {
+                    (source_y - top) * width + (source_x - left)
+                    for source_x, source_y in zip(sources[0].tolist(), sources[1].tolist())
+                    if left <= source_x <= right and top <= source_y <= bottom
+                }
+                pending.discard(start)
+            
+            queue = deque([(target_x, target_y)])
+            while queue:
+                if pending is not None and not pending:
+                    # Todos já têm caminho: o resto da janela não é necessário
+                    complete = False
+                    break
+                x, y = queue.popleft()
+                next_step = steps[(y - top) * width + (x - left)] + 1
+                for dx, dy in NEIGHBOURS:
+                    nx, ny = x + dx, y + dy
+                    if not (left <= nx <= right and top <= ny <= bottom):
+                        continue
+                    index = (ny - top) * width + (nx - left)
+                    if steps[index] != UNREACHABLE or blocking[ny * map_width + nx]:
+                        continue
+                    steps[index] = next_step
+                    queue.append((nx, ny))
+                    if pending is not None:
+                        pending.discard(index)
+            distance = np.array(steps, dtype=np.int32).reshape(height, width)
+        
+        return FlowField(target, left, top, distance, complete)
+    
+    def find_path(self, start, goal):
+        """Caminho de start até goal (tiles), com A*; retorna a lista de tiles ou None
+        
+        O caminho inclui start e goal. Os resultados ficam em cache até algum tile mudar.
+        """
+        key = (tuple(start), tuple(goal))
+        if key in self.paths:
+            self.paths.move_to_end(key)
+            path = self.paths[key]
+            return list(path) if path is not None else None
+        
+        path = self._search(key[0], key[1])
+        self.paths[key] = path
+        while len(self.paths) > self.MAX_CACHED_PATHS:
+            self.paths.popitem(last=False)
+        return list(path) if path is not None else None
+    
+    def _search(self, start, goal):
+        """A* em quatro direções com a distância de Manhattan como heurística"""
+        # O início pode ser a célula do próprio objeto que vai andar (um NPC, que tem colisão)
+        start_x, start_y = start
+        game_map = self.map
+        if not (0 <= start_x < game_map.width and 0 <= start_y < game_map.height):
+            return None
+        if game_map.solid[start_y * game_map.width + start_x] or not self.is_passable(*goal):
+            return None
+        
+        goal_x, goal_y = goal
+        came_from = {start: None}
+        cost = {start: 0}
+        queue = [(abs(start[0] - goal_x) + abs(start[1] - goal_y), 0, start)]
+        
+        while queue and len(came_from) <= self.MAX_SEARCH_NODES:
+            _, current_cost, current = heapq.heappop(queue)
+            if current == goal:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = came_from[current]
+                path.reverse()
+                return path
+            if current_cost > cost[current]:
+                continue
+            
+            x, y = current
+            for dx, dy in NEIGHBOURS:
+                neighbour = (x + dx, y + dy)
+                new_cost = current_cost + 1
+                if new_cost >= cost.get(neighbour, UNREACHABLE) or not self.is_passable(*neighbour):
+                    continue
+                cost[neighbour] = new_cost
+                came_from[neighbour] = current
+                estimate = new_cost + abs(neighbour[0] - goal_x) + abs(neighbour[1] - goal_y)
+                heapq.heappush(queue, (estimate, new_cost, neighbour))
+        
+        return None
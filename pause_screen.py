@@ -3,14 +3,16 @@
 
 import pygame
 
+from text_cache import text_cache
+
 class PauseScreen:
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
         
-        # Fonte para textos
-        self.title_font = pygame.font.SysFont(None, 72)
-        self.font = pygame.font.SysFont(None, 36)
+        # Tamanhos das fontes (fontes e textos renderizados ficam no cache compartilhado)
+        self.title_font_size = 72
+        self.font_size = 36
         
         # Botões
         self.buttons = [
@@ -59,7 +61,7 @@ class PauseScreen:
         screen.blit(self.overlay, (0, 0))
         
         # Título
-        title_text = self.title_font.render("Jogo Pausado", True, (255, 255, 255))
+        title_text = text_cache.render("Jogo Pausado", (255, 255, 255), self.title_font_size)
         title_rect = title_text.get_rect(center=(self.screen_width // 2, 150))
         screen.blit(title_text, title_rect)
         
@@ -81,11 +83,11 @@ class PauseScreen:
             pygame.draw.rect(screen, color, button_rect, border_radius=10)
             
             # Texto do botão
-            button_text = self.font.render(button["text"], True, self.button_text_color)
+            button_text = text_cache.render(button["text"], self.button_text_color, self.font_size)
             text_rect = button_text.get_rect(center=button_rect.center)
             screen.blit(button_text, text_rect)
         
         # Instruções
-        instructions_text = self.font.render("Use as setas para selecionar e ENTER para confirmar", True, (200, 200, 200))
+        instructions_text = text_cache.render("Use as setas para selecionar e ENTER para confirmar", (200, 200, 200), self.font_size)
         instructions_rect = instructions_text.get_rect(center=(self.screen_width // 2, self.screen_height - 100))
         screen.blit(instructions_text, instructions_rect) 
\ No newline at end of file
@@ -5,9 +5,12 @@ import pygame
 import math
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, x, y, character_data=None):
+    def __init__(self, x, y, character_data=None, input_source=None):
         super().__init__()
         
+        # Fonte das teclas pressionadas (None = teclado)
+        self.input_source = input_source
+        
         # Dados do personagem
         if character_data is None:
             # Personagem padrão
@@ -31,6 +34,9 @@ class Player(pygame.sprite.Sprite):
         # A hitbox é o próprio retângulo do sprite
         self.hitbox = self.rect
         
+        # Posição no início do tick atual, para interpolar a renderização
+        self.previous_position = self.rect.topleft
+        
         # Vetores de velocidade
         self.velocity = pygame.math.Vector2(0, 0)
         
@@ -42,7 +48,7 @@ class Player(pygame.sprite.Sprite):
         
         # Contador para limitar a frequência dos logs
         self.stuck_log_counter = 0
-        self.stuck_log_frequency = 60  # Só mostra log a cada 60 frames (aproximadamente 1 segundo)
+        self.stuck_log_frequency = 60  # Só mostra log a cada 60 ticks (aproximadamente 1 segundo)
     
     def update(self):
         """Atualiza a posição do jogador com base nos controles"""
@@ -50,7 +56,10 @@ class Player(pygame.sprite.Sprite):
         self.velocity = pygame.math.Vector2(0, 0)
         
         # Obtém as teclas pressionadas
-        keys = pygame.key.get_pressed()
+        if self.input_source is not None:
+            keys = self.input_source.get_pressed()
+        else:
+            keys = pygame.key.get_pressed()
         
         # Movimento horizontal
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
@@ -92,6 +101,16 @@ class Player(pygame.sprite.Sprite):
         self.rect.x = x
         self.rect.y = y
         self.update_hitbox()
+        
+        # Teletransporte: não interpola a partir da posição antiga
+        self.previous_position = self.rect.topleft
+    
+    def interpolated_rect(self, alpha):
+        """Retorna o retângulo do jogador entre a posição do tick anterior (alpha=0) e a atual (alpha=1)"""
+        previous_x, previous_y = self.previous_position
+        x = round(previous_x + (self.rect.x - previous_x) * alpha)
+        y = round(previous_y + (self.rect.y - previous_y) * alpha)
+        return self.rect.move(x - self.rect.x, y - self.rect.y)
     
     def constrain_to_map(self, map_width, map_height):
         """Impede que o jogador saia dos limites do mapa"""
@@ -110,18 +129,39 @@ class Player(pygame.sprite.Sprite):
         # A hitbox é o próprio retângulo do sprite
         self.hitbox = self.rect
     
-    def draw_hitbox(self, screen):
+    def draw_hitbox(self, screen, camera=None, alpha=1.0):
         """Desenha a hitbox do jogador para depuração"""
+        # Acompanha a posição interpolada do sprite
+        offset_rect = self.interpolated_rect(alpha)
+        hitbox = self.hitbox.move(offset_rect.x - self.rect.x, offset_rect.y - self.rect.y)
+        
+        # Converte a hitbox para coordenadas da tela, se houver câmera
+        hitbox = camera.apply(hitbox) if camera is not None else hitbox
+        
         # Desenha um retângulo vermelho semi-transparente para representar a hitbox
-        hitbox_surface = pygame.Surface((self.hitbox.width, self.hitbox.height), pygame.SRCALPHA)
+        hitbox_surface = pygame.Surface((hitbox.width, hitbox.height), pygame.SRCALPHA)
         hitbox_surface.fill((255, 0, 0, 128))  # Vermelho semi-transparente
-        screen.blit(hitbox_surface, self.hitbox.topleft)
+        screen.blit(hitbox_surface, hitbox.topleft)
         
         # Desenha a borda da hitbox
-        pygame.draw.rect(screen, (255, 0, 0), self.hitbox, 1)
+        pygame.draw.rect(screen, (255, 0, 0), hitbox, 1)
     
-    def move_with_collision(self, collision_rects):
-        """Move o jogador considerando colisões"""
+    def _find_collisions(self, colliders, swept_rect):
+        """Retorna os retângulos candidatos a colisão na área varrida pelo movimento"""
+        # Índices espaciais (Map ou SpatialGrid) consultam apenas as células próximas
+        if hasattr(colliders, "query_collisions"):
+            return colliders.query_collisions(swept_rect)
+        if hasattr(colliders, "query_rects"):
+            return colliders.query_rects(swept_rect)
+        
+        # Lista simples de retângulos: verifica todos
+        return [rect for rect in colliders if swept_rect.colliderect(rect)]
+    
+    def move_with_collision(self, colliders):
+        """Move o jogador considerando colisões
+        
+        colliders pode ser o mapa (query_collisions), uma SpatialGrid ou uma lista de retângulos.
+        """
         # Guarda a posição original
         original_x = self.rect.x
         original_y = self.rect.y
@@ -132,38 +172,36 @@ class Player(pygame.sprite.Sprite):
         # 1. Movimento horizontal
         if self.velocity.x != 0:
             # Tenta mover horizontalmente
+            start_rect = self.rect.copy()
             self.rect.x += self.velocity.x
             
-            # Verifica colisões horizontais
-            horizontal_collision = False
-            for rect in collision_rects:
-                if self.rect.colliderect(rect):
-                    horizontal_collision = True
-                    collision_detected = True
-                    # Ajusta a posição para evitar sobreposição
-                    if self.velocity.x > 0:  # Movendo para a direita
-                        self.rect.right = rect.left
-                    else:  # Movendo para a esquerda
-                        self.rect.left = rect.right
-                    break
+            # Verifica colisões horizontais apenas na área varrida pelo movimento
+            candidates = self._find_collisions(colliders, start_rect.union(self.rect))
+            blocking = [rect for rect in candidates if self.rect.colliderect(rect)]
+            if blocking:
+                collision_detected = True
+                # Ajusta a posição para encostar no obstáculo mais próximo
+                if self.velocity.x > 0:  # Movendo para a direita
+                    self.rect.right = min(rect.left for rect in blocking)
+                else:  # Movendo para a esquerda
+                    self.rect.left = max(rect.right for rect in blocking)
         
         # 2. Movimento vertical
         if self.velocity.y != 0:
             # Tenta mover verticalmente
+            start_rect = self.rect.copy()
             self.rect.y += self.velocity.y
             
-            # Verifica colisões verticais
-            vertical_collision = False
-            for rect in collision_rects:
-                if self.rect.colliderect(rect):
-                    vertical_collision = True
-                    collision_detected = True
-                    # Ajusta a posição para evitar sobreposição
-                    if self.velocity.y > 0:  # Movendo para baixo
-                        self.rect.bottom = rect.top
-                    else:  # Movendo para cima
-                        self.rect.top = rect.bottom
-                    break
+            # Verifica colisões verticais apenas na área varrida pelo movimento
+            candidates = self._find_collisions(colliders, start_rect.union(self.rect))
+            blocking = [rect for rect in candidates if self.rect.colliderect(rect)]
+            if blocking:
+                collision_detected = True
+                # Ajusta a posição para encostar no obstáculo mais próximo
+                if self.velocity.y > 0:  # Movendo para baixo
+                    self.rect.bottom = min(rect.top for rect in blocking)
+                else:  # Movendo para cima
+                    self.rect.top = max(rect.bottom for rect in blocking)
         
         # Verifica se o jogador está completamente preso (não consegue se mover em nenhuma direção)
         if collision_detected and self.velocity.length() > 0:
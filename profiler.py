@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+
+import pygame
+
+from text_cache import text_cache
+
+class FrameProfiler:
+    # Tamanho do painel de desempenho, em pixels
+    OVERLAY_WIDTH = 300
+    GRAPH_HEIGHT = 60
+    
+    # Referências desenhadas no gráfico (60 e 30 quadros por segundo), em ms
+    GRAPH_MARKS = (1000 / 60, 1000 / 30)
+    
+    def __init__(self, capacity=600):
+        # Número de quadros mantidos no buffer circular
+        self.capacity = capacity
+        
+        # Seção -> buffer circular com a duração da seção em cada quadro (em segundos)
+        self.buffers = {"frame": array("d", [0.0] * capacity)}
+        
+        # Ordem em que as seções apareceram (para o painel e o arquivo)
+        self.section_names = ["frame"]
+        
+        # Próxima posição do buffer e número de quadros válidos nele
+        self.index = 0
+        self.count = 0
+        
+        # Durações acumuladas no quadro atual
+        self.current = {}
+        self.frame_start = None
+        
+        # Totais da sessão inteira: seção -> [quadros, soma, máximo]
+        self.session = {}
+        self.session_start = time.time()
+    
+    def begin_frame(self):
+        """Marca o início de um quadro"""
+        self.current = {}
+        self.frame_start = time.perf_counter()
+    
+    def end_frame(self):
+        """Marca o fim do quadro, gravando as durações no buffer circular"""
+        if self.frame_start is None:
+            return
+        self.current["frame"] = time.perf_counter() - self.frame_start
+        self.frame_start = None
+        
+        for name, seconds in self.current.items():
+            if name not in self.buffers:
+                self.buffers[name] = array("d", [0.0] * self.capacity)
+                self.section_names.append(name)
+            
+            totals = self.session.setdefault(name, [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+        
+        # Seções que não rodaram neste quadro ficam com zero
+        for name, buffer in self.buffers.items():
+            buffer[self.index] = self.current.get(name, 0.0)
+        
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+    
+    def add(self, name, seconds):
+        """Soma uma duração à seção no quadro atual"""
+        self.current[name] = self.current.get(name, 0.0) + seconds
+    
+    @contextmanager
+    def section(self, name):
+        """Mede o bloco de código como parte da seção informada"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+    
+    def values(self, name):
+        """Retorna as durações da seção nos quadros do buffer, do mais antigo ao mais recente"""
+        buffer = self.buffers.get(name)
+        if buffer is None or self.count == 0:
+            return []
+        if self.count < self.capacity:
+            return list(buffer[:self.count])
+        return list(buffer[self.index:]) + list(buffer[:self.index])
+    
+    def stats(self, name):
+        """Retorna média, p50, p95, p99 e máximo da seção no buffer, em ms (None se vazia)"""
+        values = self.values(name)
+        if not values:
+            return None
+        ordered = sorted(values)
+        last = len(ordered) - 1
+        
+        def percentile(fraction):
+            return ordered[int(round(fraction * last))] * 1000
+        
+        return {
+            "mean": sum(ordered) / len(ordered) * 1000,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": ordered[-1] * 1000
+        }
+    
+    def build_overlay(self):
+        """Monta o painel com o gráfico do tempo de quadro e os percentis de cada seção"""
+        line_height = 16
+        height = self.GRAPH_HEIGHT + 24 + line_height * len(self.section_names)
+        surface = pygame.Surface((self.OVERLAY_WIDTH, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 180))
+        
+        # Gráfico do tempo de cada quadro; a escala vai até 2x o limite de 30 FPS
+        frames = self.values("frame")
+        scale_ms = self.GRAPH_MARKS[-1] * 2
+        graph_top = 4
+        for mark in self.GRAPH_MARKS:
+            y = graph_top + self.GRAPH_HEIGHT - int(mark / scale_ms * self.GRAPH_HEIGHT)
+            pygame.draw.line(surface, (90, 90, 90), (0, y), (self.OVERLAY_WIDTH, y))
+        
+        visible = frames[-self.OVERLAY_WIDTH:]
+        start_x = self.OVERLAY_WIDTH - len(visible)
+        for i, seconds in enumerate(visible):
+            ms = seconds * 1000
+            bar = min(self.GRAPH_HEIGHT, int(ms / scale_ms * self.GRAPH_HEIGHT))
+            if ms <= self.GRAPH_MARKS[0]:
+                color = (0, 200, 0)
+            elif ms <= self.GRAPH_MARKS[1]:
+                color = (230, 200, 0)
+            else:
+                color = (230, 0, 0)
+            x = start_x + i
+            pygame.draw.line(surface, color, (x, graph_top + self.GRAPH_HEIGHT), (x, graph_top + self.GRAPH_HEIGHT - bar))
+        
+        # Percentis por seção (os textos mudam a cada quadro, então não vão para o cache)
+        font = text_cache.get_font("monospace", 15)
+        y = graph_top + self.GRAPH_HEIGHT + 4
+        header = font.render("seção          média    p50    p95    p99    máx (ms)", True, (200, 200, 200))
+        surface.blit(header, (4, y))
+        y += line_height + 2
+        for name in self.section_names:
+            stats = self.stats(name)
+            if stats is None:
+                continue
+            text = (f"{name:<14} {stats['mean']:6.2f} {stats['p50']:6.2f} {stats['p95']:6.2f} "
+                    f"{stats['p99']:6.2f} {stats['max']:6.2f}")
+            surface.blit(font.render(text, True, (255, 255, 255)), (4, y))
+            y += line_height
+        
+        return surface
+    
+    def dump(self, path):
+        """Grava em JSON os quadros do buffer e os totais da sessão"""
+        session = {}
+        for name, (frames, total, maximum) in self.session.items():
+            session[name] = {
+                "frames": frames,
+                "mean_ms": total / frames * 1000 if frames else 0.0,
+                "max_ms": maximum * 1000
+            }
+        
+        report = {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.session_start)),
+            "duration_seconds": time.time() - self.session_start,
+            "session": session,
+            "recent": {name: self.stats(name) for name in self.section_names if self.count},
+            "frames_ms": {name: [round(value * 1000, 4) for value in self.values(name)] for name in self.section_names}
+        }
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"Perfil de desempenho gravado em {path}")
+        except OSError as e:
+            print(f"Erro: Não foi possível gravar o perfil de desempenho em {path}: {e}")
+
+class StartupTimer:
+    def __init__(self):
+        # Referência dos tempos: criação do relógio (importação deste módulo pelo main.py)
+        self.start = time.perf_counter()
+        
+        # Etapas medidas: (nome, início, duração, thread), em segundos desde a referência
+        self.stages = []
+        
+        # As etapas do carregamento em segundo plano são gravadas por outra thread
+        self.lock = threading.Lock()
+    
+    def record(self, name, begin, end):
+        """Grava uma etapa que começou e terminou nos instantes informados (perf_counter)"""
+        with self.lock:
+            self.stages.append((name, begin - self.start, end - begin, threading.current_thread().name))
+    
+    @contextmanager
+    def stage(self, name):
+        """Mede o bloco de código como uma etapa da inicialização"""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, begin, time.perf_counter())
+    
+    def mark(self, name):
+        """Grava um marco da inicialização (etapa sem duração, como o primeiro quadro)"""
+        now = time.perf_counter()
+        self.record(name, now, now)
+    
+    def elapsed(self):
+        """Tempo desde a referência, em segundos"""
+        return time.perf_counter() - self.start
+    
+    def report(self):
+        """Retorna o relatório das etapas, em ordem de início"""
+        with self.lock:
+            stages = sorted(self.stages, key=lambda stage: stage[1])
+        
+        lines = ["Inicialização (ms desde o início do processo):",
+                 f"  {'etapa':<24} {'início':>8} {'duração':>8}  thread"]
+        for name, begin, duration, thread in stages:
+            lines.append(f"  {name:<24} {begin * 1000:8.1f} {duration * 1000:8.1f}  {thread}")
+        return "\n".join(lines)
+
+# Relógio das etapas de inicialização do processo
+startup_timer = StartupTimer()
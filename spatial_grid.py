@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+class SpatialGrid:
+    def __init__(self, cell_size=32):
+        # Tamanho de cada célula da grade, em pixels (normalmente o tamanho do tile)
+        self.cell_size = cell_size
+        
+        # Dicionário (célula x, célula y) -> lista de (retângulo, item)
+        self.cells = {}
+    
+    def _cell_range(self, rect):
+        """Retorna o intervalo de células coberto por um retângulo"""
+        first_x = rect.left // self.cell_size
+        first_y = rect.top // self.cell_size
+        last_x = (rect.right - 1) // self.cell_size
+        last_y = (rect.bottom - 1) // self.cell_size
+        return first_x, first_y, last_x, last_y
+    
+    def insert(self, rect, item=None):
+        """Adiciona um retângulo (e um item associado) a todas as células que ele cobre"""
+        if item is None:
+            item = rect
+        first_x, first_y, last_x, last_y = self._cell_range(rect)
+        for cy in range(first_y, last_y + 1):
+            for cx in range(first_x, last_x + 1):
+                self.cells.setdefault((cx, cy), []).append((rect, item))
+    
+    def remove(self, rect, item=None):
+        """Remove um retângulo (e o item associado) da grade"""
+        if item is None:
+            item = rect
+        first_x, first_y, last_x, last_y = self._cell_range(rect)
+        for cy in range(first_y, last_y + 1):
+            for cx in range(first_x, last_x + 1):
+                entries = self.cells.get((cx, cy))
+                if not entries:
+                    continue
+                entries[:] = [entry for entry in entries if entry[1] is not item]
+                if not entries:
+                    del self.cells[(cx, cy)]
+    
+    def clear(self):
+        """Remove todos os itens da grade"""
+        self.cells.clear()
+    
+    def query(self, rect):
+        """Retorna os itens cujos retângulos colidem com o retângulo informado"""
+        found = []
+        seen = set()
+        first_x, first_y, last_x, last_y = self._cell_range(rect)
+        for cy in range(first_y, last_y + 1):
+            for cx in range(first_x, last_x + 1):
+                for entry_rect, item in self.cells.get((cx, cy), ()):
+                    # Um mesmo item pode estar em várias células
+                    if id(item) in seen:
+                        continue
+                    if rect.colliderect(entry_rect):
+                        seen.add(id(item))
+                        found.append(item)
+        return found
+    
+    def query_rects(self, rect):
+        """Retorna os retângulos que colidem com o retângulo informado"""
+        found = []
+        seen = set()
+        first_x, first_y, last_x, last_y = self._cell_range(rect)
+        for cy in range(first_y, last_y + 1):
+            for cx in range(first_x, last_x + 1):
+                for entry_rect, item in self.cells.get((cx, cy), ()):
+                    if id(entry_rect) in seen:
+                        continue
+                    if rect.colliderect(entry_rect):
+                        seen.add(id(entry_rect))
+                        found.append(entry_rect)
+        return found
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Carregamento do mapa inicial em segundo plano.
+#
+# A janela e a tela de título aparecem antes de o mapa inicial existir: uma
+# thread lê a tabela de tipos de tile, monta o mapa e carrega as imagens e os
+# sons que ele usa, enquanto o jogador está nos menus. O progresso pode ser
+# consultado a cada quadro; wait() bloqueia até o fim (usado quando o jogo
+# começa antes de o carregamento terminar). Cada etapa é gravada no relógio
+# de inicialização.
+
+import threading
+
+from map import Map
+from profiler import startup_timer
+from tile_types import get_tile_types
+
+class StartupLoader:
+    # Peso de cada etapa no progresso (os assets contam um tipo de tile por vez)
+    STAGE_WEIGHTS = {"tile_types": 0.1, "map": 0.5, "assets": 0.4}
+    
+    def __init__(self, map_id, seed=None):
+        self.map_id = map_id
+        self.seed = seed
+        
+        # Mapa carregado (ou None até o fim) e o erro, se a thread falhar
+        self.map = None
+        self.error = None
+        
+        # Etapa atual e fração concluída (lidas pela thread principal)
+        self.label = "Iniciando"
+        self.fraction = 0.0
+        
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="startup-loader", daemon=True)
+    
+    def start(self):
+        """Inicia o carregamento em segundo plano"""
+        self.thread.start()
+    
+    def _set_progress(self, label, fraction):
+        with self.lock:
+            self.label = label
+            self.fraction = fraction
+    
+    def _run(self):
+        """Etapas do carregamento (executado na thread de carregamento)"""
+        weights = self.STAGE_WEIGHTS
+        try:
+            self._set_progress("Lendo os tipos de tile", 0.0)
+            with startup_timer.stage("tile_types"):
+                get_tile_types()
+            
+            self._set_progress("Carregando o mapa", weights["tile_types"])
+            with startup_timer.stage(f"map.{self.map_id}"):
+                game_map = Map(self.map_id, seed=self.seed)
+            
+            done = weights["tile_types"] + weights["map"]
+            self._set_progress("Carregando imagens e sons", done)
+            with startup_timer.stage("assets"):
+                game_map.preload_assets(
+                    lambda loaded, total: self._set_progress("Carregando imagens e sons",
+                                                             done + weights["assets"] * loaded / total)
+                )
+            
+            self.map = game_map
+            self._set_progress("Pronto", 1.0)
+        except Exception as e:
+            print(f"Erro ao carregar o mapa inicial em segundo plano: {e}")
+            self.error = e
+        finally:
+            self.finished.set()
+    
+    def progress(self):
+        """Retorna (etapa atual, fração concluída de 0 a 1)"""
+        with self.lock:
+            return self.label, self.fraction
+    
+    def done(self):
+        """Verifica se o carregamento terminou (com ou sem sucesso)"""
+        return self.finished.is_set()
+    
+    def wait(self):
+        """Espera o fim do carregamento e retorna o mapa
+        
+        Se a thread falhou, o mapa é carregado agora, na thread principal.
+        """
+        self.finished.wait()
+        if self.map is None:
+            with startup_timer.stage(f"map.{self.map_id}"):
+                self.map = Map(self.map_id, seed=self.seed)
+        return self.map
@@ -0,0 +1,24 @@
+import unittest
+
+from map_compiler import INVALID_TILE, build_tile_grid
+
+
+class BuildTileGridTest(unittest.TestCase):
+    def test_valor_fora_de_faixa_nao_duplica_linha(self):
+        rows = [
+            [1, 0, 0, 1],
+            [1, 70000, 0, 1],
+        ]
+        tiles = build_tile_grid(rows, 4, 2, "teste")
+        
+        self.assertEqual(len(tiles), 8)
+        self.assertEqual(list(tiles), [1, 0, 0, 1, 1, INVALID_TILE, 0, 1])
+    
+    def test_valor_nao_inteiro_vira_invalido(self):
+        tiles = build_tile_grid([[0, "x"]], 2, 1, "teste")
+        
+        self.assertEqual(list(tiles), [0, INVALID_TILE])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+from collections import OrderedDict
+
+import pygame
+
+class TextCache:
+    def __init__(self, max_surfaces=256):
+        # (nome da fonte, tamanho) -> pygame.font.Font, criadas uma única vez
+        self.fonts = {}
+        
+        # (fonte, texto, cor, antialias) -> superfície renderizada, em ordem de uso (LRU)
+        self.surfaces = OrderedDict()
+        self.max_surfaces = max_surfaces
+        
+        # Fontes e textos também são usados pelas threads que preparam mapas
+        # (reentrante: render e size chamam get_font com a trava)
+        self.lock = threading.RLock()
+    
+    def get_font(self, name=None, size=24):
+        """Retorna a fonte do sistema com o nome e tamanho informados (None = fonte padrão)"""
+        key = (name, size)
+        with self.lock:
+            font = self.fonts.get(key)
+            if font is None:
+                font = pygame.font.SysFont(name, size)
+                self.fonts[key] = font
+            return font
+    
+    def render(self, text, color, size=24, name=None, antialias=True):
+        """Renderiza um texto, reaproveitando a superfície se ele já foi renderizado antes"""
+        key = (name, size, text, tuple(color), antialias)
+        with self.lock:
+            surface = self.surfaces.get(key)
+            if surface is not None:
+                self.surfaces.move_to_end(key)
+                return surface
+            
+            # A renderização fica sob a trava: a mesma fonte não é usada por duas threads ao mesmo tempo
+            surface = self.get_font(name, size).render(text, antialias, color)
+            self.surfaces[key] = surface
+            
+            # Descarta os textos usados há mais tempo
+            while len(self.surfaces) > self.max_surfaces:
+                self.surfaces.popitem(last=False)
+            return surface
+    
+    def size(self, text, size=24, name=None):
+        """Mede um texto sem renderizá-lo"""
+        with self.lock:
+            return self.get_font(name, size).size(text)
+    
+    def clear(self):
+        """Remove todos os textos renderizados do cache"""
+        with self.lock:
+            self.surfaces.clear()
+
+# Cache compartilhado por todas as telas do jogo
+text_cache = TextCache()
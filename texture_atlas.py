@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+import sys
+import threading
+
+import pygame
+
+# Diretório base das imagens e local do atlas gerado
+IMAGES_DIR = "assets/images"
+ATLAS_DIR = os.path.join(IMAGES_DIR, "atlas")
+ATLAS_INDEX = os.path.join(ATLAS_DIR, "atlas.json")
+
+# Versão do índice (2: tamanho, data e hash do PNG de origem de cada sprite)
+INDEX_VERSION = 2
+
+# Tamanho máximo de cada folha do atlas e espaçamento entre sprites
+MAX_SHEET_SIZE = 1024
+PADDING = 1
+
+def _find_sprites(images_dir):
+    """Lista os PNGs do diretório de imagens (caminhos relativos, com '/')"""
+    sprites = []
+    for root, dirs, files in os.walk(images_dir):
+        # Não inclui o próprio atlas
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != os.path.join(images_dir, "atlas"))
+        for name in sorted(files):
+            if name.lower().endswith(".png"):
+                full_path = os.path.join(root, name)
+                sprites.append(os.path.relpath(full_path, images_dir).replace(os.sep, "/"))
+    return sprites
+
+def _file_hash(path):
+    """Hash do conteúdo de um arquivo"""
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def _source_info(path):
+    """Tamanho, data de modificação e hash do PNG de origem de um sprite"""
+    stat = os.stat(path)
+    return {"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns, "source_hash": _file_hash(path)}
+
+def _pack(sizes, max_size=MAX_SHEET_SIZE, padding=PADDING):
+    """Empacota retângulos em prateleiras (shelf packing).
+    
+    Recebe {nome: (largura, altura)} e retorna ({nome: (folha, x, y)}, [(largura, altura) de cada folha]).
+    """
+    placements = {}
+    sheets = []
+    sheet = x = y = shelf_height = used_width = 0
+    
+    # Sprites mais altos primeiro deixam as prateleiras mais cheias
+    for name in sorted(sizes, key=lambda n: (-sizes[n][1], -sizes[n][0], n)):
+        width, height = sizes[name]
+        
+        # Passa para a próxima prateleira
+        if x + width > max_size:
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        
+        # Passa para a próxima folha
+        if y + height > max_size:
+            sheets.append((used_width, y - padding if x == 0 else y + shelf_height))
+            sheet += 1
+            x = y = shelf_height = used_width = 0
+        
+        placements[name] = (sheet, x, y)
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+        used_width = max(used_width, x - padding)
+    
+    if placements:
+        sheets.append((used_width, y + shelf_height))
+    return placements, sheets
+
+def build_atlas(images_dir=IMAGES_DIR, atlas_dir=None):
+    """Empacota todos os sprites e quadros de animação em folhas de atlas com um índice JSON"""
+    if atlas_dir is None:
+        atlas_dir = os.path.join(images_dir, "atlas")
+    
+    # Carrega apenas os dados dos pixels; não é necessário abrir uma janela
+    images = {}
+    sources = {}
+    for relative_path in _find_sprites(images_dir):
+        try:
+            full_path = os.path.join(images_dir, relative_path)
+            images[relative_path] = pygame.image.load(full_path)
+            sources[relative_path] = _source_info(full_path)
+        except Exception as e:
+            print(f"Aviso: Não foi possível carregar {relative_path}: {e}")
+    
+    placements, sheet_sizes = _pack({name: image.get_size() for name, image in images.items()})
+    
+    os.makedirs(atlas_dir, exist_ok=True)
+    
+    # Remove folhas antigas que não serão mais usadas
+    for name in os.listdir(atlas_dir):
+        if name.startswith("atlas_") and name.endswith(".png"):
+            os.remove(os.path.join(atlas_dir, name))
+    
+    # Desenha cada folha
+    sheets = [pygame.Surface(size, pygame.SRCALPHA) for size in sheet_sizes]
+    for surface in sheets:
+        surface.fill((0, 0, 0, 0))
+    
+    sprites = {}
+    for name, (sheet, x, y) in placements.items():
+        image = images[name]
+        sheets[sheet].blit(image, (x, y))
+        sprites[name] = {"sheet": sheet, "rect": [x, y, image.get_width(), image.get_height()]}
+        sprites[name].update(sources[name])
+    
+    sheet_files = []
+    for index, surface in enumerate(sheets):
+        file_name = f"atlas_{index}.png"
+        pygame.image.save(surface, os.path.join(atlas_dir, file_name))
+        sheet_files.append(file_name)
+    
+    index_path = os.path.join(atlas_dir, "atlas.json")
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump({"version": INDEX_VERSION, "sheets": sheet_files, "sprites": sprites}, f, indent=2, sort_keys=True)
+    
+    print(f"Atlas gerado: {len(sprites)} sprites em {len(sheet_files)} folha(s) ({index_path})")
+    return index_path
+
+class TextureAtlas:
+    def __init__(self, index_path=ATLAS_INDEX, images_dir=None):
+        self.index_path = index_path
+        self.base_dir = os.path.dirname(index_path)
+        
+        # Diretório das imagens de origem (por padrão, o diretório acima do atlas)
+        self.images_dir = images_dir if images_dir is not None else os.path.dirname(self.base_dir)
+        
+        # Nome do sprite (relativo a assets/images) -> (folha, retângulo)
+        self.sprites = {}
+        self.sheet_files = []
+        
+        # Nome do sprite -> registro do PNG de origem quando o atlas foi gerado
+        self.sources = {}
+        
+        # Nome do sprite -> resultado da verificação do PNG de origem (feita uma vez por carga do atlas)
+        self.fresh = {}
+        
+        # Folhas carregadas sob demanda (as imagens podem ser carregadas em várias threads)
+        self.sheets = {}
+        self.sheets_lock = threading.Lock()
+        
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            self.sheet_files = index.get("sheets", [])
+            for name, info in index.get("sprites", {}).items():
+                self.sprites[name] = (info["sheet"], pygame.Rect(info["rect"]))
+                self.sources[name] = info
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Aviso: Índice do atlas inválido {index_path}: {e}")
+            self.sprites = {}
+    
+    def has(self, name):
+        """Verifica se o sprite está no atlas"""
+        return name in self.sprites
+    
+    def _get_sheet(self, sheet):
+        """Carrega (uma única vez) uma folha do atlas"""
+        with self.sheets_lock:
+            surface = self.sheets.get(sheet)
+            if surface is None:
+                surface = pygame.image.load(os.path.join(self.base_dir, self.sheet_files[sheet]))
+                if pygame.display.get_surface() is not None:
+                    surface = surface.convert_alpha()
+                self.sheets[sheet] = surface
+            return surface
+    
+    def is_fresh(self, name):
+        """Verifica se o PNG de origem do sprite não mudou desde a geração do atlas
+        
+        Como nos mapas compilados, sem o arquivo de origem o atlas é a única fonte.
+        Se só a data mudou (cópia, checkout do repositório), o hash do conteúdo decide.
+        O resultado fica guardado, então o stat/hash acontece uma vez por sprite.
+        """
+        fresh = self.fresh.get(name)
+        if fresh is None:
+            fresh = self.fresh[name] = self._check_source(name)
+            if not fresh:
+                print(f"Aviso: Sprite {name} desatualizado no atlas, usando o arquivo "
+                      f"(gere o atlas novamente com python texture_atlas.py)")
+        return fresh
+    
+    def _check_source(self, name):
+        """Compara o PNG de origem do sprite com o registro do índice"""
+        source = self.sources.get(name, {})
+        try:
+            stat = os.stat(os.path.join(self.images_dir, name))
+        except OSError:
+            return True
+        if stat.st_size != source.get("source_size"):
+            return False
+        if stat.st_mtime_ns == source.get("source_mtime_ns"):
+            return True
+        try:
+            return _file_hash(os.path.join(self.images_dir, name)) == source.get("source_hash")
+        except OSError:
+            return False
+    
+    def get(self, name):
+        """Retorna o sprite como subsuperfície da folha do atlas, ou None se não existir
+        
+        Também retorna None se o PNG de origem foi alterado depois da geração do atlas
+        (o chamador carrega então o arquivo do disco).
+        """
+        entry = self.sprites.get(name)
+        if entry is None or not self.is_fresh(name):
+            return None
+        sheet, rect = entry
+        try:
+            return self._get_sheet(sheet).subsurface(rect)
+        except Exception as e:
+            print(f"Aviso: Não foi possível ler {name} do atlas: {e}")
+            return None
+
+# Atlas compartilhado, carregado na primeira utilização
+_atlas = None
+_atlas_lock = threading.Lock()
+
+def get_atlas():
+    """Retorna o atlas de texturas do jogo (vazio se ainda não tiver sido gerado)"""
+    global _atlas
+    if _atlas is None:
+        # As imagens podem ser carregadas em várias threads; o atlas é criado uma única vez
+        with _atlas_lock:
+            if _atlas is None:
+                _atlas = TextureAtlas()
+    return _atlas
+
+if __name__ == "__main__":
+    # Uso: python texture_atlas.py [diretório de imagens]
+    build_atlas(sys.argv[1] if len(sys.argv) > 1 else IMAGES_DIR)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Tabela compilada dos tipos de tile de config/items.json.
+#
+# O arquivo é lido uma única vez por processo e "tile_types" é convertido em
+# tabelas densas indexadas pelo ID numérico do tipo: flags (colisão e
+# interação, também disponíveis como máscaras de bits), categoria, nome,
+# parâmetros de animação e os caminhos da imagem e do som (as chaves desses
+# assets no asset_cache). Os mapas, as entidades, as animações e o jogo
+# consultam esta tabela em vez dos dicionários aninhados do JSON.
+
+import json
+import os
+import sys
+import threading
+from array import array
+
+# Bits de TileTypes.flags
+COLLISION = 1
+INTERACTIVE = 2
+
+# Caminhos padrão da configuração e dos assets
+CONFIG_PATH = os.path.join("config", "items.json")
+IMAGES_DIR = "assets/images"
+SOUNDS_DIR = "assets/sounds"
+
+class TileTypes:
+    def __init__(self, config=None):
+        # Configuração original (para os campos usados raramente, como diálogos e drops)
+        self.config = config if config is not None else {"tile_types": {}}
+        tile_types = self.config.get("tile_types", {})
+        
+        # Tipos com ID numérico; o tamanho das tabelas é o maior ID + 1
+        entries = {int(key): info for key, info in tile_types.items() if key.isdigit()}
+        self.size = max(entries, default=0) + 1
+        size = self.size
+        
+        # ID -> configuração do tipo em items.json ({} para IDs sem tipo)
+        self.entries = [{}] * size
+        self.defined = bytearray(size)
+        
+        self.flags = bytearray(size)
+        self.names = [""] * size
+        self.categories = [""] * size
+        
+        # Animação: tipo ("none" sem animação), número de quadros e quadros por tick
+        self.animation_kinds = ["none"] * size
+        self.animation_frames = array("H", [0] * size)
+        self.animation_speeds = array("f", [0.0] * size)
+        
+        # Caminhos completos da imagem e do som de interação (None se não houver)
+        self.image_paths = [None] * size
+        self.sound_paths = [None] * size
+        
+        # Máscaras de bits: o bit id é 1 se o tipo colide / é interativo
+        self.collision_mask = 0
+        self.interactive_mask = 0
+        
+        for tile_id, info in entries.items():
+            details = info.get("details", {})
+            self.entries[tile_id] = info
+            self.defined[tile_id] = 1
+            self.names[tile_id] = info.get("name", "")
+            self.categories[tile_id] = sys.intern(info.get("type", ""))
+            
+            if info.get("collision", False):
+                self.flags[tile_id] |= COLLISION
+                self.collision_mask |= 1 << tile_id
+            
+            # NPCs e objetos com a propriedade interactive são interativos
+            if self.categories[tile_id] == "npc" or details.get("interactive", False):
+                self.flags[tile_id] |= INTERACTIVE
+                self.interactive_mask |= 1 << tile_id
+            
+            self.animation_kinds[tile_id] = sys.intern(details.get("animation", "none"))
+            self.animation_frames[tile_id] = max(0, min(0xFFFF, int(details.get("animation_frames", 0))))
+            self.animation_speeds[tile_id] = details.get("animation_speed", 0)
+            
+            if info.get("image"):
+                self.image_paths[tile_id] = os.path.join(IMAGES_DIR, info["image"])
+            if details.get("interaction_sound"):
+                self.sound_paths[tile_id] = os.path.join(SOUNDS_DIR, details["interaction_sound"])
+    
+    def __contains__(self, tile_id):
+        return 0 <= tile_id < self.size and bool(self.defined[tile_id])
+    
+    def ids(self):
+        """IDs de todos os tipos definidos, em ordem"""
+        return [tile_id for tile_id in range(self.size) if self.defined[tile_id]]
+    
+    def entry(self, tile_id):
+        """Configuração do tipo em items.json ({} se não existir)"""
+        return self.entries[tile_id] if 0 <= tile_id < self.size else {}
+    
+    def name(self, tile_id, default=""):
+        """Nome do tipo"""
+        if 0 <= tile_id < self.size and self.names[tile_id]:
+            return self.names[tile_id]
+        return default
+    
+    def category(self, tile_id):
+        """Categoria do tipo ("terreno", "objeto", "inimigo", "npc"...)"""
+        return self.categories[tile_id] if 0 <= tile_id < self.size else ""
+    
+    def collides(self, tile_id):
+        """Verifica se o tipo tem colisão"""
+        return 0 <= tile_id < self.size and bool(self.flags[tile_id] & COLLISION)
+    
+    def is_interactive(self, tile_id):
+        """Verifica se o jogador pode interagir com o tipo"""
+        return 0 <= tile_id < self.size and bool(self.flags[tile_id] & INTERACTIVE)
+    
+    def solid_lookup(self, size=0x10000):
+        """Tabela de size bytes: 1 para os tipos com colisão, 0 para os demais"""
+        lookup = bytearray(size)
+        count = min(size, self.size)
+        lookup[:count] = bytes(flag & COLLISION for flag in self.flags[:count])
+        return lookup
+
+def _load_config(path):
+    """Lê items.json; retorna uma configuração vazia se o arquivo não existir ou for inválido"""
+    if not os.path.exists(path):
+        print(f"Aviso: Arquivo de configuração de itens não encontrado: {path}")
+        return {"tile_types": {}}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Erro ao carregar configuração de itens: {e}")
+        return {"tile_types": {}}
+
+_tile_types = None
+_lock = threading.Lock()
+
+def get_tile_types():
+    """Retorna a tabela de tipos de tile do jogo (items.json é lido na primeira chamada)"""
+    global _tile_types
+    # Os mapas também são carregados em outras threads
+    with _lock:
+        if _tile_types is None:
+            _tile_types = TileTypes(_load_config(CONFIG_PATH))
+        return _tile_types
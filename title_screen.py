@@ -3,14 +3,16 @@
 
 import pygame
 
+from text_cache import text_cache
+
 class TitleScreen:
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
         
-        # Fonte para textos
-        self.title_font = pygame.font.SysFont(None, 72)
-        self.font = pygame.font.SysFont(None, 36)
+        # Tamanhos das fontes (fontes e textos renderizados ficam no cache compartilhado)
+        self.title_font_size = 72
+        self.font_size = 36
         
         # Botões
         self.buttons = [
@@ -33,6 +35,26 @@ class TitleScreen:
         self.button_hover_color = (150, 150, 150)
         self.button_text_color = (255, 255, 255)
         self.selected_color = (255, 255, 0)
+        
+        # Progresso do carregamento em segundo plano: (etapa, fração de 0 a 1), ou None se terminou
+        self.loading = None
+        self.loading_font_size = 24
+        self.loading_bar_width = 300
+        self.loading_bar_height = 8
+        self.loading_color = (0, 200, 0)
+    
+    def set_loading(self, loading):
+        """Atualiza o progresso do carregamento mostrado (None esconde a barra)
+        
+        Retorna True se o que é mostrado mudou (a tela precisa ser redesenhada).
+        """
+        if loading is not None:
+            label, fraction = loading
+            loading = (label, int(fraction * 100))
+        if loading == self.loading:
+            return False
+        self.loading = loading
+        return True
     
     def handle_event(self, event):
         """Processa eventos da tela de título"""
@@ -52,7 +74,7 @@ class TitleScreen:
         screen.fill((50, 50, 50))
         
         # Título
-        title_text = self.title_font.render("Jogo Top-Down", True, (255, 255, 255))
+        title_text = text_cache.render("Jogo Top-Down", (255, 255, 255), self.title_font_size)
         title_rect = title_text.get_rect(center=(self.screen_width // 2, 150))
         screen.blit(title_text, title_rect)
         
@@ -74,11 +96,28 @@ class TitleScreen:
             pygame.draw.rect(screen, color, button_rect, border_radius=10)
             
             # Texto do botão
-            button_text = self.font.render(button["text"], True, self.button_text_color)
+            button_text = text_cache.render(button["text"], self.button_text_color, self.font_size)
             text_rect = button_text.get_rect(center=button_rect.center)
             screen.blit(button_text, text_rect)
         
         # Instruções
-        instructions_text = self.font.render("Use as setas para selecionar e ENTER para confirmar", True, (200, 200, 200))
+        instructions_text = text_cache.render("Use as setas para selecionar e ENTER para confirmar", (200, 200, 200), self.font_size)
         instructions_rect = instructions_text.get_rect(center=(self.screen_width // 2, self.screen_height - 100))
-        screen.blit(instructions_text, instructions_rect) 
\ No newline at end of file
+        screen.blit(instructions_text, instructions_rect)
+        
+        # Progresso do carregamento do mapa, enquanto ele não termina
+        if self.loading is not None:
+            label, percent = self.loading
+            loading_text = text_cache.render(f"{label}... {percent}%", (200, 200, 200), self.loading_font_size)
+            loading_rect = loading_text.get_rect(center=(self.screen_width // 2, self.screen_height - 60))
+            screen.blit(loading_text, loading_rect)
+            
+            bar_rect = pygame.Rect(
+                (self.screen_width - self.loading_bar_width) // 2,
+                self.screen_height - 40,
+                self.loading_bar_width,
+                self.loading_bar_height
+            )
+            pygame.draw.rect(screen, self.button_color, bar_rect)
+            pygame.draw.rect(screen, self.loading_color,
+                             (bar_rect.x, bar_rect.y, bar_rect.width * percent // 100, bar_rect.height)) 
\ No newline at end of file
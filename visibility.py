@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Linha de visão entre tiles de um mapa.
+#
+# A linha entre dois tiles é traçada com o algoritmo de Bresenham sobre a
+# grade de solidez do mapa: há visão se nenhum tile sólido estiver entre a
+# origem e o destino (os próprios extremos não contam). O resultado de cada
+# par (origem, destino) fica memorizado até algum tile mudar de solidez.
+
+import numpy as np
+
+class Visibility:
+    # Número máximo de pares memorizados (ao ultrapassar, a memória é esvaziada)
+    MAX_CACHED_LINES = 65536
+    
+    def __init__(self, game_map):
+        self.map = game_map
+        
+        # (origem, destino) -> há linha de visão
+        self.lines = {}
+        
+        # Estatísticas de uso
+        self.hits = 0
+        self.misses = 0
+    
+    def invalidate(self):
+        """Esquece as linhas calculadas (chamado quando um tile muda de solidez)"""
+        self.lines.clear()
+    
+    def has_line_of_sight(self, source, target):
+        """Verifica se há linha de visão entre os tiles source e target"""
+        key = (source, target)
+        visible = self.lines.get(key)
+        if visible is not None:
+            self.hits += 1
+            return visible
+        
+        self.misses += 1
+        if len(self.lines) >= self.MAX_CACHED_LINES:
+            self.lines.clear()
+        visible = self._trace(source, target)
+        self.lines[key] = visible
+        return visible
+    
+    def _trace(self, source, target):
+        """Percorre os tiles entre source e target (Bresenham), parando no primeiro sólido"""
+        game_map = self.map
+        solid = game_map.solid
+        width, height = game_map.width, game_map.height
+        
+        x, y = source
+        target_x, target_y = target
+        dx = abs(target_x - x)
+        dy = -abs(target_y - y)
+        step_x = 1 if x < target_x else -1
+        step_y = 1 if y < target_y else -1
+        error = dx + dy
+        
+        while (x, y) != (target_x, target_y):
+            double_error = 2 * error
+            if double_error >= dy:
+                error += dy
+                x += step_x
+            if double_error <= dx:
+                error += dx
+                y += step_y
+            if (x, y) == (target_x, target_y):
+                break
+            if not (0 <= x < width and 0 <= y < height) or solid[y * width + x]:
+                return False
+        return True
+    
+    def visible_from(self, sources_x, sources_y, target):
+        """Máscara das origens (arrays de tiles) que têm linha de visão até o tile target"""
+        target = (int(target[0]), int(target[1]))
+        
+        # Várias origens podem estar no mesmo tile
+        seen = {}
+        result = []
+        for source in zip(np.asarray(sources_x).tolist(), np.asarray(sources_y).tolist()):
+            visible = seen.get(source)
+            if visible is None:
+                visible = seen[source] = self.has_line_of_sight(source, target)
+            result.append(visible)
+        return np.array(result, dtype=bool)
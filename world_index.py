@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from collections import deque
+
+import map_compiler
+
+class WorldIndex:
+    def __init__(self, maps_dir="maps"):
+        self.maps_dir = maps_dir
+        
+        # IDs de todos os mapas existentes (JSON ou compilados)
+        self.map_ids = set()
+        
+        # ID do mapa -> lista de ligações {"kind", "target_map", "valid", ...}
+        self.links = {}
+        
+        # ID do mapa -> lista ordenada de vizinhos válidos
+        self.neighbour_ids = {}
+        
+        # ID do mapa -> dimensões (largura, altura, tamanho do tile)
+        self.sizes = {}
+        
+        self.build()
+    
+    def build(self):
+        """Lê uma única vez todos os mapas do diretório e monta o grafo do mundo"""
+        self.map_ids.clear()
+        self.links.clear()
+        self.neighbour_ids.clear()
+        self.sizes.clear()
+        
+        try:
+            names = os.listdir(self.maps_dir)
+        except OSError as e:
+            print(f"Aviso: Não foi possível listar o diretório de mapas {self.maps_dir}: {e}")
+            return
+        
+        for name in names:
+            map_id, extension = os.path.splitext(name)
+            if extension in (".json", map_compiler.COMPILED_EXTENSION):
+                self.map_ids.add(map_id)
+        
+        # Extrai portais e transições de borda de cada mapa
+        for map_id in sorted(self.map_ids):
+            meta = map_compiler.load_map_metadata(map_id, self.maps_dir)
+            if meta is None:
+                continue
+            
+            self.sizes[map_id] = (meta.get("width", 25), meta.get("height", 19), meta.get("tile_size", 32))
+            
+            links = []
+            for portal in meta.get("portals", []):
+                links.append({
+                    "kind": "portal",
+                    "x": portal.get("x"),
+                    "y": portal.get("y"),
+                    "target_map": portal.get("target_map", "map1")
+                })
+            for direction, transition in (meta.get("edge_transitions") or {}).items():
+                if transition:
+                    links.append({
+                        "kind": "edge",
+                        "direction": direction,
+                        "target_map": transition.get("target_map", "map1")
+                    })
+            
+            # Resolve e valida os destinos antecipadamente
+            neighbours = []
+            for link in links:
+                link["valid"] = link["target_map"] in self.map_ids
+                if not link["valid"]:
+                    print(f"Aviso: Mapa de destino não encontrado: {link['target_map']} (em {map_id})")
+                elif link["target_map"] not in neighbours:
+                    neighbours.append(link["target_map"])
+            
+            self.links[map_id] = links
+            self.neighbour_ids[map_id] = neighbours
+    
+    def has_map(self, map_id):
+        """Verifica se o mapa existe (sem acessar o sistema de arquivos)"""
+        return map_id in self.map_ids
+    
+    def get_size(self, map_id):
+        """Retorna (largura, altura, tamanho do tile) do mapa, ou None se não existir"""
+        return self.sizes.get(map_id)
+    
+    def neighbours(self, map_id):
+        """Retorna os mapas diretamente alcançáveis a partir do mapa informado"""
+        return self.neighbour_ids.get(map_id, [])
+    
+    def get_links(self, map_id):
+        """Retorna todas as ligações (portais e bordas) do mapa, com a indicação de validade"""
+        return self.links.get(map_id, [])
+    
+    def reachable(self, start_id):
+        """Retorna o conjunto de mapas alcançáveis a partir de start_id (incluindo ele)"""
+        if start_id not in self.map_ids:
+            return set()
+        
+        visited = {start_id}
+        queue = deque([start_id])
+        while queue:
+            current = queue.popleft()
+            for neighbour in self.neighbours(current):
+                if neighbour not in visited:
+                    visited.add(neighbour)
+                    queue.append(neighbour)
+        return visited
+    
+    def is_reachable(self, start_id, target_id):
+        """Verifica se é possível ir de start_id até target_id"""
+        return target_id in self.reachable(start_id)
+
+# Índice compartilhado, construído na primeira utilização
+_world_index = None
+
+def get_world_index():
+    """Retorna o índice do mundo, construindo-o a partir de maps/ se necessário"""
+    global _world_index
+    if _world_index is None:
+        _world_index = WorldIndex()
+    return _world_index